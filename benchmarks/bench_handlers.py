@@ -0,0 +1,141 @@
+"""The handlers' work once the table is read: pages, statistics, exports.
+
+Each calls the function its handler hands to the thread pool, with the table
+already in the read cache, so what is timed is that step alone - the read is
+`bench_readers`. Views are computed with no read key, which caches nothing, so
+every repeat pays for its filter and sort as the first page of a view does.
+`ParquetPage` is the exception: it times the path a parquet takes when it is
+not cached at all, where filters and sorts run on a pruned, narrow scan.
+"""
+
+from jupyterlab_tabular_data_viewer_extension import readers, routes, stats
+
+from .common import FORMATS, ROWS, TIMEOUT, cold, path_for, warm
+
+# A predicate on a float column with nulls and one on text, as a user combines
+FILTERS = {
+    "amount": {"type": "number", "operator": ">", "value": "250"},
+    "city": {"type": "text", "value": "on"},
+}
+
+EXPORT_FORMATS = list(routes._EXPORT_FORMATS)
+
+
+class _Warm:
+    params = (FORMATS, ROWS)
+    param_names = ("format", "rows")
+    timeout = TIMEOUT
+
+    def setup(self, fmt, rows):
+        self.path = path_for(fmt, rows)
+        _, self.table = warm(self.path)
+
+
+class FilteredPage(_Warm):
+    def time_first_page(self, fmt, rows):
+        routes._data_page(None, self.table, FILTERS, None, "asc", False, False, 0, 500)
+
+    def peakmem_first_page(self, fmt, rows):
+        routes._data_page(None, self.table, FILTERS, None, "asc", False, False, 0, 500)
+
+
+class SortedPage(_Warm):
+    def time_first_page(self, fmt, rows):
+        routes._data_page(None, self.table, {}, "amount", "desc", False, False, 0, 500)
+
+    def time_deep_page(self, fmt, rows):
+        # Past the head top-k selection answers, so the full sort
+        offset = len(self.table) // 2
+        routes._data_page(
+            None, self.table, {}, "amount", "desc", False, False, offset, 500
+        )
+
+    def time_text_column(self, fmt, rows):
+        routes._data_page(None, self.table, {}, "label", "asc", False, False, 0, 500)
+
+
+class ColumnStats(_Warm):
+    def time_numeric(self, fmt, rows):
+        stats.calculate_column_stats(self.table, "amount")
+
+    def time_text(self, fmt, rows):
+        stats.calculate_column_stats(self.table, "label")
+
+
+class UniqueValues(_Warm):
+    def time_low_cardinality(self, fmt, rows):
+        routes._unique_values(self.table, "city", 100)
+
+    def time_high_cardinality(self, fmt, rows):
+        routes._unique_values(self.table, "label", 100)
+
+
+class Export:
+    """Writing the whole table out, per output format, from a parquet source."""
+
+    params = (EXPORT_FORMATS, ROWS)
+    param_names = ("output", "rows")
+    timeout = TIMEOUT
+    number = 1
+
+    def setup(self, output, rows):
+        if output == "excel" and rows + 1 > routes._XLSX_MAX_ROWS:
+            raise NotImplementedError("an xlsx worksheet cannot hold this many rows")
+        _, self.table = warm(path_for("parquet", rows))
+
+    def time_export(self, output, rows):
+        routes._export_body(self.table, output)
+
+    def peakmem_export(self, output, rows):
+        routes._export_body(self.table, output)
+
+
+class ParquetPage:
+    """An uncached parquet's page, through the pruned-scan view path."""
+
+    params = (["plain", "filtered", "sorted"], ROWS)
+    param_names = ("view", "rows")
+    timeout = TIMEOUT
+
+    def setup(self, view, rows):
+        self.path = path_for("parquet", rows)
+        self.filters = FILTERS if view == "filtered" else {}
+        self.sort_by = "amount" if view == "sorted" else None
+
+    def time_first_page(self, view, rows):
+        cold()
+        routes._parquet_page(
+            self.path, None, self.filters, self.sort_by, "asc", False, False, 0, 500
+        )
+
+    def peakmem_first_page(self, view, rows):
+        cold()
+        routes._parquet_page(
+            self.path, None, self.filters, self.sort_by, "asc", False, False, 0, 500
+        )
+
+
+class SqliteTableSwitch:
+    """Metadata and a first page of each table of a database, again and again.
+
+    What clicking between the tabs of an uncached SQLite database costs once
+    each table's layout is known: with the connection pool, every request
+    borrows a connection whose schema is parsed and whose page cache is warm;
+    without it (`sqlite_pool_size = 0`), each opens its own.
+    """
+
+    params = (["pooled", "unpooled"], ROWS)
+    param_names = ("pool", "rows")
+    timeout = TIMEOUT
+
+    def setup(self, pool, rows):
+        self.path = path_for("sqlite", rows)
+        cold()
+        readers.configure(sqlite_pool_size=4 if pool == "pooled" else 0)
+        self.tables = readers.list_sqlite_tables(self.path)
+        self.time_switch(pool, rows)
+
+    def time_switch(self, pool, rows):
+        for table in self.tables:
+            routes._describe_source(self.path, "sqlite", table)
+            routes._sqlite_page(self.path, table, {}, None, "asc", False, False, 0, 100)
@@ -0,0 +1,46 @@
+"""Reading each format into an arrow table, cold and from the read cache.
+
+`time_*` is wall time and `peakmem_*` the process's peak RSS, which asv
+measures in a fresh process per run - so a cold read's peak includes the
+intermediate copies a reader makes, not only the table it returns.
+"""
+
+from jupyterlab_tabular_data_viewer_extension import readers
+
+from .common import FORMATS, ROWS, SHAPES, TIMEOUT, cold, path_for, warm
+
+
+class ColdRead:
+    """A file no cache has seen: the full conversion."""
+
+    params = (FORMATS, ROWS, SHAPES)
+    param_names = ("format", "rows", "shape")
+    timeout = TIMEOUT
+    # One read of a 10M-row file is the measurement; repeating it adds nothing
+    number = 1
+    repeat = (1, 3, 60.0)
+
+    def setup(self, fmt, rows, shape):
+        self.path = path_for(fmt, rows, shape)
+        cold()
+
+    def time_read(self, fmt, rows, shape):
+        readers.read_as_arrow_table(self.path)
+
+    def peakmem_read(self, fmt, rows, shape):
+        readers.read_as_arrow_table(self.path)
+
+
+class CachedRead:
+    """The same file again: a key lookup, for every handler after the first."""
+
+    params = (FORMATS, ROWS)
+    param_names = ("format", "rows")
+    timeout = TIMEOUT
+
+    def setup(self, fmt, rows):
+        self.path = path_for(fmt, rows)
+        warm(self.path)
+
+    def time_read(self, fmt, rows):
+        readers.read_as_arrow_table(self.path)
@@ -0,0 +1,81 @@
+"""Shared setup for the benchmarks: generated files and a cold server state.
+
+The files come from `scripts/make_sample_database.build_benchmark_files` and
+are kept between runs in TABULAR_BENCH_DATA (default .asv/data). Each is
+written the first time a benchmark asks for it, inside that benchmark's setup
+- ten million rows take minutes, hence the long timeouts - and reused after.
+Delete the directory after changing the generator.
+
+Row counts are the asv parameter `rows`. All three tiers - 10k, 1M, 10M - are
+benchmarked unless TABULAR_BENCH_ROWS names fewer, e.g.
+TABULAR_BENCH_ROWS=10000 for a quick local check. The wide shape has
+`WIDE_COLUMNS` columns and a fiftieth of the rows.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from make_sample_database import (  # noqa: E402
+    BENCHMARK_FORMATS,
+    XLSX_MAX_DATA_ROWS,
+    build_benchmark_files,
+)
+
+from jupyterlab_tabular_data_viewer_extension import (  # noqa: E402
+    executors,
+    readers,
+    spill,
+    views,
+)
+
+DATA_DIR = os.environ.get("TABULAR_BENCH_DATA") or os.path.join(ROOT, ".asv", "data")
+
+ROWS = [
+    int(n)
+    for n in os.environ.get("TABULAR_BENCH_ROWS", "10000,1000000,10000000").split(",")
+]
+
+# Room for a generator run plus the measurement, at the largest tier
+TIMEOUT = 3600
+
+SHAPES = ["mixed", "wide"]
+
+FORMATS = list(BENCHMARK_FORMATS)
+
+
+def shape_rows(rows, shape):
+    return rows if shape == "mixed" else max(rows // 50, 1)
+
+
+def path_for(fmt, rows, shape="mixed"):
+    """The generated file, or NotImplementedError - asv's skip - when there is none.
+
+    xlsx stops at the worksheet row limit, so its 10M tier does not exist.
+    """
+    rows = shape_rows(rows, shape)
+    if fmt == "xlsx" and rows > XLSX_MAX_DATA_ROWS:
+        raise NotImplementedError("an xlsx worksheet cannot hold this many rows")
+    return build_benchmark_files(DATA_DIR, rows, shape, formats=(fmt,))[fmt]
+
+
+def cold():
+    """Forget every table and view, with nothing to fall back on but the file.
+
+    The on-disk tier is switched off so a "cold" read converts the file, and
+    Excel is read in this process: a worker process's memory would escape
+    asv's peak RSS measurement, and its start-up would be timed as reading.
+    """
+    spill.configure(directory="")
+    executors.configure(process_workers=0)
+    readers._cache_clear()
+    views._views_clear()
+
+
+def warm(path):
+    """`path`'s table, read into a cache big enough to keep it at any tier."""
+    cold()
+    readers.configure(cache_max_bytes=1 << 40)
+    return readers.read_with_key(path)
@@ -10,6 +10,8 @@ except ImportError:
         "Importing 'jupyterlab_tabular_data_viewer_extension' outside a proper installation."
     )
     __version__ = "dev"
+from . import executors, readers
+from .config import TabularDataViewerConfig
 from .routes import setup_route_handlers
 
 
@@ -29,6 +31,21 @@ def _load_jupyter_server_extension(server_app):
     server_app: jupyterlab.labapp.LabApp
         JupyterLab application instance
     """
+    # Parented to the server so c.TabularDataViewerConfig in its config files
+    # reaches the traits; creating it applies them
+    config = TabularDataViewerConfig(parent=server_app)
+    server_app.web_app.settings["tabular_data_viewer_config"] = config
     setup_route_handlers(server_app.web_app)
     name = "jupyterlab_tabular_data_viewer_extension"
     server_app.log.info(f"Registered {name} server extension")
+
+
+def _unload_jupyter_server_extension(server_app):
+    """Releases what the extension holds open when the server stops.
+
+    The read pools' workers - an Excel worker is a whole process - and the
+    pooled SQLite connections would otherwise outlive the server's own
+    shutdown, or hold a database's file open until the interpreter exits.
+    """
+    executors.shutdown()
+    readers._sqlite_pool_close()
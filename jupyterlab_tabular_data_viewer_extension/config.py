@@ -0,0 +1,208 @@
+"""Server-side limits, from jupyter_server_config.py and the admin endpoint.
+
+The read cache's budget, the pools' sizes and the arrow thread counts were
+constants, which suits no machine in particular: 256 MiB of cache idles on a
+512 GB analysis node and is a sixteenth of a 4 GB pod. They are traits of
+`TabularDataViewerConfig` now, so each deployment sets its own:
+
+    c.TabularDataViewerConfig.cache_max_bytes = 32 * 1024**3
+    c.TabularDataViewerConfig.max_concurrent_reads = 2
+
+The extension loader creates the one instance with the server as its parent,
+which is how the config file reaches it. Each trait is pushed to the module
+that owns the setting when the instance is created and again whenever the
+trait changes - so the admin endpoint (`routes.AdminConfigHandler`) changes a
+running server just by assigning to it.
+"""
+
+import os
+
+import pyarrow as pa
+from traitlets import Bool, Enum, Int, Unicode, observe
+from traitlets.config import Configurable
+
+from . import executors, readers, spill
+
+
+class TabularDataViewerConfig(Configurable):
+    """Memory and concurrency limits of the tabular data viewer's server side."""
+
+    cache_max_bytes = Int(
+        readers._CACHE_MAX_BYTES,
+        min=0,
+        config=True,
+        help="Bytes of converted tables the in-memory read cache may hold.",
+    )
+    table_max_bytes = Int(
+        readers._TABLE_MAX_BYTES,
+        min=0,
+        config=True,
+        help="A table bigger than this is served but not cached. 0: no cap "
+        "beyond cache_max_bytes.",
+    )
+    max_concurrent_reads = Int(
+        readers._MAX_CONCURRENT_READS,
+        min=0,
+        config=True,
+        help="Full-file reads allowed to run at once; more wait. 0: no limit.",
+    )
+    excel_workbook_reads = Enum(
+        readers._EXCEL_WORKBOOK_MODES,
+        readers._EXCEL_WORKBOOK_READS,
+        config=True,
+        help="How a workbook's other sheets are read when one is: 'off' reads "
+        "each sheet when it is opened; 'eager' reads every sheet in one pass "
+        "before showing the first; 'background' shows the first, then reads "
+        "the rest in one pass.",
+    )
+    append_refresh = Bool(
+        readers._APPEND_REFRESH,
+        config=True,
+        help="Read a new version of a csv, tsv or SQLite table whose previous "
+        "version is cached as that version plus the rows appended since, when "
+        "its old content is unchanged. Updates to a SQLite table's earlier rows "
+        "are not noticed.",
+    )
+    sqlite_pool_size = Int(
+        readers._SQLITE_POOL_SIZE,
+        min=0,
+        config=True,
+        help="Idle read-only connections kept open per SQLite database, with "
+        "their page caches. 0: a new connection for every query.",
+    )
+    sqlite_cache_bytes = Int(
+        readers._SQLITE_CACHE_BYTES,
+        min=0,
+        config=True,
+        help="Page cache of each SQLite connection (PRAGMA cache_size). 0: "
+        "SQLite's default.",
+    )
+    sqlite_mmap_bytes = Int(
+        readers._SQLITE_MMAP_BYTES,
+        min=0,
+        config=True,
+        help="Bytes of a SQLite database each connection memory-maps (PRAGMA "
+        "mmap_size). 0: none. An I/O error on a mapped page crashes the server.",
+    )
+    thread_workers = Int(
+        executors._DEFAULT_THREAD_WORKERS,
+        min=1,
+        config=True,
+        help="Threads that run the handlers' reads, filters and serialization.",
+    )
+    process_workers = Int(
+        executors._DEFAULT_PROCESS_WORKERS,
+        min=0,
+        config=True,
+        help="Processes that read Excel files. 0: read them on the threads.",
+    )
+    arrow_cpu_threads = Int(
+        pa.cpu_count(),
+        min=1,
+        config=True,
+        help="Size of pyarrow's compute thread pool.",
+    )
+    arrow_io_threads = Int(
+        pa.io_thread_count(),
+        min=1,
+        config=True,
+        help="Size of pyarrow's I/O thread pool.",
+    )
+    polars_threads = Int(
+        0,
+        min=0,
+        config=True,
+        help="Polars threads in each Excel worker process. 0: whatever the "
+        "POLARS_MAX_THREADS environment variable the server started with says, "
+        "or polars' default without one. The server's own polars pool is sized "
+        "when polars is imported, so it follows that variable only.",
+    )
+    spill_dir = Unicode(
+        spill._SPILL_DIR or "",
+        config=True,
+        help="Directory for the on-disk table cache. Empty: no disk cache.",
+    )
+    spill_max_bytes = Int(
+        spill._SPILL_MAX_BYTES,
+        min=0,
+        config=True,
+        help="Bytes the on-disk table cache may hold.",
+    )
+    log_timings = Bool(
+        False,
+        config=True,
+        help="Log each request's phase timings and cache outcome as one JSON "
+        "object - the figures its Server-Timing header carries.",
+    )
+
+    def __init__(self, **kwargs):
+        # What polars_threads = 0 restores: the operator's own setting, which
+        # applying the default must leave in place rather than delete. Taken
+        # before the traits load, since loading them can already apply one.
+        self._inherited_polars_threads = os.environ.get("POLARS_MAX_THREADS")
+        super().__init__(**kwargs)
+        for name in self.settings():
+            self._apply(name)
+
+    def settings(self):
+        """Every configurable value, by name."""
+        return {
+            name: getattr(self, name) for name in sorted(self.trait_names(config=True))
+        }
+
+    @observe(
+        "cache_max_bytes",
+        "table_max_bytes",
+        "max_concurrent_reads",
+        "excel_workbook_reads",
+        "append_refresh",
+        "sqlite_pool_size",
+        "sqlite_cache_bytes",
+        "sqlite_mmap_bytes",
+        "thread_workers",
+        "process_workers",
+        "arrow_cpu_threads",
+        "arrow_io_threads",
+        "polars_threads",
+        "spill_dir",
+        "spill_max_bytes",
+    )
+    def _changed(self, change):
+        self._apply(change["name"])
+
+    def _apply(self, name):
+        """Push one trait's value to the module that owns the setting."""
+        value = getattr(self, name)
+        if name in (
+            "cache_max_bytes",
+            "table_max_bytes",
+            "max_concurrent_reads",
+            "excel_workbook_reads",
+            "append_refresh",
+            "sqlite_pool_size",
+            "sqlite_cache_bytes",
+            "sqlite_mmap_bytes",
+        ):
+            readers.configure(**{name: value})
+        elif name in ("thread_workers", "process_workers"):
+            executors.configure(**{name: value})
+        elif name == "arrow_cpu_threads":
+            pa.set_cpu_count(value)
+        elif name == "arrow_io_threads":
+            pa.set_io_thread_count(value)
+        elif name == "polars_threads":
+            # Read by polars at import, so only workers started after this see
+            # it; the pool is replaced when the value actually changes.
+            current = os.environ.get("POLARS_MAX_THREADS")
+            wanted = str(value) if value else self._inherited_polars_threads
+            if wanted != current:
+                if wanted is not None:
+                    os.environ["POLARS_MAX_THREADS"] = wanted
+                else:
+                    os.environ.pop("POLARS_MAX_THREADS", None)
+                executors.recycle_process_pool()
+        elif name == "spill_dir":
+            spill.configure(directory=value)
+        elif name == "spill_max_bytes":
+            spill.configure(max_bytes=value)
+        # log_timings has no module to push to: the handlers read it per request
@@ -0,0 +1,159 @@
+"""Executors the request handlers hand their blocking work to.
+
+Every handler reads a whole table, then filters, sorts and serialises it. Done
+on the Tornado IOLoop, one user's minute-long workbook read stalled every other
+request on the server - kernel websockets included - for the full minute. The
+handlers now await that work on a bounded thread pool instead, and the loop is
+only ever held for request parsing and the final write.
+
+Threads suffice for pyarrow and polars, which release the GIL inside their
+kernels. The Excel reader does not: it is pure Python - openpyxl once, the
+`xlsx` scanner now - so an Excel read on a thread still holds the GIL for most
+of its run and starves the loop all the same. Excel reads therefore run in a
+separate process pool, and only the finished arrow table crosses back.
+
+Both pools are created on first use and sized by `configure`. A process pool of
+zero workers reads Excel in the calling thread, which is what a platform that
+cannot spawn processes needs.
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Python's own ThreadPoolExecutor default, capped lower: every worker can hold a
+# table-sized intermediate, so the bound is a memory bound as much as a CPU one.
+_DEFAULT_THREAD_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Each Excel worker is a whole interpreter with polars, pyarrow and openpyxl
+# imported, holding a sheet's columns while it converts them.
+_DEFAULT_PROCESS_WORKERS = min(2, os.cpu_count() or 1)
+
+_thread_workers = _DEFAULT_THREAD_WORKERS
+_process_workers = _DEFAULT_PROCESS_WORKERS
+_thread_pool = None
+_process_pool = None
+_POOL_LOCK = threading.Lock()
+
+
+def configure(thread_workers=None, process_workers=None):
+    """Resize the pools. Either argument left as None keeps its current size.
+
+    A pool whose size changed is replaced; work already running on the old one
+    finishes there rather than being cancelled.
+    """
+    global _thread_workers, _process_workers, _thread_pool, _process_pool
+    with _POOL_LOCK:
+        if thread_workers is not None and thread_workers != _thread_workers:
+            if thread_workers < 1:
+                raise ValueError("thread_workers must be at least 1")
+            _thread_workers = thread_workers
+            if _thread_pool is not None:
+                _thread_pool.shutdown(wait=False)
+                _thread_pool = None
+        if process_workers is not None and process_workers != _process_workers:
+            if process_workers < 0:
+                raise ValueError("process_workers must not be negative")
+            _process_workers = process_workers
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+                _process_pool = None
+
+
+def recycle_process_pool():
+    """Replace the process pool, so new workers see the current environment.
+
+    Running work finishes on the old pool.
+    """
+    global _process_pool
+    with _POOL_LOCK:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+
+def sizes():
+    """The configured (thread, process) worker counts."""
+    return _thread_workers, _process_workers
+
+
+def thread_pool():
+    """The shared thread pool, created on first use."""
+    global _thread_pool
+    with _POOL_LOCK:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=_thread_workers, thread_name_prefix="tabular-viewer"
+            )
+        return _thread_pool
+
+
+def _process_pool_or_none():
+    """The shared process pool, created on first use. None when sized to zero."""
+    global _process_pool
+    with _POOL_LOCK:
+        if _process_workers == 0:
+            return None
+        if _process_pool is None:
+            # spawn, not the platform default: the server is multi-threaded,
+            # and forking a process that holds other threads' locks - polars'
+            # own thread pool among them - can deadlock the child.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Await `fn(*args, **kwargs)` on the thread pool.
+
+    `fn` runs in a copy of the caller's context, as `asyncio.to_thread` would
+    run it, so the request's `metrics.RequestTimings` is the one it charges.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        thread_pool(), context.run, functools.partial(fn, *args, **kwargs)
+    )
+
+
+def run_in_process(fn, *args):
+    """Call `fn(*args)` in the process pool and block for the result.
+
+    Called from a worker thread, so blocking here costs the IOLoop nothing.
+    `fn` and its arguments must be picklable, and so must whatever it raises -
+    the Excel reader maps its failures to ValueError before they cross back.
+
+    A pool whose worker died - the kernel OOM killer is the usual reason - is
+    discarded so the next read gets a fresh one, and the failure surfaces to the
+    handler as a 500 rather than every later Excel read failing the same way.
+    """
+    global _process_pool
+    pool = _process_pool_or_none()
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        with _POOL_LOCK:
+            if _process_pool is pool:
+                _process_pool = None
+        pool.shutdown(wait=False)
+        raise
+
+
+def shutdown():
+    """Stop both pools. Running work finishes; queued work is cancelled."""
+    global _thread_pool, _process_pool
+    with _POOL_LOCK:
+        for pool in (_thread_pool, _process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
+        _process_pool = None
@@ -0,0 +1,290 @@
+"""Counters and timings behind the `metrics` endpoint.
+
+Whether `_CACHE_MAX_BYTES` is big enough was a guess: nothing counted the
+cache's hits, misses or evictions, or how long the reads it saves take. The
+read cache and the handlers record them here, and `routes.MetricsHandler`
+answers a snapshot as JSON or in the Prometheus text format.
+
+Everything is process-local and counted since import, the way a Prometheus
+counter is: a scraper takes rates from successive samples, and a restart shows
+as the reset it handles anyway. Recording is a lock and an addition, cheap
+enough for every request.
+
+Aggregates cannot say where one slow request spent its time, so each request
+also carries a `RequestTimings`: the readers, views and serializers mark their
+work with `phase`, and the handler returns the phases in a Server-Timing
+header (see `routes._MeteredHandler`). The timings travel in a context
+variable, which `executors.run_blocking` carries onto the worker thread, so
+no signature between the handler and the kernels had to change.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the read-time histogram buckets: a small parquet
+# lands in the first few, a large workbook in the last
+_READ_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Handler latencies are answered as percentiles of this many recent requests
+# per handler - recent enough to show a regression, enough to be stable
+_RECENT = 1024
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+# What each counter counts, and the help text it is exported with
+_COUNTERS = {
+    "cache_hits": "Reads answered from the in-memory read cache.",
+    "cache_misses": "Reads that had to convert the file or wait for a conversion.",
+    "cache_coalesced": "Misses served by another request's read of the same file.",
+    "cache_evictions": "Tables evicted from the read cache to stay within budget.",
+    "cache_refusals": "Tables read but not cached: too big, or worth less than "
+    "what they would evict.",
+    "spill_hits": "Reads answered from the on-disk table cache.",
+    "append_refreshes": "Reads answered by appending a file's new rows to its "
+    "cached previous version.",
+    "workbook_prefetches": "Worksheets read into the cache by a whole-workbook "
+    "pass before any request for them.",
+}
+
+# The point-in-time values `readers.cache_state` reports, and their help text
+_GAUGES = {
+    "cache_bytes": "Bytes held by the read cache, tables and their sort orders.",
+    "cache_max_bytes": "The read cache's budget.",
+    "cache_entries": "Tables in the read cache.",
+    "reads_in_flight": "Distinct file reads in progress.",
+    "reads_running": "Reads holding one of the concurrent-read slots.",
+    "reads_waiting": "Reads waiting for a concurrent-read slot.",
+}
+
+_LOCK = threading.Lock()
+_counts = dict.fromkeys(_COUNTERS, 0)
+# file type -> _Timing of its conversions
+_reads = {}
+# handler class name -> _Timing of its requests
+_requests = {}
+
+
+class _Timing:
+    """Count, total and distribution of one kind of duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(_READ_BUCKETS)
+        self.recent = deque(maxlen=_RECENT)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(_READ_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.recent.append(seconds)
+
+    def quantiles(self):
+        """Nearest-rank percentiles of the recent samples, or None without any."""
+        ordered = sorted(self.recent)
+        if not ordered:
+            return dict.fromkeys(map(str, _QUANTILES))
+        return {
+            str(q): ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            for q in _QUANTILES
+        }
+
+    def as_dict(self):
+        cumulative = []
+        running = 0
+        for count in self.buckets:
+            running += count
+            cumulative.append(running)
+        return {
+            "count": self.count,
+            "seconds": self.total,
+            "buckets": dict(zip(map(str, _READ_BUCKETS), cumulative)),
+            "quantiles": self.quantiles(),
+        }
+
+
+# The outcome a request's cache lookups report, worst last: a request that
+# read any file from scratch is a miss, whatever else it found cached
+_CACHE_OUTCOMES = ("hit", "coalesced", "miss")
+
+_REQUEST = contextvars.ContextVar("tabular_data_viewer_request", default=None)
+
+
+class RequestTimings:
+    """Where one request's time went: seconds per phase, and its cache outcome.
+
+    Phases are exclusive - a phase entered inside another pauses the outer
+    one - so the figures add up to no more than the request took, and a read
+    nested in a statistics call is not counted twice.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.cache = None
+        self._stack = []
+
+    def enter(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(now)
+        self._stack.append([name, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _charge(self, now):
+        name, started = self._stack[-1]
+        self.phases[name] = self.phases.get(name, 0.0) + now - started
+
+    def note_cache(self, outcome):
+        if self.cache is None or _CACHE_OUTCOMES.index(outcome) > _CACHE_OUTCOMES.index(
+            self.cache
+        ):
+            self.cache = outcome
+
+
+def start_request():
+    """A fresh `RequestTimings` for the request running in this context."""
+    timings = RequestTimings()
+    _REQUEST.set(timings)
+    return timings
+
+
+@contextmanager
+def phase(name):
+    """Charge the time inside to `name` on the current request, if there is one.
+
+    Also a decorator. Outside a request - a test, a benchmark - it costs one
+    context variable lookup.
+    """
+    timings = _REQUEST.get()
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+
+def note_cache(outcome):
+    """Record a read cache "hit", "coalesced" wait or "miss" on the current request."""
+    timings = _REQUEST.get()
+    if timings is not None:
+        timings.note_cache(outcome)
+
+
+def count(name, n=1):
+    """Add `n` to one of the `_COUNTERS`."""
+    with _LOCK:
+        _counts[name] += n
+
+
+def observe_read(file_type, seconds):
+    """Record one conversion of a `file_type` file, taking `seconds`."""
+    with _LOCK:
+        _reads.setdefault(file_type, _Timing()).add(seconds)
+
+
+def observe_request(handler, seconds):
+    """Record one request answered by `handler`, taking `seconds`."""
+    with _LOCK:
+        _requests.setdefault(handler, _Timing()).add(seconds)
+
+
+def snapshot(gauges):
+    """Every counter and timing, with the point-in-time `gauges` alongside."""
+    with _LOCK:
+        return {
+            "counters": dict(_counts),
+            "gauges": dict(gauges),
+            "reads": {name: t.as_dict() for name, t in sorted(_reads.items())},
+            "requests": {name: t.as_dict() for name, t in sorted(_requests.items())},
+        }
+
+
+def _reset():
+    """Zero everything. Used by tests."""
+    with _LOCK:
+        _counts.update(dict.fromkeys(_COUNTERS, 0))
+        _reads.clear()
+        _requests.clear()
+
+
+_PREFIX = "jupyterlab_tabular_data_viewer_"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    # Prometheus reads Go floats; None (no samples yet) is NaN
+    if value is None:
+        return "NaN"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def prometheus_text(snap):
+    """A `snapshot` in the Prometheus text exposition format, version 0.0.4.
+
+    Counters get a `_total` suffix, read times are a histogram labelled by file
+    type and handler latencies a summary labelled by handler class.
+    """
+    lines = []
+
+    def family(name, kind, text):
+        lines.append(f"# HELP {_PREFIX}{name} {text}")
+        lines.append(f"# TYPE {_PREFIX}{name} {kind}")
+
+    for name, value in snap["counters"].items():
+        family(f"{name}_total", "counter", _COUNTERS[name])
+        lines.append(f"{_PREFIX}{name}_total {value}")
+
+    for name, value in snap["gauges"].items():
+        family(name, "gauge", _GAUGES[name])
+        lines.append(f"{_PREFIX}{name} {_number(value)}")
+
+    family("read_seconds", "histogram", "Time to convert a file, by file type.")
+    for file_type, timing in snap["reads"].items():
+        label = f'format="{_label(file_type)}"'
+        for bound, cumulative in timing["buckets"].items():
+            lines.append(
+                f'{_PREFIX}read_seconds_bucket{{{label},le="{bound}"}} {cumulative}'
+            )
+        lines.append(
+            f'{_PREFIX}read_seconds_bucket{{{label},le="+Inf"}} {timing["count"]}'
+        )
+        lines.append(
+            f"{_PREFIX}read_seconds_sum{{{label}}} {_number(timing['seconds'])}"
+        )
+        lines.append(f"{_PREFIX}read_seconds_count{{{label}}} {timing['count']}")
+
+    family(
+        "request_seconds",
+        "summary",
+        f"Handler latency; quantiles over the last {_RECENT} requests.",
+    )
+    for handler, timing in snap["requests"].items():
+        label = f'handler="{_label(handler)}"'
+        for q, value in timing["quantiles"].items():
+            lines.append(
+                f'{_PREFIX}request_seconds{{{label},quantile="{q}"}} {_number(value)}'
+            )
+        lines.append(
+            f"{_PREFIX}request_seconds_sum{{{label}}} {_number(timing['seconds'])}"
+        )
+        lines.append(f"{_PREFIX}request_seconds_count{{{label}}} {timing['count']}")
+
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 """File readers for tabular formats.
 
 Reads parquet/excel/csv/tsv/sqlite files into PyArrow tables. Three engines:
-pyarrow reads parquet, openpyxl reads the worksheet rows of an .xlsx and polars
+pyarrow reads parquet, `xlsx` streams the worksheet cells of an .xlsx and polars
 types them, and polars reads csv, tsv and sqlite outright.
 
 A column holding mixed types - integers with the odd string among them -
@@ -16,16 +16,25 @@ column in Python, over every row, before polars sees a value.
 """
 
 import datetime as dt
+import hashlib
+import json
+import logging
+import mmap
 import os
 import sqlite3
 import threading
+import time
+from bisect import bisect_right
 from collections import OrderedDict
-from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from stat import S_ISREG
 from urllib.parse import quote
 
-import openpyxl
 import polars as pl
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
 # Bound at import, not looked up inside an `except` clause. Resolving
@@ -35,12 +44,12 @@ import pyarrow.parquet as pq
 # pyo3_runtime's) so it is the likeliest of the two to move.
 from polars.exceptions import ComputeError, PanicException, PolarsError
 
-# Both openpyxl call sites load with these options. keep_links is the one that
-# changes behaviour: left at its default True, openpyxl walks every
-# <externalReference> part, which costs 0.55s against 0.002s on a workbook with
-# a large cached link and raises AttributeError - not a ValueError, so a 500 -
-# when a link's relationship is missing, as an Excel repair leaves it.
-_OPENPYXL_LOAD = dict(read_only=True, data_only=True, keep_links=False)
+from . import metrics, xlsx
+from .executors import run_in_process, thread_pool
+from .spill import spill_get, spill_put
+
+_log = logging.getLogger(__name__)
+
 
 # Only SQLite is sniffed. It is the one format whose extension carries no
 # information (.db belongs to Berkeley DB, LevelDB and others, and a database
@@ -338,8 +347,8 @@ def _read_excel(file_path, sheet=None):
 
     `sheet` accepts a sheet name (string) or `None` for the first worksheet.
 
-    The sheet is read through openpyxl here rather than through
-    `pl.read_excel`, which uses openpyxl itself but decides two things
+    The sheet is read here rather than through `pl.read_excel`, which uses
+    openpyxl itself but decides two things
     differently from pandas, each losing data:
 
     - it prefers a defined Table object over the used range, and reads only the
@@ -360,75 +369,68 @@ def _read_excel(file_path, sheet=None):
     cascade's job, and it sees every row, so a string arriving at row 250 needs
     no inference window.
 
-    The three load kwargs are pandas' own, verified against its openpyxl reader.
-    `data_only=True` is the load-bearing one: without it a formula cell yields
-    its formula text, so a header row of formulas reads as populated where
-    pandas saw the cached value - or no value at all.
-    """
-    sheet = sheet or None
-    # Handed an open file rather than a path on purpose: openpyxl refuses a path
-    # ending in .xls outright, and `.xls` is one of the extensions this viewer
-    # claims, so a real xlsx saved under the old name 500d. Pandas passed a
-    # handle for the same reason.
-    with open(file_path, "rb") as handle:
-        book = openpyxl.load_workbook(handle, **_OPENPYXL_LOAD)
-        try:
-            if not book.worksheets:
-                # A workbook of nothing but chartsheets. Indexing [0] would
-                # raise IndexError, which is not a ValueError, so it would 500
-                # rather than 400.
-                raise ValueError("Workbook contains no worksheets")
-            if sheet is None:
-                worksheet = book.worksheets[0]
-            else:
-                # First match, as openpyxl's own __getitem__ resolves it. Two
-                # worksheets can share a title only in a hand-edited file, but
-                # then `list_excel_sheets` renders two identical tabs and both
-                # must open the same sheet as each other.
-                worksheet = next(
-                    (ws for ws in book.worksheets if ws.title == sheet), None
-                )
-                if worksheet is None:
-                    raise ValueError(f"Sheet not found: {sheet}")
-            # In read-only mode openpyxl trusts the sheet's declared <dimension>
-            # rather than the cells present, and a dimension record that
-            # under-reports the used range - which several writers emit, some as
-            # a bare "A1" placeholder - silently truncated the sheet to it.
-            # Pandas calls this for the same reason.
-            worksheet.reset_dimensions()
-            rows = [row for row in worksheet.iter_rows(values_only=True)]
-        finally:
-            book.close()
+    The cells are streamed out of the package by `xlsx.read_sheet` rather than
+    through openpyxl's `iter_rows`, which held every row of the sheet as Python
+    objects before one column was typed. Its rules are openpyxl's read-only
+    ones with `data_only=True` - pandas' own load kwargs, the load-bearing one
+    being that a formula cell yields its cached value, not its formula text -
+    and with `reset_dimensions()`: a <dimension> record that under-reports the
+    used range, as several writers emit it, must not truncate the sheet.
+    """
+    # Opened from the path whatever its extension, so a real xlsx saved as
+    # `.xls` - an extension this viewer claims - reads like any other.
+    return _excel_table(
+        *xlsx.read_sheet(file_path, sheet or None, _NULL_STRING_SET | _EXCEL_ERRORS)
+    )
+
+
+def _read_excel_sheets(file_path, sheets):
+    """`_read_excel` for several sheets in one pass: {sheet: table}.
+
+    None in `sheets` is the first worksheet, as for `_read_excel`.
+    """
+    read = xlsx.read_sheets(
+        file_path, [sheet or None for sheet in sheets], _NULL_STRING_SET | _EXCEL_ERRORS
+    )
+    return {sheet: _excel_table(*read[sheet or None]) for sheet in sheets}
+
 
+def _excel_table(header_row, columns):
+    """The arrow table of one sheet's `xlsx.read_sheet` result."""
     # A sheet's used range routinely overshoots its data - a cell that was
     # formatted and then cleared still counts - so pandas trimmed trailing empty
-    # rows and this does too. Two limits, both learned from a differential sweep
-    # against pandas: only rows AFTER the header are candidates, or a sheet whose
-    # single row is a blank header lost its columns as well; and a cell holding
-    # whitespace is a value, not an absence, so `is None` is the test rather than
-    # `_is_blank`. Empty rows BETWEEN data rows stay - they carry position, and
-    # dropping them would shift every row number after them.
-    while len(rows) > 1 and all(v is None for v in rows[-1]):
-        rows.pop()
-
-    if not rows:
+    # rows and `read_sheet` does too. Two limits, both learned from a
+    # differential sweep against pandas: only rows AFTER the header are
+    # candidates, or a sheet whose single row is a blank header lost its columns
+    # as well; and a cell holding whitespace is a value, not an absence. Empty
+    # rows BETWEEN data rows stay - they carry position, and dropping them would
+    # shift every row number after them. The width is that of the rows kept.
+    if header_row is None:
         return pl.DataFrame().to_arrow()
 
-    header_row, data_rows = rows[0], rows[1:]
-    width = max(len(header_row), max((len(row) for row in data_rows), default=0))
-    names = _header_names(header_row, width)
+    names = _header_names(header_row, len(columns))
 
-    columns = {}
-    for i, name in enumerate(names):
-        values = [
-            _null_marker_to_none(row[i] if i < len(row) else None)
-            for row in data_rows
-        ]
-        columns[name] = _column_series(name, values)
+    # A column of one kind arrives as arrow, already typed as polars would
+    # type its values; anything else is resolved over every row, as before.
+    frame = {}
+    for name, values in zip(names, columns):
+        if isinstance(values, pa.ChunkedArray):
+            frame[name] = pl.Series(name, values)
+        else:
+            frame[name] = _column_series(name, values)
+
+    return _cast_unsupported_columns_to_string(pl.DataFrame(frame)).to_arrow()
 
-    return _cast_unsupported_columns_to_string(pl.DataFrame(columns)).to_arrow()
 
+# key -> worksheet titles, for `list_excel_sheets`, keyed as the read cache is
+# so an edited workbook is listed afresh. Every metadata request asks, and the
+# tab bar waits on the answer. Bounded; least recently asked forgotten first.
+_SHEET_LISTS = OrderedDict()
+_SHEET_LISTS_MAX = 256
+_SHEET_LISTS_LOCK = threading.Lock()
 
+
+@metrics.phase("read")
 def list_excel_sheets(file_path):
     """Return worksheet names in workbook order. Empty list for non-Excel files.
 
@@ -437,24 +439,27 @@ def list_excel_sheets(file_path):
     can only fail when clicked. Pandas' ExcelFile.sheet_names read `.worksheets`
     for the same reason. Hidden worksheets stay listed - they do hold data.
 
-    Read straight from openpyxl rather than through polars: polars only exposes
-    the sheet list by reading the sheets, and this is called on every metadata
-    request purely to populate the tab bar.
+    Read by `xlsx.sheet_names` from the workbook part and its relationships
+    alone. This used to be a read-only `openpyxl.load_workbook`, which parses
+    the styles, shared strings and every sheet's dimensions first - seconds on
+    a large, heavily styled workbook, paid again on each metadata request just
+    to fill the tab bar. The list is cached besides, keyed like a read.
     """
     if get_file_type(file_path) != "excel":
         return []
-    # Handed an open file rather than a path, for the reason `_read_excel`
-    # records, and loaded through the shared `_OPENPYXL_LOAD` so the two sites
-    # cannot drift: this one runs FIRST on every metadata request, and both
-    # openpyxl's refusal of a .xls path and its external-link walk raise
-    # exceptions that are not ValueError, so either 500d here even once the
-    # reader opened the same file.
-    with open(file_path, "rb") as handle:
-        book = openpyxl.load_workbook(handle, **_OPENPYXL_LOAD)
-        try:
-            return [sheet.title for sheet in book.worksheets]
-        finally:
-            book.close()
+    key = _cache_key(file_path, None)
+    with _SHEET_LISTS_LOCK:
+        if key in _SHEET_LISTS:
+            _SHEET_LISTS.move_to_end(key)
+            return list(_SHEET_LISTS[key])
+    sheets = xlsx.sheet_names(file_path)
+    with _SHEET_LISTS_LOCK:
+        for stale in [k for k in _SHEET_LISTS if k[0] == key[0]]:
+            del _SHEET_LISTS[stale]
+        _SHEET_LISTS[key] = tuple(sheets)
+        while len(_SHEET_LISTS) > _SHEET_LISTS_MAX:
+            _SHEET_LISTS.popitem(last=False)
+    return sheets
 
 
 def _read_delimited(file_path, delimiter):
@@ -468,7 +473,20 @@ def _read_delimited(file_path, delimiter):
     consequence rather than the cause: binary rubbish named .csv reports a field
     count where the truth was the encoding. The retry also pays a second full
     scan, which the read cache amortises to once per file.
+
+    A file of at least two `_CSV_CHUNK_BYTES` is read in pieces first - see
+    `_read_delimited_chunked` - and only comes here whole when that declines.
     """
+    df, _ = _read_delimited_frame(file_path, delimiter)
+    return _delimited_table(df)
+
+
+def _read_delimited_frame(file_path, delimiter):
+    """The frame `_read_delimited` converts, and the encoding it was read as."""
+    if os.path.getsize(file_path) >= 2 * _CSV_CHUNK_BYTES:
+        chunked = _read_delimited_chunked(file_path, delimiter)
+        if chunked is not None:
+            return chunked
     try:
         df = pl.read_csv(
             file_path,
@@ -476,6 +494,7 @@ def _read_delimited(file_path, delimiter):
             infer_schema_length=None,
             null_values=_NULL_STRINGS,
         )
+        return df, "utf8"
     except ComputeError:
         df = pl.read_csv(
             file_path,
@@ -484,9 +503,216 @@ def _read_delimited(file_path, delimiter):
             infer_schema_length=None,
             null_values=_NULL_STRINGS,
         )
+        return df, "latin1"
+
+
+def _delimited_table(df):
+    """A frame read from a delimited file, as the arrow table served for it."""
     return _cast_unsupported_columns_to_string(_name_unnamed_columns(df)).to_arrow()
 
 
+# A delimited file is split into pieces of about this many bytes, each read on
+# its own thread. Smaller than two pieces, it is read whole.
+_CSV_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Full-file inference types each value, then the column from the SET of those
+# types: one type is itself, {Int64, Float64} and {Int128, Float64} are
+# Float64, {Int64, Int128} is Int128, and anything else - three numeric types
+# together, or a boolean among numbers - is String. Measured against polars.
+# An integer literal is Int128 exactly when it falls outside this range.
+_CSV_INT_RANGE = 2**63
+
+
+def _read_delimited_chunked(file_path, delimiter):
+    """`_read_delimited_frame` over pieces of the file read at once, or None.
+
+    `infer_schema_length=None` makes polars infer every column from every row
+    before parsing one, on a single thread: 5.2s of a 5.8s read of a 150 MB
+    csv. Here the file is cut at record boundaries into `_CSV_CHUNK_BYTES`
+    pieces, each given the header line and read - inferred from all of its
+    rows, then parsed - on its own thread; polars releases the GIL throughout.
+
+    The pieces' types are then merged as full-file inference would have typed
+    the column - see `_merged_csv_type`: one piece's integers and another's
+    floats are Float64, and integers with a string anywhere are String, as in
+    a single read. A piece whose column is entirely null has no say. A piece
+    read as other than the merged schema is read again with that schema rather
+    than cast: cast, an integer id '007' in a column that turned out to be text
+    would come back '7'.
+
+    The frame comes with the encoding it was read as. None, for
+    `_read_delimited_frame` to read the file whole, when the pieces cannot
+    stand for it: a file with no record boundary to cut at, a piece whose
+    columns differ from the header's, a type this merge does not know, or any
+    parse failure other than an encoding one. The whole read then produces
+    the same table or the same error it always did. An encoding failure reads
+    every piece again as latin1, as the whole read would.
+    """
+    with open(file_path, "rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        bounds = _record_bounds(data, _CSV_CHUNK_BYTES)
+        if len(bounds) < 4:
+            return None
+        header = data[: bounds[0]]
+        if not header.strip():
+            # Polars skips leading blank lines, so the header is further on
+            # and would be read as each piece's first record
+            return None
+        pieces = list(zip(bounds[1:-1], bounds[2:]))
+        with ThreadPoolExecutor(
+            max_workers=min(len(pieces), os.cpu_count() or 1),
+            thread_name_prefix="tabular-viewer-csv",
+        ) as pool:
+            for encoding in ("utf8", "latin1"):
+                try:
+                    df = _read_pieces(pool, data, header, pieces, delimiter, encoding)
+                    return None if df is None else (df, encoding)
+                except ComputeError as e:
+                    if "utf-8" not in str(e):
+                        return None
+    return None
+
+
+def _read_pieces(pool, data, header, pieces, delimiter, encoding):
+    """The frame of `pieces` of `data`, each read in `pool` behind `header`.
+
+    None when the pieces' columns or types rule out standing for a whole read;
+    see `_read_delimited_chunked`.
+    """
+
+    def read(piece, schema=None):
+        start, end = piece
+        return pl.read_csv(
+            header + data[start:end],
+            separator=delimiter,
+            encoding=encoding,
+            infer_schema_length=None,
+            null_values=_NULL_STRINGS,
+            schema_overrides=schema,
+        )
+
+    frames = list(pool.map(read, pieces))
+    names = frames[0].columns
+    if any(frame.columns != names for frame in frames):
+        return None
+
+    schema = {}
+    for name in names:
+        dtype = _merged_csv_type([_csv_summary(frame[name]) for frame in frames])
+        if dtype is None:
+            return None
+        schema[name] = dtype
+
+    rereads = {}
+    for index, frame in enumerate(frames):
+        if any(frame.schema[n] != schema[n] and _typed(frame[n]) for n in names):
+            rereads[index] = pool.submit(read, pieces[index], list(schema.values()))
+        elif frame.schema != schema:
+            # Only all-null columns differ, and a null is a null in any type.
+            # Built by name: `DataFrame.cast` skips a column named '', and a
+            # frame built from a list of series renames it 'column_<n>'.
+            frames[index] = pl.DataFrame(
+                {name: frame[name].cast(dtype) for name, dtype in schema.items()}
+            )
+    for index, future in rereads.items():
+        # Named back: read with a positional schema, a column headed '' comes
+        # back as 'column_<n>'
+        frames[index] = pl.DataFrame(dict(zip(names, future.result())))
+    return pl.concat(frames, how="vertical", rechunk=False)
+
+
+def _typed(column):
+    # An entirely null column reads as String, and is no evidence of type
+    return column.null_count() < len(column)
+
+
+def _csv_summary(column):
+    """What `_merged_csv_type` needs of one piece's column: (dtype, typed, big).
+
+    `big` is whether it is Float64 with a value as large as an Int128 literal.
+    """
+    typed = _typed(column)
+    big = (
+        typed
+        and column.dtype == pl.Float64
+        and bool((column.filter(column.is_finite()).abs() >= _CSV_INT_RANGE).any())
+    )
+    return column.dtype, typed, big
+
+
+def _merged_csv_type(summaries):
+    """The type full-file inference gives a column read in pieces, or None.
+
+    Each piece is given by its `_csv_summary`. Only a piece's type is known,
+    not the set of value types behind it, so a merge is made only where the
+    pieces settle that set: a Float64 piece may hide integers, and an Int128
+    one holds Int64 values exactly when one of its values fits. None where they
+    cannot - Float64 beside Int128, or a Float64 piece holding a value as large
+    as an Int128 literal.
+    """
+    seen = []
+    for dtype, typed, _ in summaries:
+        if typed and dtype not in seen:
+            seen.append(dtype)
+    if not seen:
+        return pl.String
+    if pl.Float64 in seen:
+        big = any(big for _, _, big in summaries)
+        if big or pl.Int128 in seen:
+            return None
+        if all(dtype in (pl.Int64, pl.Float64) for dtype in seen):
+            return pl.Float64
+    elif len(seen) == 1:
+        return seen[0]
+    elif all(dtype in (pl.Int64, pl.Int128) for dtype in seen):
+        return pl.Int128
+    if all(
+        dtype in (pl.Int64, pl.Int128, pl.Float64, pl.Boolean, pl.String)
+        for dtype in seen
+    ):
+        return pl.String
+    return None
+
+
+def _record_bounds(data, size):
+    """Offsets cutting `data` into its header record and pieces of about `size`.
+
+    [end of header, start of piece 1, ..., len(data)]. A piece ends at the first
+    newline past `size` bytes that is outside quotes - after an even number of
+    quote characters since the start of the file. That counts an escaped quote
+    twice, which is how CSV escapes it, and is the same test polars uses to
+    split a file among its own threads. An empty list when the header record
+    never ends.
+    """
+    quotes = 0
+
+    def record_end(position):
+        nonlocal quotes
+        while True:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                return None
+            quotes += data[position:newline].count(b'"')
+            position = newline + 1
+            if quotes % 2 == 0:
+                return position
+
+    header_end = record_end(0)
+    if header_end is None:
+        return []
+    bounds = [header_end, header_end]
+    while bounds[-1] + size < len(data):
+        # A slice: an mmap has `find` but not `count`
+        quotes += data[bounds[-1] : bounds[-1] + size].count(b'"')
+        end = record_end(bounds[-1] + size)
+        if end is None or end >= len(data):
+            break
+        bounds.append(end)
+    bounds.append(len(data))
+    return bounds
+
+
 def _sqlite_uri(file_path):
     """Read-only SQLite URI for a path, percent-escaping '?' and '#'."""
     return "file:" + quote(os.path.abspath(file_path)) + "?mode=ro"
@@ -505,18 +731,180 @@ def _sqlite_conn(file_path):
     pandas' own DatabaseError, because pandas re-raised driver errors as its
     own; polars lets sqlite3.Error through untouched. Polars' own failures are
     mapped once for every format in `_read_uncached` rather than per reader.
+
+    The connection is borrowed from the database's pool, and returned to it
+    unless the caller raised - see `_SQLITE_POOL`.
     """
+    path = os.path.abspath(file_path)
     try:
-        conn = sqlite3.connect(_sqlite_uri(file_path), uri=True)
+        conn, token = _sqlite_borrow(path)
     except sqlite3.Error as e:
         raise ValueError(f"Cannot open SQLite database: {e}")
     try:
-        with closing(conn):
-            yield conn
+        yield conn
     except sqlite3.Error as e:
+        conn.close()
         raise ValueError(f"Cannot read SQLite database: {e}")
+    except BaseException:
+        conn.close()
+        raise
+    _sqlite_return(path, conn, token)
+
+
+# abspath -> [(connection, token, returned at)] of idle read-only connections,
+# most recently returned last; databases in least recently used order. Every
+# listing, metadata request, window and table switch used to open its own
+# connection, which starts with an empty page cache and parses the schema
+# again before its first query - on a wide table, most of a page's cost. A
+# pooled connection keeps both. It holds no transaction while idle, so it sees
+# every commit and never stands in a checkpoint's way.
+#
+# The token is the file's (st_dev, st_ino) when the connection was opened and
+# the pool generation: a database replaced by another file - a new inode - or
+# a change of the settings below closes the connections it would invalidate
+# rather than handing them out. Guarded by _SQLITE_POOL_LOCK.
+_SQLITE_POOL = OrderedDict()
+_SQLITE_POOL_LOCK = threading.Lock()
+_SQLITE_POOL_GENERATION = 0
+_SQLITE_POOL_DATABASES = 64
+
+# Idle connections kept per database; 0 opens one per use, as before
+_SQLITE_POOL_SIZE = 4
+
+# An idle connection unused this long is closed, by a timer armed while the
+# pool holds any - an open connection pins a deleted database's disk space,
+# and on Windows stops it being deleted at all.
+_SQLITE_POOL_IDLE_SECONDS = 60.0
+_SQLITE_POOL_TIMER = None
+
+# Each connection's page cache (PRAGMA cache_size); 0 leaves SQLite's 2 MB
+_SQLITE_CACHE_BYTES = 16 * 1024 * 1024
+
+# Bytes of the database each connection memory-maps (PRAGMA mmap_size) rather
+# than reading through the page cache; 0, SQLite's default, maps none. Off by
+# default: an I/O error on a mapped page - a file truncated behind SQLite's
+# back, a network mount going away - is a SIGBUS that kills the server, not
+# an error a request can report.
+_SQLITE_MMAP_BYTES = 0
+
+
+def _sqlite_borrow(path):
+    """An idle connection to `path` from the pool, or a new one, and its token."""
+    try:
+        stat = os.stat(path)
+        inode = (stat.st_dev, stat.st_ino)
+    except OSError:
+        # Left to connect to report
+        inode = None
+    stale = []
+    conn = None
+    with _SQLITE_POOL_LOCK:
+        token = (inode, _SQLITE_POOL_GENERATION)
+        idle = _SQLITE_POOL.get(path, [])
+        while idle and conn is None:
+            candidate, candidate_token, _ = idle.pop()
+            if candidate_token == token:
+                conn = candidate
+            else:
+                stale.append(candidate)
+        if not idle:
+            _SQLITE_POOL.pop(path, None)
+        cache_bytes, mmap_bytes = _SQLITE_CACHE_BYTES, _SQLITE_MMAP_BYTES
+    for candidate in stale:
+        candidate.close()
+    if conn is not None:
+        return conn, token
+    conn = sqlite3.connect(_sqlite_uri(path), uri=True, check_same_thread=False)
+    try:
+        if cache_bytes:
+            # Negative: a size in KiB rather than in pages
+            conn.execute(f"PRAGMA cache_size = {-max(cache_bytes // 1024, 1)}")
+        conn.execute(f"PRAGMA mmap_size = {int(mmap_bytes)}")
+        # Already read-only by its URI; this also refuses a write through
+        # whatever else a pooled connection meets later, such as ATTACH
+        conn.execute("PRAGMA query_only = ON")
+    except BaseException:
+        conn.close()
+        raise
+    return conn, token
+
+
+def _sqlite_return(path, conn, token):
+    """Put a borrowed connection back in `path`'s pool, or close it."""
+    try:
+        if conn.in_transaction:
+            # Held open, a read transaction would pin its snapshot: the next
+            # borrower would not see later commits, and a WAL checkpoint
+            # could not get past it
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+    closed = []
+    with _SQLITE_POOL_LOCK:
+        if (
+            token[0] is None
+            or token[1] != _SQLITE_POOL_GENERATION
+            or not _SQLITE_POOL_SIZE
+        ):
+            closed.append(conn)
+        else:
+            idle = _SQLITE_POOL.setdefault(path, [])
+            _SQLITE_POOL.move_to_end(path)
+            idle.append((conn, token, time.monotonic()))
+            while len(idle) > _SQLITE_POOL_SIZE:
+                closed.append(idle.pop(0)[0])
+            while len(_SQLITE_POOL) > _SQLITE_POOL_DATABASES:
+                closed.extend(entry[0] for entry in _SQLITE_POOL.popitem(last=False)[1])
+            _sqlite_pool_arm()
+    for idle_conn in closed:
+        idle_conn.close()
+
+
+def _sqlite_pool_sweep():
+    """Close connections idle for `_SQLITE_POOL_IDLE_SECONDS`; rearm if any remain."""
+    global _SQLITE_POOL_TIMER
+    cutoff = time.monotonic() - _SQLITE_POOL_IDLE_SECONDS
+    closed = []
+    with _SQLITE_POOL_LOCK:
+        _SQLITE_POOL_TIMER = None
+        for path, idle in list(_SQLITE_POOL.items()):
+            closed.extend(entry[0] for entry in idle if entry[2] <= cutoff)
+            idle[:] = [entry for entry in idle if entry[2] > cutoff]
+            if not idle:
+                del _SQLITE_POOL[path]
+        if _SQLITE_POOL:
+            _sqlite_pool_arm()
+    for conn in closed:
+        conn.close()
+
+
+def _sqlite_pool_arm():
+    """Schedule `_sqlite_pool_sweep` unless it is. Caller holds _SQLITE_POOL_LOCK."""
+    global _SQLITE_POOL_TIMER
+    if _SQLITE_POOL_TIMER is None:
+        _SQLITE_POOL_TIMER = threading.Timer(
+            _SQLITE_POOL_IDLE_SECONDS, _sqlite_pool_sweep
+        )
+        _SQLITE_POOL_TIMER.daemon = True
+        _SQLITE_POOL_TIMER.start()
+
 
+def _sqlite_pool_close():
+    """Close every idle connection; those lent out are closed on return."""
+    global _SQLITE_POOL_GENERATION, _SQLITE_POOL_TIMER
+    with _SQLITE_POOL_LOCK:
+        _SQLITE_POOL_GENERATION += 1
+        closed = [entry[0] for idle in _SQLITE_POOL.values() for entry in idle]
+        _SQLITE_POOL.clear()
+        if _SQLITE_POOL_TIMER is not None:
+            _SQLITE_POOL_TIMER.cancel()
+            _SQLITE_POOL_TIMER = None
+    for conn in closed:
+        conn.close()
 
+
+@metrics.phase("read")
 def list_sqlite_tables(file_path):
     """User tables in name order. System tables (sqlite_*) excluded.
 
@@ -584,45 +972,436 @@ def _read_sqlite(file_path, table=None):
     is validated against `list_sqlite_tables` - table names cannot be passed
     as SQL parameters, so the whitelist is the security boundary.
 
-    The whole table is read. Serving a page from a SQL LIMIT/OFFSET window was
-    tried and reverted - see DEF-3 in docs/defects.md.
+    The whole table is read, in rowid order where the table has one - the order
+    `read_sqlite_window` pages it in, so a row has one position in both. A page
+    of a table that is not cached is served by that window; see DEF-3 in
+    docs/defects.md for why it was once reverted and what it takes now.
     """
+    table = _sqlite_table(file_path, table)
+    with _sqlite_conn(file_path) as conn:
+        columns = _sqlite_columns(conn, table)
+        df = _sqlite_frame(conn, table, columns, _sqlite_keyed(conn, table, columns))
+    # A column that is NULL in every row comes back Null-typed, which has no
+    # arrow kernels - column statistics raise ArrowNotImplementedError, not a
+    # ValueError, so the request 500s. SQLite is where a wholly-NULL column is
+    # most common, so the same cast the two text readers apply belongs here.
+    return _cast_unsupported_columns_to_string(df).to_arrow()
+
+
+def _sqlite_frame(conn, table, columns, keyed):
+    """Every row of `table`, as `_read_sqlite` reads it, in a polars frame."""
+    select_list = ", ".join(_blob_placeholder_sql(c) for c in columns)
+    order = " ORDER BY rowid" if keyed else ""
+    # infer_schema_length=None is load-bearing: SQLite columns carry a
+    # storage class per value, not per column, so a column of integers with
+    # a string at row 201 raises ComputeError under the default 100-row
+    # window. Scanning every row is what makes it resolve to string, which
+    # is the behaviour `mixed_types` in the fixture exists to pin.
+    return pl.read_database(
+        f"SELECT {select_list} FROM {_quote_ident(table)}{order}",
+        conn,
+        infer_schema_length=None,
+    )
+
+
+def _sqlite_table(file_path, table):
+    """`table`, or the first user table for None, checked against the database's."""
     tables = list_sqlite_tables(file_path)
     if not tables:
         raise ValueError("No user tables in database")
     if not table:
-        table = tables[0]
-    elif table not in tables:
+        return tables[0]
+    if table not in tables:
         raise ValueError(f"Table not found: {table}")
+    return table
+
+
+def _sqlite_columns(conn, table):
+    """The columns `SELECT *` returns from `table`, in order."""
+    # table_xinfo, not table_info: table_info omits generated columns, which
+    # `SELECT *` returns, so building the select list from it silently
+    # dropped them from the grid. xinfo's trailing `hidden` flag is 0 for an
+    # ordinary column, 2 and 3 for VIRTUAL and STORED generated columns
+    # (both of which `*` includes), and 1 for a genuinely hidden column such
+    # as an fts5 shadow (which `*` excludes) - so `!= 1` reproduces `*`.
+    columns = [
+        row[1]
+        for row in conn.execute(f"PRAGMA table_xinfo({_quote_ident(table)})")
+        if row[-1] != 1
+    ]
+    if not columns:
+        raise ValueError(f"Table has no readable columns: {table}")
+    return columns
+
+
+def _sqlite_keyed(conn, table, columns):
+    """Whether `rowid` in a query on `table` is its rowid, to page and order by.
+
+    Not in a WITHOUT ROWID table, which has none, nor where a column of that
+    name - or of its aliases oid and _rowid_ - hides it.
+    """
+    if {c.lower() for c in columns} & {"rowid", "oid", "_rowid_"}:
+        return False
+    try:
+        conn.execute(f"SELECT rowid FROM {_quote_ident(table)} LIMIT 0")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+class _SqliteLayout:
+    """What windowed reads of one version of a table share. See `_sqlite_layout`."""
+
+    def __init__(
+        self,
+        ident,
+        select_list,
+        schema,
+        arrow_schema,
+        rows,
+        classes,
+        first_rowid,
+        dense,
+    ):
+        self.ident = ident
+        self.select_list = select_list
+        # Polars types of the full read, before `_cast_unsupported_columns_to_string`
+        self.schema = schema
+        self.arrow_schema = arrow_schema
+        self.rows = rows
+        # Column -> the storage classes its values have, NULL aside
+        self.classes = classes
+        # Whether the rowids run first_rowid, first_rowid + 1, ... with no gap,
+        # so a row's position is its rowid less first_rowid. Otherwise every
+        # rowid in order, read once when a position is first looked up.
+        self.first_rowid = first_rowid
+        self.dense = dense
+        self.rowids = None
+        # Keyset bookmarks: the row at position offsets[i] is the first with a
+        # rowid above marks[i]. Position 0 needs no bookmark.
+        self.offsets = [0]
+        self.marks = [None]
+        self.lock = threading.Lock()
+
+
+# read cache key -> _SqliteLayout, or None for a table windows cannot serve.
+# Bounded; least recently used forgotten first.
+_SQLITE_LAYOUTS = OrderedDict()
+_SQLITE_LAYOUTS_MAX = 256
+_SQLITE_LAYOUTS_LOCK = threading.Lock()
+
+# The storage classes a SQLite value other than NULL can have
+_SQLITE_STORAGE_CLASSES = ("integer", "real", "text", "blob")
+
+# Bookmarks kept per layout. A scroll adds one per page; past this many, new
+# pages are still served, from the nearest bookmark below them.
+_SQLITE_BOOKMARKS_MAX = 4096
+
+
+def _sqlite_layout(file_path, table):
+    """The schema and row count a full read of `table` would have, or None.
+
+    One aggregate query counts each column's storage classes - `typeof()` on
+    every row, but no value leaves SQLite - and from them comes the type a
+    full read infers: any TEXT or BLOB (which reads as its placeholder text)
+    makes a column String, otherwise any REAL makes it Float64, otherwise any
+    INTEGER Int64, and a column of nothing but NULL is Null. That is polars'
+    own inference over the values the full read hands it, so a window read
+    under this schema types every cell exactly as the full read does.
+
+    None for a table a window cannot stand in for: one without a usable rowid
+    (see `_sqlite_keyed`), and one with a blank column name, which polars
+    renames on the way in (DEF-13) so no schema keyed on the name applies.
+    """
+    table = _sqlite_table(file_path, table)
+    key = _cache_key(file_path, table)
+    with _SQLITE_LAYOUTS_LOCK:
+        if key in _SQLITE_LAYOUTS:
+            _SQLITE_LAYOUTS.move_to_end(key)
+            return _SQLITE_LAYOUTS[key]
     ident = _quote_ident(table)
+    layout = None
     with _sqlite_conn(file_path) as conn:
-        # table_xinfo, not table_info: table_info omits generated columns, which
-        # `SELECT *` returns, so building the select list from it silently
-        # dropped them from the grid. xinfo's trailing `hidden` flag is 0 for an
-        # ordinary column, 2 and 3 for VIRTUAL and STORED generated columns
-        # (both of which `*` includes), and 1 for a genuinely hidden column such
-        # as an fts5 shadow (which `*` excludes) - so `!= 1` reproduces `*`.
-        columns = [
-            row[1]
-            for row in conn.execute(f"PRAGMA table_xinfo({ident})")
-            if row[-1] != 1
-        ]
-        if not columns:
-            raise ValueError(f"Table has no readable columns: {table}")
-        select_list = ", ".join(_blob_placeholder_sql(c) for c in columns)
-        # infer_schema_length=None is load-bearing: SQLite columns carry a
-        # storage class per value, not per column, so a column of integers with
-        # a string at row 201 raises ComputeError under the default 100-row
-        # window. Scanning every row is what makes it resolve to string, which
-        # is the behaviour `mixed_types` in the fixture exists to pin.
+        columns = _sqlite_columns(conn, table)
+        if "" not in columns and _sqlite_keyed(conn, table, columns):
+            sums = _sqlite_class_sums(columns)
+            row = conn.execute(
+                f"SELECT count(*), min(rowid), max(rowid), {sums} FROM {ident}"
+            ).fetchone()
+            classes = _sqlite_class_sets(columns, row[3:])
+            schema = {column: _sqlite_class_type(classes[column]) for column in columns}
+            arrow_schema = _cast_unsupported_columns_to_string(
+                pl.DataFrame(schema=schema)
+            ).to_arrow().schema
+            layout = _SqliteLayout(
+                ident,
+                ", ".join(_blob_placeholder_sql(c) for c in columns),
+                schema,
+                arrow_schema,
+                row[0],
+                classes,
+                row[1],
+                row[0] == 0 or row[2] - row[1] + 1 == row[0],
+            )
+    with _SQLITE_LAYOUTS_LOCK:
+        for stale in [k for k in _SQLITE_LAYOUTS if k[:2] == key[:2]]:
+            del _SQLITE_LAYOUTS[stale]
+        _SQLITE_LAYOUTS[key] = layout
+        while len(_SQLITE_LAYOUTS) > _SQLITE_LAYOUTS_MAX:
+            _SQLITE_LAYOUTS.popitem(last=False)
+    return layout
+
+
+def _sqlite_class_sums(columns):
+    """Select-list terms counting the values of each storage class in `columns`."""
+    return ", ".join(
+        f"sum(typeof({_quote_ident(column)}) = '{storage}')"
+        for column in columns
+        for storage in _SQLITE_STORAGE_CLASSES
+    )
+
+
+def _sqlite_class_sets(columns, sums):
+    """Column -> the storage classes the `_sqlite_class_sums` values `sums` found."""
+    width = len(_SQLITE_STORAGE_CLASSES)
+    return {
+        column: frozenset(
+            storage
+            for storage, count in zip(
+                _SQLITE_STORAGE_CLASSES, sums[width * index : width * (index + 1)]
+            )
+            if count
+        )
+        for index, column in enumerate(columns)
+    }
+
+
+def _sqlite_class_type(present):
+    """The polars type a full read infers for the storage classes `present`."""
+    if present & {"text", "blob"}:
+        return pl.String
+    if "real" in present:
+        return pl.Float64
+    if "integer" in present:
+        return pl.Int64
+    return pl.Null
+
+
+@metrics.phase("read")
+def sqlite_schema(file_path, table=None):
+    """(arrow schema, row count) of a full read of `table`, without one, or None.
+
+    None when windows cannot serve the table; see `_sqlite_layout`.
+    """
+    layout = _sqlite_layout(file_path, table)
+    if layout is None:
+        return None
+    return layout.arrow_schema, layout.rows
+
+
+@metrics.phase("read")
+def read_sqlite_window(file_path, offset, limit, table=None):
+    """Rows `offset..offset+limit` of a table and its row count, or None.
+
+    The rows are typed by `_sqlite_layout` rather than by what the window
+    happens to hold, so they are exactly the full read's slice - the agreement
+    whose absence reverted the first LIMIT/OFFSET attempt (DEF-3). They are
+    found by keyset: `WHERE rowid > ?` from the nearest bookmark at or below
+    `offset`, so a scroll reads each page's rows and no others rather than
+    stepping over every row before them. None when windows cannot serve the
+    table.
+    """
+    layout = _sqlite_layout(file_path, table)
+    if layout is None:
+        return None
+    offset, limit = max(int(offset), 0), max(int(limit), 0)
+    with layout.lock:
+        mark = bisect_right(layout.offsets, offset) - 1
+        mark_offset, mark_rowid = layout.offsets[mark], layout.marks[mark]
+    where = "" if mark_rowid is None else f" WHERE rowid > {int(mark_rowid)}"
+    alias, df = _sqlite_select(
+        file_path,
+        layout,
+        layout.select_list,
+        layout.schema,
+        f"{where} ORDER BY rowid LIMIT {limit} OFFSET {offset - mark_offset}",
+    )
+    if len(df) == limit and limit:
+        with layout.lock:
+            end = offset + len(df)
+            position = bisect_right(layout.offsets, end)
+            if (
+                layout.offsets[position - 1] != end
+                and len(layout.offsets) < _SQLITE_BOOKMARKS_MAX
+            ):
+                layout.offsets.insert(position, end)
+                layout.marks.insert(position, df[alias][-1])
+    window = _cast_unsupported_columns_to_string(df.drop(alias)).to_arrow()
+    return window, layout.rows
+
+
+def _sqlite_select(file_path, layout, select_list, schema, tail, params=()):
+    """Run `SELECT rowid, <select_list> FROM <table><tail>` under `schema`.
+
+    Returns the name the rowid column came back under - any name that is not
+    already a column - and the frame, which has `schema`'s columns even when
+    no row matched.
+    """
+    alias = "rowid"
+    while alias in layout.schema:
+        alias = "_" + alias
+    selected = f", {select_list}" if select_list else ""
+    query = f"SELECT rowid AS {_quote_ident(alias)}{selected} FROM {layout.ident}{tail}"
+    schema = {alias: pl.Int64, **schema}
+    with _sqlite_conn(file_path) as conn, _polars_errors("sqlite"):
         df = pl.read_database(
-            f"SELECT {select_list} FROM {ident}", conn, infer_schema_length=None
+            query,
+            conn,
+            schema_overrides=schema,
+            execute_options={"parameters": list(params)} if params else None,
         )
-    # A column that is NULL in every row comes back Null-typed, which has no
-    # arrow kernels - column statistics raise ArrowNotImplementedError, not a
-    # ValueError, so the request 500s. SQLite is where a wholly-NULL column is
-    # most common, so the same cast the two text readers apply belongs here.
-    return _cast_unsupported_columns_to_string(df).to_arrow()
+    if df.is_empty():
+        df = pl.DataFrame(schema=schema)
+    return alias, df
+
+
+def sqlite_storage_classes(file_path, table=None):
+    """Each column's storage classes, as a frozenset of `_SQLITE_STORAGE_CLASSES`.
+
+    A column whose set is {"integer"} reads as int64, one of integers and reals
+    or reals alone as float64, and any with "text" or "blob" as string. None
+    when windows cannot serve the table (see `_sqlite_layout`), which is also
+    when `scan_sqlite` cannot.
+    """
+    layout = _sqlite_layout(file_path, table)
+    return None if layout is None else layout.classes
+
+
+# pyarrow compares an int64 column with a float by promoting it to double, and
+# refuses to when a value lies outside this range, which a double holds exactly.
+_DOUBLE_EXACT_INTEGER = 2**53
+
+
+def sqlite_beyond_double(file_path, column, table=None):
+    """Whether `column` holds an integer a double cannot represent exactly.
+
+    One probe, which an index on the column answers without a scan.
+    """
+    table = _sqlite_table(file_path, table)
+    col = _quote_ident(column)
+    with _sqlite_conn(file_path) as conn:
+        return bool(
+            conn.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {_quote_ident(table)}"
+                f" WHERE typeof({col}) = 'integer' AND ({col} > ? OR {col} < ?))",
+                [_DOUBLE_EXACT_INTEGER, -_DOUBLE_EXACT_INTEGER],
+            ).fetchone()[0]
+        )
+
+
+@metrics.phase("read")
+def scan_sqlite(
+    file_path, columns, where="", params=(), order="", limit=None, table=None
+):
+    """Only `columns` of the rows `where` keeps, in `order`, and their file positions.
+
+    The SQLite counterpart of `scan_parquet`, with the difference that `where`
+    does filter: the rows returned are exactly the rows it keeps, and the
+    caller applies only what it left out. `where` and `order` are SQL built
+    by the caller from `_quote_ident` names and `?` placeholders, whose values
+    are `params`; `order` is followed by rowid, so ties stay in file order, and
+    an empty one is file order. The columns are typed as the full read types
+    them.
+
+    Returns (table, uint64 positions) - a row's position is its index in the
+    full read - or None when windows cannot serve the table.
+    """
+    layout = _sqlite_layout(file_path, table)
+    if layout is None:
+        return None
+    tail = f" WHERE {where}" if where else ""
+    tail += f" ORDER BY {order + ', ' if order else ''}rowid"
+    if limit is not None:
+        tail += f" LIMIT {max(int(limit), 0)}"
+    alias, df = _sqlite_select(
+        file_path,
+        layout,
+        ", ".join(_blob_placeholder_sql(c) for c in columns),
+        {c: layout.schema[c] for c in columns},
+        tail,
+        params,
+    )
+    narrow = _cast_unsupported_columns_to_string(df.drop(alias)).to_arrow()
+    return narrow, _sqlite_positions(file_path, layout, df[alias].to_arrow())
+
+
+def count_sqlite(file_path, where="", params=(), table=None):
+    """How many rows of a table `where` keeps; see `scan_sqlite`."""
+    table = _sqlite_table(file_path, table)
+    tail = f" WHERE {where}" if where else ""
+    with _sqlite_conn(file_path) as conn:
+        return conn.execute(
+            f"SELECT count(*) FROM {_quote_ident(table)}{tail}", list(params)
+        ).fetchone()[0]
+
+
+@metrics.phase("read")
+def read_sqlite_rows(file_path, positions, table=None):
+    """The rows of a table at `positions`, in the order given.
+
+    The counterpart of `read_parquet_rows` for a page of a view that
+    `scan_sqlite` computed: the positions become rowids and the rows are looked
+    up by them, so a page reads its own rows and no others. Typed as the full
+    read types them. None when windows cannot serve the table.
+    """
+    layout = _sqlite_layout(file_path, table)
+    if layout is None:
+        return None
+    wanted = _sqlite_rowids_at(file_path, layout, positions)
+    frames = []
+    # SQLite caps the parameters of one statement; 999 is the oldest cap
+    for start in range(0, max(len(wanted), 1), 999):
+        batch = wanted.slice(start, 999).to_pylist()
+        tail = (
+            f" WHERE rowid IN ({', '.join('?' * len(batch))})" if batch else " LIMIT 0"
+        )
+        alias, df = _sqlite_select(
+            file_path, layout, layout.select_list, layout.schema, tail, batch
+        )
+        frames.append(df)
+    df = pl.concat(frames)
+    order = pc.index_in(wanted, value_set=df[alias].to_arrow())
+    rows = _cast_unsupported_columns_to_string(df.drop(alias)).to_arrow()
+    return rows.take(order)
+
+
+def _sqlite_all_rowids(file_path, layout):
+    """Every rowid of the layout's table, in order, read once per layout."""
+    with layout.lock:
+        rowids = layout.rowids
+    if rowids is None:
+        with _sqlite_conn(file_path) as conn:
+            query = f"SELECT rowid FROM {layout.ident} ORDER BY rowid"
+            rowids = pa.array([r for (r,) in conn.execute(query)], pa.int64())
+        with layout.lock:
+            layout.rowids = rowids
+    return rowids
+
+
+def _sqlite_positions(file_path, layout, rowids):
+    """The positions of rows, given their rowids, as uint64."""
+    if layout.dense:
+        return pc.subtract(rowids, layout.first_rowid or 0).cast(pa.uint64())
+    return pc.index_in(rowids, value_set=_sqlite_all_rowids(file_path, layout)).cast(
+        pa.uint64()
+    )
+
+
+def _sqlite_rowids_at(file_path, layout, positions):
+    """The rowids of the rows at `positions`, as int64."""
+    if layout.dense:
+        return pc.add(positions.cast(pa.int64()), layout.first_rowid or 0)
+    return _sqlite_all_rowids(file_path, layout).take(positions)
 
 
 # ---------------------------------------------------------------------------
@@ -645,40 +1424,284 @@ def _read_sqlite(file_path, table=None):
 
 _CACHE_MAX_BYTES = 256 * 1024 * 1024
 
+# A table bigger than this is served but not cached; 0 leaves only the budget
+# as the cap. A node can want a large budget for many mid-sized tables without
+# one huge table taking all of it.
+_TABLE_MAX_BYTES = 0
+
 # key -> arrow Table, in least-recently-used order
 _CACHE = OrderedDict()
 _CACHE_BYTES = 0
 
-# Handlers are synchronous, so today they run one at a time on the IOLoop
-# thread. The lock costs nothing measurable and means the cache does not
-# silently corrupt if a handler is ever moved onto an executor.
+# Which entry to evict is decided by cost, not age alone. Entries are ranked
+# GreedyDual-Size-Frequency style: priority = clock + hits * seconds / bytes,
+# where seconds is what the read took and bytes what the entry holds, and the
+# lowest priority goes first (the oldest, among equals). The clock rises to
+# each victim's priority, so an entry nobody touches sinks below newer ones
+# and even an expensive table ages out eventually. Pure LRU let one 50 ms
+# parquet read push out a workbook that took 40 s to parse.
+#
+# key -> [seconds, hits, priority], for every key in _CACHE
+_CACHE_COST = {}
+_CACHE_CLOCK = 0.0
+
+# key -> hits, for recent keys the cache refused or evicted. A newcomer is only
+# admitted over entries worth more than it (see `_cache_put`), so without a
+# memory of refusals a table read on every request would be refused every time
+# as a first-time visitor. Bounded; oldest forgotten first.
+_GHOSTS = OrderedDict()
+_GHOSTS_MAX = 1024
+
+# key -> {name: arrow array} computed from the table cached under key - the sort
+# permutations of `views`. They are worth keeping exactly as long as their
+# table is, so they live on its entry: counted in _CACHE_BYTES, and dropped
+# when it is evicted or superseded. See `cache_derived`.
+_DERIVED = {}
+
+# Handlers run their reads on the executor's thread pool (see `executors`), so
+# several can be inside the cache at once. Every access to _CACHE and
+# _CACHE_BYTES goes through this lock; the reads themselves run outside it.
 _CACHE_LOCK = threading.Lock()
 
+# key -> _Flight, for every read currently running. Opening a widget fires the
+# metadata, rows, statistics and unique-values requests together, and with the
+# handlers concurrent each of them missed the cache and started its own full
+# read of the same file. The first caller reads; the rest wait on its flight.
+# Guarded by _CACHE_LOCK, so a caller that misses the cache and finds no flight
+# cannot interleave with a flight that is just landing its table.
+_INFLIGHT = {}
+
+# Callers served by another caller's read rather than their own, since import.
+_COALESCED_WAITERS = 0
+
+# How a cache miss on one sheet of a workbook reads it. "off": that sheet
+# alone. "eager": every worksheet not already cached, in one pass over the
+# package, before answering - the first tab waits longer and every other tab
+# is then a cache hit. "background": the sheet alone, then the rest in one pass
+# on the thread pool. A pass parses the shared strings and styles once rather
+# than once per tab, which is most of a small sheet's read. See `_fill_sheets`.
+_EXCEL_WORKBOOK_READS = "off"
+_EXCEL_WORKBOOK_MODES = ("off", "eager", "background")
+
+# Whether a new version of a csv, tsv or SQLite table whose previous version is
+# cached is first tried as that table plus the rows appended since - see
+# `_read_appended`. Off by default: a rewrite that leaves the old content's
+# fingerprint intact would be taken for an append.
+_APPEND_REFRESH = False
+
+# How many full reads may run at once, across every file; 0 for no limit. Each
+# holds its whole table in memory, and its conversion more on top, so on a
+# small pod the number of reads in flight is what decides an OOM kill.
+# Reads past the limit wait for a slot. Guarded by _READ_SLOTS.
+_MAX_CONCURRENT_READS = 0
+_READS_RUNNING = 0
+_READS_WAITING = 0
+_READ_SLOTS = threading.Condition()
+
+# When set, every read through the cache appends one JSON line here - which
+# file, how big and how long it took to read - the trace that
+# scripts/bench_cache_policy.py replays to compare eviction policies.
+_TRACE_PATH = os.environ.get("JUPYTERLAB_TABULAR_DATA_VIEWER_CACHE_TRACE") or None
+_TRACE_LOCK = threading.Lock()
+
+
+class _Flight:
+    """One read in progress, and how many callers are waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.table = None
+        self.seconds = 0.0
+        self.error = None
+        self.waiters = 0
+
 
 def _cache_key(file_path, sheet):
-    """Identity of a read: absolute path, sheet/table, mtime/size, WAL mtime/size."""
+    """Identity of a read: absolute path, sheet/table, and the file's version.
+
+    The version is the file's mtime and size and its WAL sidecar's, except for
+    a SQLite database, whose version comes from SQLite's own change counters;
+    see `_sqlite_version`.
+    """
     path = os.path.abspath(file_path)
     stat = os.stat(path)
+    version = _sqlite_version(path, stat)
+    if version is None:
+        try:
+            wal = os.stat(path + "-wal")
+            wal_id = (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            # No sidecar: not a WAL database, or already checkpointed
+            wal_id = (0, 0)
+        version = (stat.st_mtime_ns, stat.st_size, wal_id)
+    return (path, sheet, *version)
+
+
+# abspath -> _SqliteWatch, for WAL databases only. Bounded; least recently used
+# closed first.
+_SQLITE_WATCHES = OrderedDict()
+_SQLITE_WATCHES_MAX = 64
+_SQLITE_WATCHES_LOCK = threading.Lock()
+
+
+class _SqliteWatch:
+    """A read-only connection held open on a WAL database, to ask it what changed.
+
+    `PRAGMA data_version` moves whenever another connection commits, but only
+    relative to the connection asking - a fresh one has nothing to compare
+    with - so the connection has to outlive the request. It holds no
+    transaction between calls, so it never stands in a checkpoint's way; like
+    any open reader it does keep the last writer to close from deleting the
+    -wal and -shm sidecars.
+    """
+
+    def __init__(self, path, stat):
+        self.conn = sqlite3.connect(
+            _sqlite_uri(path), uri=True, check_same_thread=False
+        )
+        self.inode = (stat.st_dev, stat.st_ino)
+        self.data_version = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def _sqlite_version(path, stat):
+    """The version of a SQLite database, for `_cache_key`; None for any other file.
+
+    Stat-based keys were wrong both ways. They missed commits: a WAL commit
+    that rewrote frames of a checkpointed log left its size unchanged and could
+    land on the same mtime tick. And they re-read on changes that were none:
+    anything that bumps a mtime, or a writer that rolled back, discarded every
+    cached table of the file. SQLite records its own changes, so ask it:
+
+    - a rollback-journal database increments the file change counter in its
+      header on every commit, so the version is the header - the counter,
+      the schema cookie and the size - with no connection needed. The header
+      alone does not tell one file from another: two databases built by the
+      same script have identical headers whatever rows they hold, so the
+      file's device, inode and mtime are part of it too. Without the mtime a
+      database deleted and rebuilt, which the filesystem is free to give the
+      same inode, kept the first build's key - here and in the spill, across
+      restarts. A touch therefore reads the file again; what the counter
+      adds to a stat key is a commit that lands in the same mtime tick;
+    - a WAL database commits into the log without touching the header, so its
+      changes are read from `PRAGMA data_version` on a connection held open per
+      database (`_SqliteWatch`). While that has not moved the version is the
+      one last computed, however the files' mtimes moved. When it has, the
+      version is the file's device and inode, the header, `PRAGMA
+      schema_version` and the log's mtime and size - values another process
+      computes alike, which the spill relies on (see `spill._names`) - made
+      unique if they happen to repeat the last.
+
+    A WAL database the watch cannot open - on a read-only mount, say, where
+    the -shm sidecar cannot be created - falls back to the stat key (None).
+    """
+    if not S_ISREG(stat.st_mode):
+        return None
     try:
-        wal = os.stat(path + "-wal")
-        wal_id = (wal.st_mtime_ns, wal.st_size)
+        with open(path, "rb") as fh:
+            header = fh.read(100)
     except OSError:
-        # No sidecar: not a WAL database, or already checkpointed
-        wal_id = (0, 0)
-    return (path, sheet, stat.st_mtime_ns, stat.st_size, wal_id)
+        return None
+    if len(header) < 100 or not header.startswith(_MAGIC[0][0]):
+        return None
+    counter = int.from_bytes(header[24:28], "big")
+    cookie = int.from_bytes(header[40:44], "big")
+    inode = (stat.st_dev, stat.st_ino)
+    if header[18] != 2:
+        return ("sqlite", *inode, stat.st_mtime_ns, stat.st_size, counter, cookie)
+
+    with _SQLITE_WATCHES_LOCK:
+        watch = _SQLITE_WATCHES.get(path)
+        if watch is not None and watch.inode != inode:
+            # Replaced by another file; the old connection watches the old one.
+            # Held open, the old file's inode cannot have been reused for it.
+            del _SQLITE_WATCHES[path]
+            watch.close()
+            watch = None
+        if watch is not None:
+            _SQLITE_WATCHES.move_to_end(path)
+    if watch is None:
+        try:
+            watch = _SqliteWatch(path, stat)
+        except sqlite3.Error:
+            return None
+        with _SQLITE_WATCHES_LOCK:
+            _SQLITE_WATCHES[path] = watch
+            while len(_SQLITE_WATCHES) > _SQLITE_WATCHES_MAX:
+                _SQLITE_WATCHES.popitem(last=False)[1].close()
+
+    with watch.lock:
+        try:
+            data_version = watch.conn.execute("PRAGMA data_version").fetchone()[0]
+            schema_version = watch.conn.execute("PRAGMA schema_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+        if data_version == watch.data_version and watch.version is not None:
+            return watch.version
+        try:
+            wal = os.stat(path + "-wal")
+            wal_id = (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            wal_id = (0, 0)
+        version = (
+            "sqlite-wal", *inode, stat.st_size, counter, schema_version, wal_id
+        )
+        if watch.version is not None and watch.version[: len(version)] == version:
+            version += (time.time_ns(),)
+        watch.data_version, watch.version = data_version, version
+        return version
 
 
 def _cache_get(key):
-    """Cached table for `key`, or None. Marks the entry most recently used."""
+    """Cached table for `key`, or None. Counts a hit on the entry."""
     with _CACHE_LOCK:
-        if key not in _CACHE:
-            return None
-        _CACHE.move_to_end(key)
-        return _CACHE[key]
+        return _cache_touch(key)
+
+
+def _cache_touch(key, hit=True):
+    """`_cache_get` for a caller already holding _CACHE_LOCK.
+
+    `hit=False` marks the entry recently used without counting an access.
+    """
+    if key not in _CACHE:
+        return None
+    _CACHE.move_to_end(key)
+    if hit:
+        _CACHE_COST[key][1] += 1
+        _cache_rank(key)
+    return _CACHE[key]
 
 
-def _cache_put(key, table):
-    """Store `table`, dropping stale versions of the same file and evicting LRU."""
+def _footprint(key):
+    """Bytes held for an entry: its table and everything derived from it."""
+    derived = _DERIVED.get(key, {})
+    return _CACHE[key].nbytes + sum(value.nbytes for value in derived.values())
+
+
+def _priority(seconds, hits, size):
+    # A floor on both, so an instant read or an empty table still ranks
+    return _CACHE_CLOCK + hits * max(seconds, 1e-6) / max(size, 1)
+
+
+def _cache_rank(key):
+    """Recompute an entry's priority from its cost, hits and footprint."""
+    cost = _CACHE_COST[key]
+    cost[2] = _priority(cost[0], cost[1], _footprint(key))
+
+
+def _cache_put(key, table, seconds=0.0):
+    """Store `table`, read in `seconds`, if it is worth what it would displace.
+
+    Stale versions of the same file are dropped first. Then, when the budget
+    has no room, the entries that would be evicted for it are found; if any of
+    them ranks above the newcomer - an expensive table against a cheap one -
+    nothing is evicted and the newcomer is not cached. Returns whether it was.
+    """
     global _CACHE_BYTES
     size = table.nbytes
     path, sheet = key[0], key[1]
@@ -688,23 +1711,519 @@ def _cache_put(key, table):
         # when the new table is too big to cache, or growing a file past the
         # budget would strand its old version until LRU pressure removed it.
         for stale in [k for k in _CACHE if k[0] == path and k[1] == sheet]:
-            _CACHE_BYTES -= _CACHE.pop(stale).nbytes
-        if size > _CACHE_MAX_BYTES:
+            _cache_drop(stale)
+        hits = _GHOSTS.pop(key, 0) + 1
+        if size > _CACHE_MAX_BYTES or (_TABLE_MAX_BYTES and size > _TABLE_MAX_BYTES):
             # One table bigger than the whole budget would evict everything and
             # then itself on the next read; skip it rather than thrash.
-            return
+            metrics.count("cache_refusals")
+            return False
+        priority = _priority(seconds, hits, size)
+        victims = _cache_victims(_CACHE_BYTES + size - _CACHE_MAX_BYTES)
+        if victims and max(_CACHE_COST[k][2] for k in victims) > priority:
+            _remember(key, hits)
+            metrics.count("cache_refusals")
+            return False
         _CACHE[key] = table
+        _CACHE_COST[key] = [seconds, hits, priority]
         _CACHE_BYTES += size
-        while _CACHE_BYTES > _CACHE_MAX_BYTES:
-            _CACHE_BYTES -= _CACHE.popitem(last=False)[1].nbytes
+        _cache_evict(keep=key)
+        return True
+
+
+def _cache_victims(needed):
+    """The entries eviction would take, in order, to free `needed` bytes."""
+    victims = []
+    for key in sorted(_CACHE, key=lambda k: _CACHE_COST[k][2]):
+        if needed <= 0:
+            break
+        victims.append(key)
+        needed -= _footprint(key)
+    return victims
+
+
+def _remember(key, hits):
+    """Keep a refused or evicted key's hit count, forgetting the oldest."""
+    _GHOSTS[key] = hits
+    _GHOSTS.move_to_end(key)
+    while len(_GHOSTS) > _GHOSTS_MAX:
+        _GHOSTS.popitem(last=False)
+
+
+def _cache_drop(key):
+    """Remove an entry and everything derived from it. Caller holds _CACHE_LOCK."""
+    global _CACHE_BYTES
+    _CACHE_BYTES -= _CACHE.pop(key).nbytes
+    _CACHE_COST.pop(key, None)
+    for value in _DERIVED.pop(key, {}).values():
+        _CACHE_BYTES -= value.nbytes
+
+
+def _cache_evict(keep=None):
+    """Drop the lowest-priority entries until within budget. Caller holds the lock.
+
+    `keep` is never evicted: it is the entry that was just stored or grown.
+    `min` scans in recency order, so among equal priorities the least recently
+    used goes - which is plain LRU whenever costs are equal per byte.
+    """
+    global _CACHE_CLOCK
+    while _CACHE_BYTES > _CACHE_MAX_BYTES:
+        candidates = [k for k in _CACHE if k != keep]
+        if not candidates:
+            break
+        victim = min(candidates, key=lambda k: _CACHE_COST[k][2])
+        _CACHE_CLOCK = _CACHE_COST[victim][2]
+        _remember(victim, _CACHE_COST[victim][1])
+        _cache_drop(victim)
+        metrics.count("cache_evictions")
+
+
+def cached_derived(key, name):
+    """The value stored under `name` for the table cached at `key`, or None."""
+    with _CACHE_LOCK:
+        return _DERIVED.get(key, {}).get(name)
+
+
+def cache_derived(key, name, value):
+    """Keep `value`, computed from the table cached at `key`, for as long as it is.
+
+    `value` is anything with `nbytes`. It is counted against _CACHE_MAX_BYTES
+    with the tables and evicted with its own table, which it refreshes as used.
+    Returns whether it was kept: not when the table is not (or no longer)
+    cached, since nothing could then find it again under a live key, and not
+    when the table and everything derived from it would outgrow the budget.
+    """
+    global _CACHE_BYTES
+    if key is None:
+        return False
+    with _CACHE_LOCK:
+        if _cache_touch(key, hit=False) is None:
+            return False
+        derived = _DERIVED.setdefault(key, {})
+        if name in derived:
+            return True
+        if _footprint(key) + value.nbytes > _CACHE_MAX_BYTES:
+            return False
+        derived[name] = value
+        _CACHE_BYTES += value.nbytes
+        # Bigger now, so worth less per byte; and never its own victim
+        _cache_rank(key)
+        _cache_evict(keep=key)
+        return True
+
+
+def configure(
+    cache_max_bytes=None,
+    table_max_bytes=None,
+    max_concurrent_reads=None,
+    excel_workbook_reads=None,
+    append_refresh=None,
+    sqlite_pool_size=None,
+    sqlite_cache_bytes=None,
+    sqlite_mmap_bytes=None,
+):
+    """Change the cache's limits. Any argument left as None keeps its value.
+
+    A smaller budget evicts down to it at once; a changed read limit applies to
+    the next read that asks for a slot, and raising it wakes any waiting. A
+    changed SQLite connection setting closes the pooled connections, so every
+    one opened from then on has it.
+    """
+    global _CACHE_MAX_BYTES, _TABLE_MAX_BYTES, _MAX_CONCURRENT_READS
+    global _EXCEL_WORKBOOK_READS, _APPEND_REFRESH
+    global _SQLITE_POOL_SIZE, _SQLITE_CACHE_BYTES, _SQLITE_MMAP_BYTES
+    sqlite_settings = (
+        ("sqlite_pool_size", sqlite_pool_size),
+        ("sqlite_cache_bytes", sqlite_cache_bytes),
+        ("sqlite_mmap_bytes", sqlite_mmap_bytes),
+    )
+    for name, value in (
+        ("cache_max_bytes", cache_max_bytes),
+        ("table_max_bytes", table_max_bytes),
+        ("max_concurrent_reads", max_concurrent_reads),
+        *sqlite_settings,
+    ):
+        if value is not None and value < 0:
+            raise ValueError(f"{name} must not be negative")
+    if excel_workbook_reads is not None:
+        if excel_workbook_reads not in _EXCEL_WORKBOOK_MODES:
+            modes = ", ".join(_EXCEL_WORKBOOK_MODES)
+            raise ValueError(f"excel_workbook_reads must be one of {modes}")
+        _EXCEL_WORKBOOK_READS = excel_workbook_reads
+    if append_refresh is not None:
+        _APPEND_REFRESH = bool(append_refresh)
+    if any(value is not None for _, value in sqlite_settings):
+        with _SQLITE_POOL_LOCK:
+            if sqlite_pool_size is not None:
+                _SQLITE_POOL_SIZE = sqlite_pool_size
+            if sqlite_cache_bytes is not None:
+                _SQLITE_CACHE_BYTES = sqlite_cache_bytes
+            if sqlite_mmap_bytes is not None:
+                _SQLITE_MMAP_BYTES = sqlite_mmap_bytes
+        _sqlite_pool_close()
+    with _CACHE_LOCK:
+        if cache_max_bytes is not None:
+            _CACHE_MAX_BYTES = cache_max_bytes
+            _cache_evict()
+        if table_max_bytes is not None:
+            _TABLE_MAX_BYTES = table_max_bytes
+    if max_concurrent_reads is not None:
+        with _READ_SLOTS:
+            _MAX_CONCURRENT_READS = max_concurrent_reads
+            _READ_SLOTS.notify_all()
+
+
+@contextmanager
+def _read_slot():
+    """Hold one of the _MAX_CONCURRENT_READS slots for the duration of a read."""
+    global _READS_RUNNING, _READS_WAITING
+    with _READ_SLOTS:
+        _READS_WAITING += 1
+        try:
+            _READ_SLOTS.wait_for(
+                lambda: not _MAX_CONCURRENT_READS
+                or _READS_RUNNING < _MAX_CONCURRENT_READS
+            )
+        finally:
+            _READS_WAITING -= 1
+        _READS_RUNNING += 1
+    try:
+        yield
+    finally:
+        with _READ_SLOTS:
+            _READS_RUNNING -= 1
+            _READ_SLOTS.notify()
+
+
+def cache_state():
+    """The cache's point-in-time figures, for `metrics.snapshot`."""
+    with _CACHE_LOCK:
+        state = {
+            "cache_bytes": _CACHE_BYTES,
+            "cache_max_bytes": _CACHE_MAX_BYTES,
+            "cache_entries": len(_CACHE),
+            "reads_in_flight": len(_INFLIGHT),
+        }
+    with _READ_SLOTS:
+        state["reads_running"] = _READS_RUNNING
+        state["reads_waiting"] = _READS_WAITING
+    return state
 
 
 def _cache_clear():
     """Empty the cache. Used by tests."""
-    global _CACHE_BYTES
+    global _CACHE_BYTES, _CACHE_CLOCK
     with _CACHE_LOCK:
         _CACHE.clear()
+        _CACHE_COST.clear()
+        _GHOSTS.clear()
+        _DERIVED.clear()
         _CACHE_BYTES = 0
+        _CACHE_CLOCK = 0.0
+    with _SHEET_LISTS_LOCK:
+        _SHEET_LISTS.clear()
+    with _SQLITE_LAYOUTS_LOCK:
+        _SQLITE_LAYOUTS.clear()
+    with _PARQUET_ROWS_LOCK:
+        _PARQUET_ROWS.clear()
+    with _SQLITE_WATCHES_LOCK:
+        watches = list(_SQLITE_WATCHES.values())
+        _SQLITE_WATCHES.clear()
+    for watch in watches:
+        watch.close()
+    _sqlite_pool_close()
+
+
+def _land(key, flight):
+    """Retire a finished flight and release its waiters."""
+    global _COALESCED_WAITERS
+    with _CACHE_LOCK:
+        del _INFLIGHT[key]
+        waiters = flight.waiters
+        _COALESCED_WAITERS += waiters
+    flight.done.set()
+    if waiters:
+        _log.info(
+            "read of %s [%s] served %d concurrent waiter(s)", key[0], key[1], waiters
+        )
+
+
+def _trace(key, table, seconds):
+    """Append one read to the trace file, when one is configured."""
+    if _TRACE_PATH is None:
+        return
+    # Paths are hashed: a trace is meant to be shared with whoever tunes the
+    # cache, and the names of the files read are nobody else's business.
+    record = {
+        "file": hashlib.sha256(repr(key[:2]).encode()).hexdigest()[:16],
+        "version": hashlib.sha256(repr(key[2:]).encode()).hexdigest()[:16],
+        "bytes": table.nbytes,
+        "seconds": round(seconds, 6),
+    }
+    try:
+        with _TRACE_LOCK, open(_TRACE_PATH, "a") as trace:
+            trace.write(json.dumps(record) + "\n")
+    except OSError as e:
+        _log.warning("could not write cache trace %s: %s", _TRACE_PATH, e)
+
+
+def _parquet_null_columns_to_string(table):
+    """Retype a parquet table's `null` columns as string.
+
+    The same policy `_cast_unsupported_columns_to_string` applies to the three
+    polars readers, repeated here because parquet returns before their
+    dispatch: a column that is null in every row arrives as arrow `null`, and
+    column statistics on it raise ArrowNotImplementedError, which is not a
+    ValueError, so the request 500s. Pandas' parquet reader gave such a column
+    object dtype and the old cascade typed it as text.
+
+    The type comes from the file's schema, not from the rows read, so a window
+    of row groups and the whole file agree on it.
+    """
+    null_columns = [f.name for f in table.schema if pa.types.is_null(f.type)]
+    if not null_columns:
+        return table
+    return table.cast(
+        pa.schema(
+            [
+                f.with_type(pa.string()) if f.name in null_columns else f
+                for f in table.schema
+            ]
+        )
+    )
+
+
+@metrics.phase("read")
+def read_parquet_window(file_path, offset, limit, sheet=None):
+    """Rows `offset` to `offset + limit` of a parquet file, and its row count.
+
+    Browsing a parquet with no filter or sort needs one page of it, but the
+    whole-table read decoded the entire file to cut that page - and a file
+    bigger than `_CACHE_MAX_BYTES` is never cached, so it did so again on every
+    scroll. The footer records each row group's row count, so the page maps to
+    the row groups that overlap it and only those are decoded: the first page
+    of a 50 GB file costs one row group, not 50 GB.
+
+    A table already in the read cache is sliced instead, which is cheaper
+    still. `sheet` is only part of that cache key; parquet has no sheets.
+    Nothing read here is cached - the row groups of one page are not the table.
+    """
+    try:
+        cached = _cache_get(_cache_key(file_path, sheet))
+    except OSError:
+        cached = None
+    if cached is not None:
+        metrics.note_cache("hit")
+        return cached.slice(offset, limit), len(cached)
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    groups = []
+    first_row = 0
+    start = 0
+    for index in range(metadata.num_row_groups):
+        end = start + metadata.row_group(index).num_rows
+        if end > offset and start < offset + limit:
+            if not groups:
+                first_row = start
+            groups.append(index)
+        start = end
+
+    if groups:
+        table = parquet_file.read_row_groups(groups).slice(offset - first_row, limit)
+    else:
+        # Past the last row, or an empty file: no rows, but the file's columns
+        table = parquet_file.schema_arrow.empty_table()
+    return _parquet_null_columns_to_string(table), metadata.num_rows
+
+
+def peek_cached(file_path, sheet=None):
+    """The read cache's key for a file and its cached table, or None for either.
+
+    Never reads the file. The key is None when the file cannot be statted.
+    """
+    try:
+        key = _cache_key(file_path, sheet)
+    except OSError:
+        return None, None
+    cached = _cache_get(key)
+    if cached is not None:
+        metrics.note_cache("hit")
+    return key, cached
+
+
+@metrics.phase("read")
+def parquet_schema(file_path):
+    """A parquet file's arrow schema as the readers type it, from the footer alone."""
+    schema = pq.read_schema(file_path)
+    return pa.schema(
+        [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema]
+    )
+
+
+def _row_group_starts(metadata):
+    """The file row number each row group starts at."""
+    starts = []
+    start = 0
+    for index in range(metadata.num_row_groups):
+        starts.append(start)
+        start += metadata.row_group(index).num_rows
+    return starts
+
+
+# A parquet with more row groups than this is paged from its footer even when
+# it would fit the read cache: one whole read then decodes every group for a
+# first page that needs one, and a file cut that finely is usually too big to
+# scroll all of anyway.
+_PARQUET_CACHE_MAX_GROUPS = 256
+
+
+def parquet_fits_cache(file_path):
+    """Whether a whole read of a parquet file would be kept by the read cache.
+
+    Judged from the footer alone: the row groups' uncompressed sizes estimate
+    the decoded table, which has to fit `_CACHE_MAX_BYTES` (and
+    `_TABLE_MAX_BYTES`, when set) for `_cache_put` to keep it. A file that fits
+    is cheaper read whole once and paged from the cache - a page read from its
+    row groups decodes them again on every scroll - so the window and row
+    readers are only for files that do not.
+    """
+    metadata = pq.ParquetFile(file_path).metadata
+    if metadata.num_row_groups > _PARQUET_CACHE_MAX_GROUPS:
+        return False
+    size = sum(
+        metadata.row_group(index).total_byte_size
+        for index in range(metadata.num_row_groups)
+    )
+    return size <= _CACHE_MAX_BYTES and not (
+        _TABLE_MAX_BYTES and size > _TABLE_MAX_BYTES
+    )
+
+
+@metrics.phase("read")
+def scan_parquet(file_path, columns, prune=None):
+    """Only `columns` of a parquet file, skipping row groups `prune` rules out.
+
+    Filtering a parquet used to read every column of every row group first, then
+    throw most of both away. A filter needs only the columns it tests and the
+    column it sorts by, and a row group whose min/max statistics prove a
+    comparison false for all its rows - `price > 100` against a group whose
+    maximum is 80 - holds no row the filter keeps. `prune` is that comparison
+    as a dataset expression; `pyarrow.dataset` tests it against each group's
+    statistics without decoding the group.
+
+    `prune` only ever skips; the rows read are not filtered by it, so it must
+    be implied by whatever predicate the caller applies afterwards.
+
+    Returns the table and, for each row group read, its (first file row, row
+    count), so the caller can map a row of the table back to the file.
+    """
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    starts = _row_group_starts(metadata)
+    groups = list(range(metadata.num_row_groups))
+    if prune is not None and groups:
+        fragment = next(iter(ds.dataset(file_path, format="parquet").get_fragments()))
+        groups = [
+            piece.row_groups[0].id for piece in fragment.split_by_row_group(prune)
+        ]
+    if groups:
+        table = parquet_file.read_row_groups(groups, columns=columns)
+    else:
+        table = parquet_file.schema_arrow.empty_table().select(columns)
+    spans = [(starts[g], metadata.row_group(g).num_rows) for g in groups]
+    return _parquet_null_columns_to_string(table), spans
+
+
+# Rows read ahead of a sorted or filtered page of a parquet too big to cache.
+# A page of such a view decodes every row group holding one of its rows -
+# nearly all of them, on a sort - so each page read as well the rows of the
+# next few, and those pages are cut from here without decoding anything.
+# Bounded by entries; an entry is a few pages of rows.
+_PARQUET_PAGES_AHEAD = 4
+_PARQUET_ROWS_ENTRIES = 4
+
+# read key -> (file row -> row of the table, table), least recently used first
+_PARQUET_ROWS = OrderedDict()
+_PARQUET_ROWS_LOCK = threading.Lock()
+
+
+@metrics.phase("read")
+def read_parquet_rows(file_path, positions, read_key=None, ahead=None):
+    """The rows of a parquet file at file row `positions`, in the order given.
+
+    Decodes only the row groups holding them, all in one read - though a page
+    of a sorted view has a row in most of them. `ahead` is the positions the
+    next pages will ask for: they are read in the same pass and kept under
+    `read_key`, and a later call whose rows are all among them decodes nothing.
+    """
+    wanted = positions.to_pylist()
+    if read_key is not None:
+        with _PARQUET_ROWS_LOCK:
+            held = _PARQUET_ROWS.get(read_key)
+            if held is not None and all(p in held[0] for p in wanted):
+                _PARQUET_ROWS.move_to_end(read_key)
+                rows = [held[0][p] for p in wanted]
+                return held[1].take(pa.array(rows, pa.uint64()))
+
+    fetch = wanted
+    if read_key is not None and ahead is not None:
+        seen = set(wanted)
+        fetch = wanted + [p for p in ahead.to_pylist() if p not in seen]
+    table = _read_parquet_positions(file_path, fetch)
+    if fetch is not wanted:
+        with _PARQUET_ROWS_LOCK:
+            _PARQUET_ROWS[read_key] = ({p: i for i, p in enumerate(fetch)}, table)
+            _PARQUET_ROWS.move_to_end(read_key)
+            while len(_PARQUET_ROWS) > _PARQUET_ROWS_ENTRIES:
+                _PARQUET_ROWS.popitem(last=False)
+        table = table.slice(0, len(wanted))
+    return table
+
+
+def _read_parquet_positions(file_path, wanted):
+    """`read_parquet_rows` of the file itself, for a list of file rows."""
+    parquet_file = pq.ParquetFile(file_path, pre_buffer=True)
+    metadata = parquet_file.metadata
+    starts = _row_group_starts(metadata)
+    owner = [bisect_right(starts, p) - 1 for p in wanted]
+    groups = sorted(set(owner))
+    if not groups:
+        return _parquet_null_columns_to_string(parquet_file.schema_arrow.empty_table())
+
+    # Where each group's rows begin in the concatenation of the groups read
+    base = {}
+    offset = 0
+    for g in groups:
+        base[g] = offset
+        offset += metadata.row_group(g).num_rows
+    local = [p - starts[g] + base[g] for p, g in zip(wanted, owner)]
+    table = parquet_file.read_row_groups(groups).take(pa.array(local, pa.uint64()))
+    return _parquet_null_columns_to_string(table)
+
+
+@metrics.phase("read")
+def read_columns(file_path, columns, sheet=None):
+    """Only `columns` of a file, for a caller that looks at no others.
+
+    Statistics and unique values examine one column, and on a 400-column parquet
+    the whole-table read decoded 399 columns they never looked at. Parquet is
+    columnar on disk, so a read of the named columns decodes nothing else. Other
+    formats are row-oriented - the whole table is read (and cached) anyway, and
+    the columns are selected from it.
+
+    A name the file lacks is left out rather than raised, so the caller's own
+    "column not found" check answers exactly as it does for a full table.
+    """
+    if get_file_type(file_path) != "parquet":
+        table = read_as_arrow_table(file_path, sheet)
+        return table.select([c for c in columns if c in table.column_names])
+    _, cached = peek_cached(file_path, sheet)
+    if cached is not None:
+        return cached.select([c for c in columns if c in cached.column_names])
+    names = pq.read_schema(file_path).names
+    table = pq.read_table(file_path, columns=[c for c in columns if c in names])
+    return _parquet_null_columns_to_string(table)
 
 
 def _read_uncached(file_path, sheet):
@@ -722,26 +2241,8 @@ def _read_uncached(file_path, sheet):
     """
     ft = get_file_type(file_path)
     if ft == "parquet":
-        table = pq.read_table(file_path)
-        # The same policy `_cast_unsupported_columns_to_string` applies to the
-        # three polars readers, repeated here because parquet returns before
-        # their dispatch: a column that is null in every row arrives as arrow
-        # `null`, and column statistics on it raise ArrowNotImplementedError,
-        # which is not a ValueError, so the request 500s. Pandas' parquet
-        # reader gave such a column object dtype and the old cascade typed it
-        # as text.
-        null_columns = [f.name for f in table.schema if pa.types.is_null(f.type)]
-        if null_columns:
-            table = table.cast(
-                pa.schema(
-                    [
-                        f.with_type(pa.string()) if f.name in null_columns else f
-                        for f in table.schema
-                    ]
-                )
-            )
-        return table
-    try:
+        return _parquet_null_columns_to_string(pq.read_table(file_path))
+    with _polars_errors(ft):
         if ft == "excel":
             return _read_excel(file_path, sheet)
         if ft == "sqlite":
@@ -750,6 +2251,20 @@ def _read_uncached(file_path, sheet):
             return _read_delimited(file_path, ",")
         if ft == "tsv":
             return _read_delimited(file_path, "\t")
+    raise ValueError(f"Unsupported file type: {ft}")
+
+
+def _read_excel_sheets_uncached(file_path, sheets):
+    """`_read_excel_sheets` with `_read_uncached`'s error mapping, for the pool."""
+    with _polars_errors("excel"):
+        return _read_excel_sheets(file_path, sheets)
+
+
+@contextmanager
+def _polars_errors(ft):
+    """Re-raise a polars failure while reading an `ft` file as ValueError."""
+    try:
+        yield
     except PolarsError as e:
         raise ValueError(f"Cannot read {ft} file: {e}")
     except PanicException as e:
@@ -760,7 +2275,557 @@ def _read_uncached(file_path, sheet):
         # arrow FFI, and every UTF-16-encoded csv has one - which is what Excel's
         # own "Unicode Text" export produces.
         raise ValueError(f"Cannot read {ft} file: {e}")
-    raise ValueError(f"Unsupported file type: {ft}")
+
+
+def _read(file_path, sheet):
+    """`_read_uncached`, with Excel sent to the process pool.
+
+    The Excel reader holds the GIL for almost the whole of a read, so on a
+    worker thread it still starves the IOLoop; in a separate process it cannot.
+    The worker runs `_read_uncached` itself, so the ValueError mapping happens
+    on its side and only exceptions that pickle ever cross back.
+    """
+    if get_file_type(file_path) == "excel":
+        return run_in_process(_read_uncached, file_path, sheet)
+    return _read_uncached(file_path, sheet)
+
+
+def _read_timed(file_type, file_path, sheet):
+    """`_read` in a read slot, its time recorded against `file_type`."""
+    with _read_slot():
+        started = time.perf_counter()
+        table = _read(file_path, sheet)
+    metrics.observe_read(file_type, time.perf_counter() - started)
+    return table
+
+
+def _read_spilled(key, file_path, sheet):
+    """`_read`, through the on-disk tier for every format but parquet. See `spill`.
+
+    Returns the table and, under `_APPEND_REFRESH`, the tail `_read_appended`
+    needs to extend it with a later version's new rows - or None for that.
+    """
+    file_type = get_file_type(file_path)
+    if file_type == "parquet":
+        return _read_timed(file_type, file_path, sheet), None
+    appendable = _APPEND_REFRESH and file_type in ("csv", "tsv", "sqlite")
+    tail = None
+    table = spill_get(key)
+    if table is not None:
+        metrics.count("spill_hits")
+        return table, tail
+    if appendable:
+        appended = _read_appended(key, file_path, sheet, file_type)
+        if appended is not None:
+            metrics.count("append_refreshes")
+            table, tail = appended
+        else:
+            table, tail = _read_tailed(file_type, file_path, sheet)
+    else:
+        table = _read_timed(file_type, file_path, sheet)
+    spill_put(key, table)
+    return table, tail
+
+
+# Under `_APPEND_REFRESH`, the name the tail of a csv, tsv or SQLite table is
+# kept under on its cache entry (`cache_derived`)
+_APPEND_TAIL = ("append",)
+
+# An appended table is its cached predecessor's chunks and one more per column.
+# Past this many, they are combined, so a file appended to all day does not
+# leave every later scan stepping through thousands of tiny chunks.
+_APPEND_CHUNKS_MAX = 64
+
+
+class _CsvTail:
+    """Where a read of a delimited file ended, for `_append_delimited` to go on.
+
+    The file's first `length` bytes - ending at a record boundary, outside
+    quotes - hashed to `digest`; the `header` record they start with and the
+    `encoding` they were read as; and the columns read from them, by raw
+    polars name, with each one's `_csv_summary`.
+    """
+
+    # A digest and a few names: nothing worth counting against the budget
+    nbytes = 0
+
+    def __init__(self, length, digest, header, encoding, names, summaries):
+        self.length = length
+        self.digest = digest
+        self.header = header
+        self.encoding = encoding
+        self.names = names
+        self.summaries = summaries
+        # What reading the whole file would cost, to rank its cache entry by
+        self.seconds = 0.0
+
+
+class _SqliteTail:
+    """Where a read of a SQLite table ended, for `_append_sqlite` to go on.
+
+    The `table` and its `columns` under `schema_version`; the polars `schema`
+    the read came back with; its `rows`, the greatest rowid among them and
+    that row's values as the read selected them.
+    """
+
+    nbytes = 0
+
+    def __init__(
+        self, table, columns, schema_version, schema, rows, last_rowid, last_row
+    ):
+        self.table = table
+        self.columns = columns
+        self.schema_version = schema_version
+        self.schema = schema
+        self.rows = rows
+        self.last_rowid = last_rowid
+        self.last_row = last_row
+        self.seconds = 0.0
+
+
+def _read_tailed(file_type, file_path, sheet):
+    """`_read_timed` for a csv, tsv or SQLite file, with the table's tail.
+
+    The tail is None when a later version could not be read as an append to
+    this one - see `_read_delimited_tail` and `_read_sqlite_tail`.
+    """
+    with _read_slot():
+        started = time.perf_counter()
+        with _polars_errors(file_type):
+            if file_type == "sqlite":
+                table, tail = _read_sqlite_tail(file_path, sheet)
+            else:
+                table, tail = _read_delimited_tail(file_path, _DELIMITERS[file_type])
+        seconds = time.perf_counter() - started
+    metrics.observe_read(file_type, seconds)
+    if tail is not None:
+        tail.seconds = seconds
+    return table, tail
+
+
+_DELIMITERS = {"csv": ",", "tsv": "\t"}
+
+
+def _read_appended(key, file_path, sheet, file_type):
+    """The table at `key` as a cached earlier version plus the rows added since.
+
+    A logger appending to a csv or a SQLite table changes its cache key with
+    every row, and each change used to re-read every row that had not
+    changed. When an earlier version of the same file and sheet is still
+    cached with its tail, only what lies past that tail is read and
+    concatenated onto it; `_append_delimited` and `_append_sqlite` decide
+    whether the file is still that version with rows after it.
+
+    Returns the table and its own tail, or None for a full read - anything
+    the append cannot account for, including any error, which the full read
+    then reports if it is real.
+    """
+    with _CACHE_LOCK:
+        for old_key in _CACHE:
+            if old_key[:2] == key[:2] and old_key != key:
+                old = _CACHE[old_key]
+                tail = _DERIVED.get(old_key, {}).get(_APPEND_TAIL)
+                break
+        else:
+            return None
+    if tail is None:
+        return None
+    started = time.perf_counter()
+    try:
+        with _read_slot():
+            if file_type == "sqlite":
+                appended = _append_sqlite(file_path, sheet, old, tail)
+            else:
+                appended = _append_delimited(
+                    file_path, _DELIMITERS[file_type], old, tail
+                )
+    except (OSError, ValueError, sqlite3.Error, PolarsError, PanicException):
+        return None
+    if appended is not None and appended[1] is not None:
+        appended[1].seconds = tail.seconds + time.perf_counter() - started
+    return appended
+
+
+def _concat_appended(old, new):
+    """`old` with the rows of `new` after it, or None where their columns differ.
+
+    A column entirely null in `old` has no type of its own to keep - an
+    all-null column reads as String - and takes `new`'s. Any other column must
+    already agree. That is also what catches a column whose type depends on
+    every value, not only the new ones: an Int128 column is UInt64 exactly
+    when all its values fit (see `_cast_unsupported_columns_to_string`).
+    """
+    if old.schema.names != new.schema.names:
+        return None
+    columns = []
+    for column, field in zip(old.columns, new.schema):
+        if column.type != field.type:
+            if column.null_count != len(column):
+                return None
+            column = pa.nulls(len(column), field.type)
+        columns.append(column)
+    table = pa.concat_tables([pa.table(columns, schema=new.schema), new])
+    if table.num_columns and table.column(0).num_chunks > _APPEND_CHUNKS_MAX:
+        table = table.combine_chunks()
+    return table
+
+
+# Bytes hashed at a time when fingerprinting a delimited file
+_DIGEST_BLOCK = 16 * 1024 * 1024
+
+
+def _prefix_digest(data, length):
+    """The blake2b digest of `data[:length]`, and how many quote characters it holds."""
+    hasher = hashlib.blake2b()
+    quotes = 0
+    for start in range(0, length, _DIGEST_BLOCK):
+        block = data[start : min(start + _DIGEST_BLOCK, length)]
+        hasher.update(block)
+        quotes += block.count(b'"')
+    return hasher, quotes
+
+
+def _read_delimited_tail(file_path, delimiter):
+    """`_read_delimited`, and the `_CsvTail` of what it read, or None for that.
+
+    None unless the file ends with a newline outside quotes, so that a later
+    append begins a record, and unless the file stayed the same size while
+    it was read - bytes appended mid-read may or may not be in the table.
+    Fingerprinting it is one more pass over the bytes, a small fraction of
+    the parse's cost.
+    """
+    size = os.path.getsize(file_path)
+    df, encoding = _read_delimited_frame(file_path, delimiter)
+    table = _delimited_table(df)
+    if not size:
+        return table, None
+    with open(file_path, "rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if len(data) != size or data[size - 1 : size] != b"\n":
+            return table, None
+        bounds = _record_bounds(data, size)
+        hasher, quotes = _prefix_digest(data, size)
+        if not bounds or quotes % 2 or not data[: bounds[0]].strip():
+            return table, None
+        header = data[: bounds[0]]
+    summaries = [_csv_summary(df[name]) for name in df.columns]
+    tail = _CsvTail(size, hasher.digest(), header, encoding, df.columns, summaries)
+    return table, tail
+
+
+def _append_delimited(file_path, delimiter, old, tail):
+    """`old`, read from a delimited file up to `tail`, and the records since, or None.
+
+    The file must still start with the bytes `old` was read from - their
+    digest is compared, not their size or time - and have more after them.
+    The new bytes are read behind the header as one more piece of a chunked
+    read, and merged with the rest by the same rules (see
+    `_read_delimited_chunked`), except that a column the old rows typed
+    cannot change type: the old rows would have to be read again, so the
+    whole file is.
+    """
+    with open(file_path, "rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        size = len(data)
+        if size <= tail.length:
+            return None
+        hasher, _ = _prefix_digest(data, tail.length)
+        if hasher.digest() != tail.digest:
+            return None
+        piece = data[tail.length : size]
+
+    def read(schema=None):
+        return pl.read_csv(
+            tail.header + piece,
+            separator=delimiter,
+            encoding=tail.encoding,
+            infer_schema_length=None,
+            null_values=_NULL_STRINGS,
+            schema_overrides=schema,
+        )
+
+    frame = read()
+    names = frame.columns
+    if names != tail.names:
+        return None
+    schema, summaries = {}, []
+    for name, before in zip(names, tail.summaries):
+        after = _csv_summary(frame[name])
+        dtype = _merged_csv_type([before, after])
+        if dtype is None or (before[1] and dtype != before[0]):
+            return None
+        schema[name] = dtype
+        summaries.append((dtype, before[1] or after[1], before[2] or after[2]))
+    # Brought to the merged schema as `_read_pieces` brings a piece
+    if any(frame.schema[n] != schema[n] and _typed(frame[n]) for n in names):
+        frame = pl.DataFrame(dict(zip(names, read(list(schema.values())))))
+    elif frame.schema != schema:
+        frame = pl.DataFrame(
+            {name: frame[name].cast(dtype) for name, dtype in schema.items()}
+        )
+    table = _concat_appended(old, _delimited_table(frame))
+    if table is None:
+        return None
+    next_tail = None
+    quotes = piece.count(b'"')
+    if piece.endswith(b"\n") and not quotes % 2:
+        hasher.update(piece)
+        next_tail = _CsvTail(
+            size, hasher.digest(), tail.header, tail.encoding, names, summaries
+        )
+    return table, next_tail
+
+
+def _read_sqlite_tail(file_path, table):
+    """`_read_sqlite`, and the `_SqliteTail` of what it read, or None for that.
+
+    Read in one transaction, so the tail describes exactly the rows read.
+    None for a table with no rows, or one windows cannot serve either (see
+    `_sqlite_layout`): without a rowid there is no telling new rows from old.
+    """
+    table = _sqlite_table(file_path, table)
+    ident = _quote_ident(table)
+    with _sqlite_conn(file_path) as conn:
+        conn.execute("BEGIN")
+        columns = _sqlite_columns(conn, table)
+        keyed = _sqlite_keyed(conn, table, columns)
+        df = _sqlite_frame(conn, table, columns, keyed)
+        tail = None
+        if keyed and "" not in columns and len(df):
+            schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            last_rowid = conn.execute(f"SELECT max(rowid) FROM {ident}").fetchone()[0]
+            tail = _SqliteTail(
+                table,
+                columns,
+                schema_version,
+                dict(df.schema),
+                len(df),
+                last_rowid,
+                _sqlite_row(conn, ident, columns, last_rowid),
+            )
+    return _cast_unsupported_columns_to_string(df).to_arrow(), tail
+
+
+def _sqlite_row(conn, ident, columns, rowid):
+    """The row at `rowid`, as `_read_sqlite` selects it."""
+    select_list = ", ".join(_blob_placeholder_sql(c) for c in columns)
+    return conn.execute(
+        f"SELECT {select_list} FROM {ident} WHERE rowid = ?", (rowid,)
+    ).fetchone()
+
+
+def _append_sqlite(file_path, table, old, tail):
+    """`old`, read from a SQLite table up to `tail`, and the rows since, or None.
+
+    The rows up to the tail's rowid must still number what they did, end at
+    that rowid, and end with the same row, under the same schema; the rows
+    after it are the append. That check is what it costs to be cheap: an
+    UPDATE of any row but the last is not seen, which is why appending is
+    opt-in. A column whose type the new rows would change - integers gaining
+    a text value - cannot keep the old rows as read, so the whole table is
+    read again, as it is when nothing was appended at all.
+    """
+    table = _sqlite_table(file_path, table)
+    if table != tail.table:
+        return None
+    ident = _quote_ident(table)
+    with _sqlite_conn(file_path) as conn:
+        conn.execute("BEGIN")
+        if conn.execute("PRAGMA schema_version").fetchone()[0] != tail.schema_version:
+            return None
+        columns = _sqlite_columns(conn, table)
+        if columns != tail.columns:
+            return None
+        prefix = conn.execute(
+            f"SELECT count(*), max(rowid) FROM {ident} WHERE rowid <= ?",
+            (tail.last_rowid,),
+        ).fetchone()
+        if prefix != (tail.rows, tail.last_rowid):
+            return None
+        if _sqlite_row(conn, ident, columns, tail.last_rowid) != tail.last_row:
+            return None
+        row = conn.execute(
+            f"SELECT count(*), max(rowid), {_sqlite_class_sums(columns)}"
+            f" FROM {ident} WHERE rowid > ?",
+            (tail.last_rowid,),
+        ).fetchone()
+        if not row[0]:
+            return None
+        classes = _sqlite_class_sets(columns, row[2:])
+        schema = {}
+        for column in columns:
+            before, after = tail.schema[column], _sqlite_class_type(classes[column])
+            if before == pl.Null:
+                schema[column] = after
+            elif after in (pl.Null, before) or before == pl.String:
+                schema[column] = before
+            elif (before, after) == (pl.Float64, pl.Int64):
+                schema[column] = before
+            else:
+                return None
+        select_list = ", ".join(_blob_placeholder_sql(c) for c in columns)
+        df = pl.read_database(
+            f"SELECT {select_list} FROM {ident} WHERE rowid > ? ORDER BY rowid",
+            conn,
+            schema_overrides=schema,
+            execute_options={"parameters": [tail.last_rowid]},
+        )
+        last_row = _sqlite_row(conn, ident, columns, row[1])
+    appended = _concat_appended(old, _cast_unsupported_columns_to_string(df).to_arrow())
+    if appended is None:
+        return None
+    next_tail = _SqliteTail(
+        table,
+        columns,
+        tail.schema_version,
+        schema,
+        tail.rows + len(df),
+        row[1],
+        last_row,
+    )
+    return appended, next_tail
+
+
+def _claim_sheets(file_path, exclude=None):
+    """A flight for each worksheet of `file_path` neither cached nor being read.
+
+    {key: (sheet, flight)}, registered in _INFLIGHT so a request for one of the
+    sheets waits for the pass rather than reading it again. The caller must
+    `_fill_sheets` them. Empty when the workbook cannot be listed - the read of
+    the requested sheet reports why.
+    """
+    try:
+        keys = {
+            _cache_key(file_path, title): title
+            for title in list_excel_sheets(file_path)
+        }
+    except (OSError, ValueError):
+        return {}
+    claimed = {}
+    with _CACHE_LOCK:
+        for key, title in keys.items():
+            if key != exclude and key not in _CACHE and key not in _INFLIGHT:
+                claimed[key] = (title, _INFLIGHT.setdefault(key, _Flight()))
+    return claimed
+
+
+def _fill_sheets(file_path, claimed):
+    """Read the sheets of `claimed` flights in one pass, cache them, land them.
+
+    Returns {key: table}. Each sheet's spill is tried first, and only the ones
+    missing from it are read. The pass's time is shared among its tables by
+    size, so each ranks in the cache as if it had been read on its own. On a
+    failure every flight carries the error to its waiters.
+    """
+    try:
+        started = time.perf_counter()
+        tables = {}
+        for key in claimed:
+            table = spill_get(key)
+            if table is not None:
+                metrics.count("spill_hits")
+                tables[key] = table
+        missing = {
+            key: sheet for key, (sheet, _) in claimed.items() if key not in tables
+        }
+        if missing:
+            with _read_slot():
+                read_started = time.perf_counter()
+                read = run_in_process(
+                    _read_excel_sheets_uncached, file_path, list(missing.values())
+                )
+            metrics.observe_read("excel", time.perf_counter() - read_started)
+            for key, sheet in missing.items():
+                tables[key] = read[sheet]
+                spill_put(key, tables[key])
+        seconds = time.perf_counter() - started
+        total = sum(table.nbytes for table in tables.values())
+        for key, (_, flight) in claimed.items():
+            table = tables[key]
+            flight.seconds = seconds * table.nbytes / total if total else seconds
+            _cache_put(key, table, flight.seconds)
+            flight.table = table
+        return tables
+    except BaseException as e:
+        for _, flight in claimed.values():
+            flight.error = e
+        raise
+    finally:
+        for key, (_, flight) in claimed.items():
+            _land(key, flight)
+
+
+def _prefetch_sheets(file_path):
+    """Read every uncached worksheet of `file_path` in one pass, in the background.
+
+    The flights are claimed here, before the task is queued, so a tab clicked
+    while it waits for a thread joins it instead of racing it.
+    """
+    claimed = _claim_sheets(file_path)
+    if not claimed:
+        return
+    metrics.count("workbook_prefetches", len(claimed))
+    future = thread_pool().submit(_prefetch_task, file_path, claimed)
+    # A task cancelled by `executors.shutdown` never runs, and its flights
+    # would leave their waiters blocked for good
+    future.add_done_callback(
+        lambda done: done.cancelled() and _abandon_sheets(claimed)
+    )
+
+
+def _prefetch_task(file_path, claimed):
+    try:
+        _fill_sheets(file_path, claimed)
+    except Exception as e:
+        # Nobody asked for these sheets yet; a request for one reads it again
+        _log.warning("background read of %s failed: %s", file_path, e)
+
+
+def _abandon_sheets(claimed):
+    """Land `claimed` flights that will never be read, failing their waiters."""
+    error = RuntimeError("background workbook read cancelled")
+    for key, (_, flight) in claimed.items():
+        flight.error = error
+        _land(key, flight)
+
+
+def read_with_key(file_path, sheet=None):
+    """`read_as_arrow_table`, also returning the key the table is cached under.
+
+    The key is the table's identity for anything derived from it - a view
+    cached under it (see `views`) is invalidated exactly when the table is. It
+    is None when the file cannot be statted, in which case nothing is cached.
+    """
+    try:
+        key = _cache_key(file_path, sheet)
+        with _CACHE_LOCK:
+            resident = key in _CACHE
+        if sheet is None and not resident:
+            # A workbook read without a sheet is its first worksheet, and is
+            # cached under that title: under None as well, the table would be
+            # held and counted twice, and a workbook read would parse the
+            # sheet again for the title's key. Only a miss pays the listing.
+            first = _first_sheet(file_path)
+            if first is not None:
+                sheet, key = first, _cache_key(file_path, first)
+    except OSError:
+        # Unstattable file - let the reader raise the real error
+        return None, _read(file_path, sheet)
+    return key, _read_keyed(key, file_path, sheet)
+
+
+def _first_sheet(file_path):
+    """The first worksheet's title, or None for a file that is not a workbook.
+
+    None too for a workbook that cannot be listed, whose read then reports why.
+    """
+    try:
+        sheets = list_excel_sheets(file_path)
+    except (OSError, ValueError):
+        return None
+    return sheets[0] if sheets else None
 
 
 def read_as_arrow_table(file_path, sheet=None):
@@ -777,17 +2842,78 @@ def read_as_arrow_table(file_path, sheet=None):
     filters, sorting and statistics global and, because the page is cut from
     the identical table object every time, sidesteps the type-inference
     mismatch that makes a windowed read disagree with a full one (DEF-3).
+
+    Concurrent misses on one key share a single read - see `_INFLIGHT`.
     """
-    try:
-        key = _cache_key(file_path, sheet)
-    except OSError:
-        # Unstattable file - let the reader raise the real error
-        return _read_uncached(file_path, sheet)
+    return read_with_key(file_path, sheet)[1]
 
-    cached = _cache_get(key)
+
+@metrics.phase("read")
+def _read_keyed(key, file_path, sheet):
+    """The cached read behind `read_with_key`, for an already computed key."""
+    with _CACHE_LOCK:
+        # The cache and the flights are consulted under one hold of the lock. A
+        # flight lands by caching its table and then removing itself, so a
+        # caller that missed the cache in a separate step could find no flight
+        # either and start a second read of a table that was already resident.
+        cached = _cache_touch(key)
+        if cached is not None:
+            seconds = _CACHE_COST[key][0]
+        else:
+            flight = _INFLIGHT.get(key)
+            if flight is None:
+                flight = _INFLIGHT[key] = _Flight()
+                leader = True
+            else:
+                flight.waiters += 1
+                leader = False
     if cached is not None:
+        metrics.count("cache_hits")
+        metrics.note_cache("hit")
+        _trace(key, cached, seconds)
         return cached
 
-    table = _read_uncached(file_path, sheet)
-    _cache_put(key, table)
+    metrics.count("cache_misses")
+    metrics.note_cache("miss" if leader else "coalesced")
+    if not leader:
+        metrics.count("cache_coalesced")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        _trace(key, flight.table, flight.seconds)
+        return flight.table
+
+    workbook_reads = _EXCEL_WORKBOOK_READS
+    if workbook_reads != "off" and get_file_type(file_path) != "excel":
+        workbook_reads = "off"
+    if workbook_reads == "eager":
+        claimed = {key: (sheet, flight), **_claim_sheets(file_path, exclude=key)}
+        if len(claimed) > 1:
+            metrics.count("workbook_prefetches", len(claimed) - 1)
+        table = _fill_sheets(file_path, claimed)[key]
+        _trace(key, table, flight.seconds)
+        return table
+
+    try:
+        started = time.perf_counter()
+        table, tail = _read_spilled(key, file_path, sheet)
+        flight.seconds = time.perf_counter() - started
+        if tail is not None:
+            # Ranked by what a full read would cost, not by the append: that
+            # is what evicting it would cost the next reader
+            flight.seconds = max(flight.seconds, tail.seconds)
+        if _cache_put(key, table, flight.seconds) and tail is not None:
+            cache_derived(key, _APPEND_TAIL, tail)
+        flight.table = table
+        _trace(key, table, flight.seconds)
+    except BaseException as e:
+        # Every waiter gets the leader's failure rather than retrying the read
+        # itself - a file that just failed will fail again, and N retries of a
+        # corrupt database is the pile-up this exists to prevent.
+        flight.error = e
+        raise
+    finally:
+        _land(key, flight)
+    if workbook_reads == "background":
+        _prefetch_sheets(file_path)
     return table
@@ -1,11 +1,9 @@
 import json
-import math
 import os
 import re
 from pathlib import Path
-from datetime import date, datetime
-from decimal import Decimal
 
+from jupyter_server.auth.decorator import authorized
 from jupyter_server.base.handlers import APIHandler
 from jupyter_server.utils import url_path_join
 import tornado
@@ -19,14 +17,37 @@ from polars.exceptions import PanicException
 import pyarrow.parquet as pq
 import pyarrow.compute as pc
 import pyarrow as pa
+from traitlets import TraitError
 
+from . import metrics
+from .executors import run_blocking
 from .readers import (
+    _PARQUET_PAGES_AHEAD,
+    cache_state,
     get_file_type,
     list_excel_sheets,
     list_sqlite_tables,
+    parquet_fits_cache,
+    parquet_schema,
+    peek_cached,
     read_as_arrow_table,
+    read_columns,
+    read_parquet_rows,
+    read_parquet_window,
+    read_sqlite_rows,
+    read_sqlite_window,
+    read_with_key,
+    sqlite_schema,
+)
+from .serialize import _JS_EXACT_INTEGER, ipc_table, page_columns, page_rows
+from .stats import calculate_column_stats, footer_column_stats, json_safe
+from .views import (
+    apply_view,
+    page_view,
+    parquet_page_view,
+    row_view,
+    sqlite_page_view,
 )
-from .stats import calculate_column_stats, json_safe, numeric_view
 
 
 def slugify(s):
@@ -42,50 +63,8 @@ def slugify(s):
 _XLSX_MAX_ROWS = 1_048_576
 _XLSX_MAX_COLUMNS = 16_384
 
-
-def _numeric_scalar(filter_value, column_type):
-    """A comparison scalar in the COLUMN's type, not a bare python float.
-
-    `pc.greater(uint64_column, 100.0)` makes pyarrow promote the column to
-    double, and it refuses outright when a value exceeds a double's exact
-    integer range - `ArrowInvalid: Integer value 9223372036854775808 not in
-    range`. ArrowInvalid is a ValueError, so the arm meant for a non-numeric
-    entry swallowed it and the filter silently matched every row. Building the
-    scalar in the column's own type compares exactly and never promotes.
-
-    Raises ValueError when the entry is not a number, which is the caller's
-    signal that there is no predicate to add.
-    """
-    text = str(filter_value).strip()
-    if pa.types.is_integer(column_type):
-        try:
-            return pa.scalar(int(text), column_type)
-        except (ValueError, OverflowError, pa.ArrowInvalid):
-            # A decimal entry against an integer column, or one outside the
-            # column type's range: fall through to a float comparison, which
-            # pyarrow can still answer for an in-range integer column.
-            pass
-    return float(text)
-
-
-def _sort_indices(table, sort_by, sort_order):
-    """Sort indices for one column, numerically when a text column holds numbers.
-
-    A worksheet cell can hold a number as text, so the column is a string column
-    and stays one - forcing it numeric would strip a zip code's leading zeros.
-    Sorting it as text puts 10 before 2, which is the wrong answer for the same
-    values. Sorting on `numeric_view`'s reading of the column gives the numeric
-    order while the stored, displayed and exported values remain the text the
-    file holds. Both the grid and the export sort through here, so a downloaded
-    file is ordered exactly as the grid showed it.
-    """
-    direction = "ascending" if sort_order == "asc" else "descending"
-    numeric = numeric_view(table.column(sort_by))
-    if numeric is not None:
-        return pc.sort_indices(
-            pa.table({sort_by: numeric}), sort_keys=[(sort_by, direction)]
-        )
-    return pc.sort_indices(table, sort_keys=[(sort_by, direction)])
+# The output formats `_export_body` writes.
+_EXPORT_FORMATS = ("parquet", "excel", "csv", "tsv", "jsonl")
 
 
 def _uniquify_headers_for_excel(df):
@@ -122,46 +101,6 @@ def _uniquify_headers_for_excel(df):
     return df.rename(renames) if renames else df
 
 
-# A double holds every integer up to 2**53 exactly and no more. Javascript has
-# only doubles, so `JSON.parse` silently rounds anything past this: a uint64
-# snowflake id 9223372036854775808 reached the grid as 9223372036854776000.
-_JS_EXACT_INTEGER = 2**53
-INF = math.inf
-
-
-def convert_to_json_serializable(value):
-    """Convert Python objects to JSON-serializable types"""
-    if value is None:
-        return None
-    elif isinstance(value, bool):
-        return value
-    elif isinstance(value, int) and abs(value) > _JS_EXACT_INTEGER:
-        # Sent as a string so the browser cannot round it. The column keeps its
-        # integer type, so sorting, filtering and statistics stay numeric; only
-        # the wire form of these particular values changes, and it is the only
-        # form in which they survive the trip.
-        return str(value)
-    elif isinstance(value, float) and (value != value or value in (INF, -INF)):
-        # NaN and +/-Infinity are not JSON. Python emits them as bare literals
-        # that `JSON.parse` rejects, so one such cell made the whole response
-        # unparseable and the panel reported a load failure for the column.
-        return None
-    elif isinstance(value, (date, datetime)):
-        return value.isoformat()
-    elif isinstance(value, Decimal):
-        return float(value)
-    elif isinstance(value, bytes):
-        return value.decode("utf-8", errors="replace")
-    elif isinstance(value, (list, tuple)):
-        # Convert list/tuple to JSON string for display
-        return json.dumps(value)
-    elif isinstance(value, dict):
-        # Convert dict to JSON string for display
-        return json.dumps(value)
-    else:
-        return value
-
-
 def normalize_arrow_type(arrow_type_str):
     """Normalize PyArrow type strings for user-friendly display.
 
@@ -183,11 +122,111 @@ def normalize_arrow_type(arrow_type_str):
     return type_map.get(arrow_type_str, arrow_type_str)
 
 
-class ParquetMetadataHandler(APIHandler):
+def _describe_source(path, file_type, sheet):
+    """Schema, row count and tab names of a source, for the metadata handler.
+
+    Tabbed formats populate `sheets`: Excel with its worksheet names, SQLite
+    with its user table names.
+
+    Listing and reading share one 400 boundary: an unreadable file (corrupt
+    database, locked by a writer, unsupported type) raises ValueError from
+    whichever call reaches it first, and pyarrow's ArrowInvalid is itself a
+    ValueError, so a damaged parquet lands there too instead of escaping as a
+    500 with a traceback.
+    """
+    if file_type == "excel":
+        sheets = list_excel_sheets(path)
+    elif file_type == "sqlite":
+        sheets = list_sqlite_tables(path)
+    else:
+        sheets = []
+
+    if file_type == "parquet":
+        # Parquet has a metadata-only fast path - no need to read data
+        parquet_file = pq.ParquetFile(path)
+        return parquet_file.schema_arrow, parquet_file.metadata.num_rows, sheets
+
+    if (
+        file_type == "sqlite"
+        and sheets
+        and peek_cached(path, sheet or sheets[0])[1] is None
+    ):
+        # One aggregate query gives the full read's schema and row count; see
+        # `readers.sqlite_schema`. None for a table it cannot describe.
+        described = sqlite_schema(path, sheet or sheets[0])
+        if described is not None:
+            return (*described, sheets)
+
+    # Resolve the default sheet here rather than letting the reader do it. The
+    # frontend omits `sheet` on this first call and sends the resolved name on
+    # every later one, so leaving it None caches the same table under two keys -
+    # on a tabbed source that is the first table held twice. Canonicalising here
+    # only holds while this handler runs BEFORE the four that pass `sheet`
+    # through untouched (`src/widget.ts` sets the active sheet from the metadata
+    # response before requesting rows); a client that asked for rows first
+    # would still cache the default twice.
+    table = read_as_arrow_table(path, sheet or (sheets[0] if sheets else None))
+    return table.schema, len(table), sheets
+
+
+class _MeteredHandler(APIHandler):
+    """An APIHandler that times its requests, for `metrics` and for the client.
+
+    Every response carries a Server-Timing header - which browser devtools
+    show under the request's Timing tab - with the time spent reading, filtering,
+    sorting, computing statistics and serializing (see `metrics.phase`), the
+    read cache's outcome and the total. With `log_timings` configured the same
+    figures are logged as one JSON object per request.
+    """
+
+    def prepare(self):
+        self._timings = metrics.start_request()
+        return super().prepare()
+
+    def _server_timing(self):
+        entries = [
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, seconds in self._timings.phases.items()
+        ]
+        if self._timings.cache is not None:
+            entries.append(f'cache;desc="{self._timings.cache}"')
+        entries.append(f"total;dur={self.request.request_time() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def finish(self, *args, **kwargs):
+        # Absent when prepare never ran - a request refused before it
+        if not self._headers_written and hasattr(self, "_timings"):
+            self.set_header("Server-Timing", self._server_timing())
+        return super().finish(*args, **kwargs)
+
+    def on_finish(self):
+        super().on_finish()
+        seconds = self.request.request_time()
+        metrics.observe_request(type(self).__name__, seconds)
+        config = self.settings.get("tabular_data_viewer_config")
+        if config is not None and config.log_timings and hasattr(self, "_timings"):
+            self.log.info(
+                "tabular-data-viewer timing %s",
+                json.dumps(
+                    {
+                        "handler": type(self).__name__,
+                        "status": self.get_status(),
+                        "cache": self._timings.cache,
+                        "phases_ms": {
+                            name: round(value * 1000, 3)
+                            for name, value in self._timings.phases.items()
+                        },
+                        "total_ms": round(seconds * 1000, 3),
+                    }
+                ),
+            )
+
+
+class ParquetMetadataHandler(_MeteredHandler):
     """Handler for getting Parquet file metadata (columns, types, row count)"""
 
     @tornado.web.authenticated
-    def post(self):
+    async def post(self):
         try:
             input_data = self.get_json_body()
             file_path = input_data.get("path", "")
@@ -236,34 +275,9 @@ class ParquetMetadataHandler(APIHandler):
             # here too instead of escaping as a 500 with a traceback.
             file_type = get_file_type(str(abs_path))
             try:
-                if file_type == "excel":
-                    sheets = list_excel_sheets(str(abs_path))
-                elif file_type == "sqlite":
-                    sheets = list_sqlite_tables(str(abs_path))
-                else:
-                    sheets = []
-
-                if file_type == "parquet":
-                    # Parquet has a metadata-only fast path - no need to read data
-                    parquet_file = pq.ParquetFile(str(abs_path))
-                    schema = parquet_file.schema_arrow
-                    total_rows = parquet_file.metadata.num_rows
-                else:
-                    # Resolve the default sheet here rather than letting the
-                    # reader do it. The frontend omits `sheet` on this first
-                    # call and sends the resolved name on every later one, so
-                    # leaving it None caches the same table under two keys -
-                    # on a tabbed source that is the first table held twice.
-                    # Canonicalising here only holds while this handler runs
-                    # BEFORE the four that pass `sheet` through untouched
-                    # (`src/widget.ts` sets the active sheet from the metadata
-                    # response before requesting rows); a client that asked for
-                    # rows first would still cache the default twice.
-                    table = read_as_arrow_table(
-                        str(abs_path), sheet or (sheets[0] if sheets else None)
-                    )
-                    schema = table.schema
-                    total_rows = len(table)
+                schema, total_rows, sheets = await run_blocking(
+                    _describe_source, str(abs_path), file_type, sheet
+                )
             except ValueError as e:
                 self.set_status(400)
                 self.finish(json.dumps({"error": str(e)}))
@@ -312,11 +326,256 @@ class ParquetMetadataHandler(APIHandler):
             )
 
 
-class ParquetDataHandler(APIHandler):
+def _data_page(
+    read_key,
+    table,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    offset,
+    limit,
+    layout="rows",
+):
+    """Filter, sort and page `table`, returning the data handler's JSON body.
+
+    Runs on the executor's thread pool. The filters and sort resolve to a row
+    view (see `views.row_view`), cached under `read_key`, so only the first page
+    of a view pays for them; every page after it takes `limit` rows. An early
+    page of a fresh sort needs only the view's head, which `views.page_view`
+    finds by selection rather than sorting every row.
+    """
+    positions, total_filtered_rows = page_view(
+        read_key,
+        table,
+        filters,
+        sort_by,
+        sort_order,
+        case_insensitive,
+        use_regex,
+        offset + limit,
+    )
+
+    # Apply pagination
+    end = max(min(offset + limit, total_filtered_rows), offset)
+    if positions is None:
+        table_slice = table.slice(offset, end - offset)
+        original_indices = list(range(offset + 1, end + 1))
+    else:
+        page_positions = positions.slice(offset, end - offset)
+        table_slice = table.take(page_positions)
+        # Original row index, 1-indexed for display
+        original_indices = [p + 1 for p in page_positions.to_pylist()]
+
+    return _page_body(
+        table_slice, original_indices, offset, limit, total_filtered_rows, layout
+    )
+
+
+@metrics.phase("serialize")
+def _page_body(table_slice, original_indices, offset, limit, total_rows, layout):
+    """The data handler's JSON body for one page of rows.
+
+    `original_indices` holds each row's 1-indexed position in the file, which
+    the grid shows in place of the page-relative one.
+
+    The "rows" layout is one object per row, keyed by column name, with the
+    position under `__row_index__`. The "columns" layout sends each column's
+    values as one array under `columns` and the positions as `rowIndex`: every
+    column name is written once rather than once per row, which on a wide page
+    is most of the body. The "arrow" layout is not JSON at all - see
+    `_arrow_page_body`.
+    """
+    original_indices = list(original_indices)
+    body = {
+        "offset": offset,
+        "limit": limit,
+        "totalRows": total_rows,
+        "hasMore": offset + len(table_slice) < total_rows,
+    }
+    if layout == "arrow":
+        return _arrow_page_body(table_slice, original_indices, body)
+    if layout == "columns":
+        body["layout"] = "columns"
+        body["columns"] = page_columns(table_slice)
+        body["rowIndex"] = original_indices
+    else:
+        body["data"] = page_rows(table_slice, original_indices)
+    return json.dumps(body)
+
+
+def _arrow_page_body(table_slice, original_indices, fields):
+    """One page as an Arrow IPC stream, with the page fields in its metadata.
+
+    JSON costs twice on a wide page: the server encodes every value as text and
+    the browser parses it all back. An IPC stream is the page's own buffers,
+    which `src/arrow.ts` reads in place - and an int64 or uint64 arrives as the
+    exact 64-bit value, with no string stand-in for the ones a double cannot
+    hold (see `serialize._JS_EXACT_INTEGER`). Columns are first put in the
+    types that reader decodes; see `serialize.ipc_column`.
+
+    Each row's file position is an extra `__row_index__` column, as in the row
+    layout. `offset`, `limit`, `totalRows` and `hasMore` travel as schema
+    metadata, JSON-encoded, since the stream has no other place for them.
+    """
+    table = ipc_table(table_slice).append_column(
+        "__row_index__", pa.array(original_indices, pa.int64())
+    )
+    table = table.replace_schema_metadata(
+        {key: json.dumps(value) for key, value in fields.items()}
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _parquet_page(
+    path,
+    sheet,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    offset,
+    limit,
+    layout="rows",
+):
+    """The data handler's JSON body for a parquet page, without the whole-table read.
+
+    A table already in the read cache is paged in memory by `_data_page`, and so
+    is one the cache would keep (`readers.parquet_fits_cache`): it is read whole
+    once rather than decoded again, a page at a time, on every scroll. Otherwise
+    nothing beyond the page and the view's own columns is decoded:
+    with no filter or sort in effect the page is rows `offset..offset+limit`,
+    read from the row groups holding them (`readers.read_parquet_window`); with
+    one, the view is computed from a narrow, pruned scan
+    (`views.parquet_page_view`) and the page's rows are read by position.
+    """
+    read_key, cached = peek_cached(path, sheet)
+    if cached is None and parquet_fits_cache(path):
+        read_key, cached = read_with_key(path, sheet)
+    if cached is not None:
+        return _data_page(
+            read_key,
+            cached,
+            filters,
+            sort_by,
+            sort_order,
+            case_insensitive,
+            use_regex,
+            offset,
+            limit,
+            layout,
+        )
+
+    positions, total_rows = parquet_page_view(
+        read_key,
+        path,
+        parquet_schema(path),
+        filters,
+        sort_by,
+        sort_order,
+        case_insensitive,
+        use_regex,
+        offset + limit,
+    )
+    if positions is None:
+        table_slice, total_rows = read_parquet_window(path, offset, limit, sheet)
+        original_indices = range(offset + 1, offset + len(table_slice) + 1)
+    else:
+        page_positions = positions.slice(
+            offset, max(min(limit, total_rows - offset), 0)
+        )
+        table_slice = read_parquet_rows(
+            path,
+            page_positions,
+            read_key,
+            positions.slice(offset, limit * _PARQUET_PAGES_AHEAD),
+        )
+        original_indices = [p + 1 for p in page_positions.to_pylist()]
+    return _page_body(
+        table_slice, original_indices, offset, limit, total_rows, layout
+    )
+
+
+def _sqlite_page(
+    path,
+    sheet,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    offset,
+    limit,
+    layout="rows",
+):
+    """The data handler's JSON body for a SQLite page, without the whole-table read.
+
+    A table already in the read cache is paged in memory by `_data_page`.
+    Otherwise, with no filter or sort in effect, the page is rows
+    `offset..offset+limit` of the table, read by `readers.read_sqlite_window`
+    under the full read's schema; with one, the view is computed by SQLite as
+    far as it answers exactly as the kernels would, and by them from a narrow
+    scan beyond that (`views.sqlite_page_view`), and the page's rows are read
+    by position. A table neither can serve (no rowid) is read whole.
+    """
+    read_key, cached = peek_cached(path, sheet)
+    if cached is None and sqlite_schema(path, sheet) is not None:
+        positions, total_rows = sqlite_page_view(
+            read_key,
+            path,
+            sheet,
+            filters,
+            sort_by,
+            sort_order,
+            case_insensitive,
+            use_regex,
+            offset + limit,
+        )
+        if positions is None:
+            table_slice, total_rows = read_sqlite_window(path, offset, limit, sheet)
+            original_indices = range(offset + 1, offset + len(table_slice) + 1)
+        else:
+            page_positions = positions.slice(
+                offset, max(min(limit, total_rows - offset), 0)
+            )
+            table_slice = read_sqlite_rows(path, page_positions, sheet)
+            original_indices = [p + 1 for p in page_positions.to_pylist()]
+        return _page_body(
+            table_slice, original_indices, offset, limit, total_rows, layout
+        )
+    if cached is None:
+        read_key, cached = read_with_key(path, sheet)
+    return _data_page(
+        read_key,
+        cached,
+        filters,
+        sort_by,
+        sort_order,
+        case_insensitive,
+        use_regex,
+        offset,
+        limit,
+        layout,
+    )
+
+
+class ParquetDataHandler(_MeteredHandler):
     """Handler for reading Parquet file data with pagination and filtering"""
 
+    # Set by a subclass that answers in one encoding whatever the body asks
+    layout = None
+
+    def _finish_page(self, body):
+        """Send a page body built by `_page_body`."""
+        self.finish(body)
+
     @tornado.web.authenticated
-    def post(self):
+    async def post(self):
         try:
             input_data = self.get_json_body()
             file_path = input_data.get("path", "")
@@ -328,6 +587,8 @@ class ParquetDataHandler(APIHandler):
             case_insensitive = input_data.get("caseInsensitive", False)
             use_regex = input_data.get("useRegex", False)
             sheet = input_data.get("sheet")
+            # "rows" (the default) or "columns" - see `_page_body`
+            layout = self.layout or input_data.get("layout", "rows")
 
             if not file_path:
                 self.set_status(400)
@@ -368,137 +629,55 @@ class ParquetDataHandler(APIHandler):
             file_type = get_file_type(str(abs_path))
             self.log.debug(f"Reading {file_type} file: {abs_path}")
 
-            # The whole table is read even though only a page is returned; a
-            # SQL LIMIT/OFFSET window was tried and reverted. See DEF-3 in
-            # docs/defects.md.
+            # A parquet or SQLite page reads only what the page and its view
+            # need (DEF-3 in docs/defects.md has why a SQLite window is
+            # type-stable now). Every other page reads the whole table even
+            # though only a page is returned.
+            if file_type in ("parquet", "sqlite"):
+                try:
+                    body = await run_blocking(
+                        _parquet_page if file_type == "parquet" else _sqlite_page,
+                        str(abs_path),
+                        sheet,
+                        filters,
+                        sort_by,
+                        sort_order,
+                        case_insensitive,
+                        use_regex,
+                        offset,
+                        limit,
+                        layout,
+                    )
+                except ValueError as e:
+                    self.set_status(400)
+                    self.finish(json.dumps({"error": str(e)}))
+                    return
+                self._finish_page(body)
+                return
+
             try:
-                table = read_as_arrow_table(str(abs_path), sheet)
+                read_key, table = await run_blocking(
+                    read_with_key, str(abs_path), sheet
+                )
             except ValueError as e:
                 self.set_status(400)
                 self.finish(json.dumps({"error": str(e)}))
                 return
 
-            # Add original row index column (1-indexed for display)
-            original_indices = pa.array(range(1, len(table) + 1))
-            table = table.append_column("__original_row_index__", original_indices)
-
-            # Apply filters if provided
-            if filters:
-                filter_expressions = []
-                for col_name, filter_spec in filters.items():
-                    if col_name not in table.column_names:
-                        continue
-
-                    filter_type = filter_spec.get("type", "text")
-                    filter_value = filter_spec.get("value", "")
-
-                    if not filter_value:
-                        continue
-
-                    column = table.column(col_name)
-
-                    if filter_type == "text":
-                        # Cast column to string for text filtering (handles both string and numeric columns)
-                        column_str = pc.cast(column, pa.string())
-
-                        # Replace null values with "(null)" for consistent filtering
-                        column_str = pc.fill_null(column_str, "(null)")
-
-                        if use_regex:
-                            # Use regex matching when enabled
-                            try:
-                                filter_expressions.append(
-                                    pc.match_substring_regex(
-                                        column_str,
-                                        filter_value,
-                                        ignore_case=case_insensitive,
-                                    )
-                                )
-                            except Exception:
-                                # Fall back to simple substring matching if regex is invalid
-                                filter_expressions.append(
-                                    pc.match_substring(
-                                        column_str,
-                                        filter_value,
-                                        ignore_case=case_insensitive,
-                                    )
-                                )
-                        else:
-                            # Use simple substring matching by default
-                            filter_expressions.append(
-                                pc.match_substring(
-                                    column_str,
-                                    filter_value,
-                                    ignore_case=case_insensitive,
-                                )
-                            )
-                    elif filter_type == "number":
-                        operator = filter_spec.get("operator", "=")
-                        try:
-                            numeric_value = _numeric_scalar(filter_value, column.type)
-                        except ValueError:
-                            continue
-
-                        kernel = {
-                            ">": pc.greater,
-                            "<": pc.less,
-                            ">=": pc.greater_equal,
-                            "<=": pc.less_equal,
-                            "=": pc.equal,
-                        }.get(operator)
-                        if kernel is not None:
-                            # Same reasoning as the grid handler: the kernel's
-                            # own refusal must not be mistaken for a
-                            # non-numeric entry, or the download ships the whole
-                            # table under a `_filtered` filename.
-                            filter_expressions.append(kernel(column, numeric_value))
-
-                if filter_expressions:
-                    combined_filter = filter_expressions[0]
-                    for expr in filter_expressions[1:]:
-                        combined_filter = pc.and_(combined_filter, expr)
-
-                    table = table.filter(combined_filter)
-
-            # Apply sorting if requested
-            if sort_by and sort_by in table.column_names:
-                indices = _sort_indices(table, sort_by, sort_order)
-                table = pc.take(table, indices)
-
-            # Get total filtered rows
-            total_filtered_rows = len(table)
-
-            # Apply pagination
-            end = min(offset + limit, len(table))
-            table_slice = table.slice(offset, end - offset)
-
-            # Convert to list of dictionaries with JSON-serializable values
-            data = []
-            for i in range(len(table_slice)):
-                row = {}
-                original_row_idx = None
-                for col_name in table_slice.column_names:
-                    value = table_slice.column(col_name)[i].as_py()
-                    # Store original row index separately, don't include it in row data
-                    if col_name == "__original_row_index__":
-                        original_row_idx = value
-                    else:
-                        row[col_name] = convert_to_json_serializable(value)
-                # Add original row index as metadata
-                row["__row_index__"] = original_row_idx
-                data.append(row)
-
-            self.finish(
-                json.dumps(
-                    {
-                        "data": data,
-                        "offset": offset,
-                        "limit": limit,
-                        "totalRows": total_filtered_rows,
-                        "hasMore": end < total_filtered_rows,
-                    }
-                )
+            body = await run_blocking(
+                _data_page,
+                read_key,
+                table,
+                filters,
+                sort_by,
+                sort_order,
+                case_insensitive,
+                use_regex,
+                offset,
+                limit,
+                layout,
             )
+            self._finish_page(body)
 
         except Exception as e:
             import traceback
@@ -517,11 +696,43 @@ class ParquetDataHandler(APIHandler):
             )
 
 
-class ColumnStatsHandler(APIHandler):
+class ArrowDataHandler(ParquetDataHandler):
+    """The data handler, answering with an Arrow IPC stream instead of JSON.
+
+    Takes the same request body. Errors are still JSON, with the same statuses,
+    so a client tells the two apart by status before decoding.
+    """
+
+    layout = "arrow"
+
+    def _finish_page(self, body):
+        self.write(body)
+        self.finish(set_content_type="application/vnd.apache.arrow.stream")
+
+
+@metrics.phase("stats")
+def _quick_column_stats(path, column_name):
+    """A parquet column's footer statistics, or None when the footer cannot answer.
+
+    See `stats.footer_column_stats`: null counts and ranges without decoding a
+    page, so the statistics panel opens at once and fills in when the full
+    statistics arrive.
+    """
+    arrow_schema = parquet_schema(path)
+    if column_name not in arrow_schema.names:
+        return None
+    return footer_column_stats(
+        pq.ParquetFile(path).metadata,
+        arrow_schema.field(column_name).type,
+        column_name,
+    )
+
+
+class ColumnStatsHandler(_MeteredHandler):
     """Handler for calculating column statistics"""
 
     @tornado.web.authenticated
-    def post(self):
+    async def post(self):
         try:
             input_data = self.get_json_body()
             file_path = input_data.get("path", "")
@@ -557,18 +768,36 @@ class ColumnStatsHandler(APIHandler):
                 self.finish(json.dumps({"error": f"File not found: {file_path}"}))
                 return
 
-            # Detect file type and read accordingly
+            # `quick` asks for what a parquet footer answers without a scan;
+            # anything else, and any column the footer cannot answer for,
+            # gets the full statistics.
+            if input_data.get("quick") and get_file_type(str(abs_path)) == "parquet":
+                try:
+                    stats = await run_blocking(
+                        _quick_column_stats, str(abs_path), column_name
+                    )
+                except ValueError as e:
+                    self.set_status(400)
+                    self.finish(json.dumps({"error": str(e)}))
+                    return
+                if stats is not None:
+                    self.finish(json.dumps(json_safe(stats)))
+                    return
+
+            # Only the one column is needed, and a parquet reads only that
             try:
-                table = read_as_arrow_table(str(abs_path), sheet)
+                table = await run_blocking(
+                    read_columns, str(abs_path), [column_name], sheet
+                )
             except ValueError as e:
                 self.set_status(400)
                 self.finish(json.dumps({"error": str(e)}))
                 return
 
             # Calculate statistics
-            stats = json_safe(calculate_column_stats(table, column_name))
+            stats = await run_blocking(calculate_column_stats, table, column_name)
 
-            self.finish(json.dumps(stats))
+            self.finish(json.dumps(json_safe(stats)))
 
         except ValueError as e:
             # Column not found or other validation error
@@ -583,11 +812,55 @@ class ColumnStatsHandler(APIHandler):
             self.finish(json.dumps({"error": str(e), "error_type": type(e).__name__}))
 
 
-class UniqueValuesHandler(APIHandler):
+@metrics.phase("stats")
+def _unique_values(table, column_name, limit):
+    """Value counts of one column, most frequent first, as the handler's JSON body."""
+    # Get column
+    column = table.column(column_name)
+
+    # Cast to string to handle all types uniformly
+    column_str = pc.cast(column, pa.string())
+
+    # Replace null values with the string "(null)" for consistent handling
+    column_str = pc.fill_null(column_str, "(null)")
+
+    # Get value counts
+    value_counts = pc.value_counts(column_str)
+
+    # value_counts returns a StructArray with 'values' and 'counts' fields
+    values_array = value_counts.field("values")
+    counts_array = value_counts.field("counts")
+
+    # Combine into list of tuples
+    value_count_pairs = list(zip(values_array.to_pylist(), counts_array.to_pylist()))
+
+    # Sort by count (frequency) descending - most frequent first
+    value_count_pairs.sort(key=lambda x: x[1], reverse=True)
+
+    # Limit the results
+    total_unique = len(value_count_pairs)
+    if limit > 0:
+        value_count_pairs = value_count_pairs[:limit]
+
+    # Separate back into values and counts
+    values_list = [v for v, c in value_count_pairs]
+    counts_list = [c for v, c in value_count_pairs]
+
+    result = {
+        "values": values_list,
+        "counts": counts_list,
+        "limit": limit,
+        "total_count": total_unique,
+    }
+
+    return json.dumps(result)
+
+
+class UniqueValuesHandler(_MeteredHandler):
     """Handler for fetching unique values from a column"""
 
     @tornado.web.authenticated
-    def post(self):
+    async def post(self):
         try:
             input_data = self.get_json_body()
             file_path = input_data.get("path", "")
@@ -623,9 +896,11 @@ class UniqueValuesHandler(APIHandler):
                 self.finish(json.dumps({"error": f"File not found: {file_path}"}))
                 return
 
-            # Detect file type and read accordingly
+            # Only the one column is needed, and a parquet reads only that
             try:
-                table = read_as_arrow_table(str(abs_path), sheet)
+                table = await run_blocking(
+                    read_columns, str(abs_path), [column_name], sheet
+                )
             except ValueError as e:
                 self.set_status(400)
                 self.finish(json.dumps({"error": str(e)}))
@@ -639,50 +914,11 @@ class UniqueValuesHandler(APIHandler):
                 )
                 return
 
-            # Get column
-            column = table.column(column_name)
-
-            # Cast to string to handle all types uniformly
-            column_str = pc.cast(column, pa.string())
-
-            # Replace null values with the string "(null)" for consistent handling
-            column_str = pc.fill_null(column_str, "(null)")
-
             # Get limit from request (default to 100 if not provided)
             limit = input_data.get("limit", 100)
 
-            # Get value counts
-            value_counts = pc.value_counts(column_str)
-
-            # value_counts returns a StructArray with 'values' and 'counts' fields
-            values_array = value_counts.field("values")
-            counts_array = value_counts.field("counts")
-
-            # Combine into list of tuples
-            value_count_pairs = list(
-                zip(values_array.to_pylist(), counts_array.to_pylist())
-            )
-
-            # Sort by count (frequency) descending - most frequent first
-            value_count_pairs.sort(key=lambda x: x[1], reverse=True)
-
-            # Limit the results
-            total_unique = len(value_count_pairs)
-            if limit > 0:
-                value_count_pairs = value_count_pairs[:limit]
-
-            # Separate back into values and counts
-            values_list = [v for v, c in value_count_pairs]
-            counts_list = [c for v, c in value_count_pairs]
-
-            result = {
-                "values": values_list,
-                "counts": counts_list,
-                "limit": limit,
-                "total_count": total_unique,
-            }
-
-            self.finish(json.dumps(result))
+            body = await run_blocking(_unique_values, table, column_name, limit)
+            self.finish(body)
 
         except ValueError as e:
             # Column not found or other validation error
@@ -697,11 +933,130 @@ class UniqueValuesHandler(APIHandler):
             self.finish(json.dumps({"error": str(e), "error_type": type(e).__name__}))
 
 
-class DownloadHandler(APIHandler):
+def _filter_and_sort(
+    read_key, table, filters, sort_by, sort_order, case_insensitive, use_regex
+):
+    """The download's rows: `table` filtered and sorted as the grid shows it.
+
+    Through the same cached row view the grid pages from, so exporting the view
+    on screen costs one `take`.
+    """
+    positions = row_view(
+        read_key, table, filters, sort_by, sort_order, case_insensitive, use_regex
+    )
+    return apply_view(table, positions)
+
+
+@metrics.phase("export")
+def _export_body(table, output_format):
+    """Encode `table` in `output_format`, returning the body and its content type."""
+    # Numeric buffers are shared with the arrow table rather than
+    # copied; string columns are converted, because polars' String is a
+    # view type. Still cheaper than the pandas call it replaces, which
+    # copied everything.
+    df = pl.from_arrow(table)
+
+    if output_format != "parquet":
+        # Binary is writable only by the parquet writer: the csv writer
+        # raises ComputeError, the xlsx writer TypeError, and
+        # write_ndjson panics in Rust - see the PanicException arm at
+        # the bottom of `DownloadHandler.get` for why a panic needs its own.
+        #
+        # Hex, not a decode. Casting to String is a strict UTF-8 decode,
+        # and a real BLOB is image bytes or a hash, so it raised
+        # ComputeError on exactly the payloads worth exporting. Hex
+        # never raises, is lossless and is stable across formats. It
+        # matches neither of pandas' two behaviours - pandas wrote the
+        # Python repr b'...' to csv/tsv/xlsx and raised
+        # UnicodeDecodeError on jsonl - and the changelog says so.
+        df = df.with_columns(cs.binary().bin.encode("hex"))
+
+    # Export based on requested output format.
+    # NB: APIHandler.finish() overrides Content-Type to application/json
+    # unless the caller passes `set_content_type=`. The body + content_type
+    # are computed per branch and the handler calls finish() once with both.
+    import io
+
+    if output_format == "parquet":
+        buffer = io.BytesIO()
+        df.write_parquet(buffer)
+        buffer.seek(0)
+        body: bytes = buffer.read()
+        content_type = "application/octet-stream"
+    elif output_format == "excel":
+        buffer = io.BytesIO()
+        # Restore the General number format pandas wrote. Without this
+        # polars applies '#,##0.000;[Red]-#,##0.000', which displays a
+        # float rounded to 3 decimals with red negatives - the stored
+        # value stays exact, but the sheet does not show it.
+        #
+        # Keyed per column rather than per dtype: `dtype_formats` needs
+        # an exact dtype and polars seeds every integer and float WIDTH
+        # separately, so naming Int64 and Float64 left Int32, UInt32 and
+        # Float32 on polars' format. `column_formats` is consulted ahead
+        # of the dtype defaults, so it covers every width and leaves the
+        # date and time formats alone. The sheet also carries a defined
+        # table object, which is not suppressible here.
+        df = _uniquify_headers_for_excel(df)
+        # Excel stores every number as a double, so an integer past
+        # 2**53 is written rounded - a uint64 id came out as
+        # 9.223372036854776e+18 while the csv export of the same file
+        # kept every digit. Such a column is written as text, which is
+        # exact and is what the previous release produced for it.
+        too_wide = [
+            name
+            for name, dtype in df.schema.items()
+            if dtype.is_integer()
+            and (
+                (df[name].max() or 0) > _JS_EXACT_INTEGER
+                or (df[name].min() or 0) < -_JS_EXACT_INTEGER
+            )
+        ]
+        if too_wide:
+            df = df.cast({name: pl.String for name in too_wide})
+        df.write_excel(
+            buffer,
+            autofilter=False,
+            column_formats={
+                name: "General"
+                for name, dtype in df.schema.items()
+                if dtype.is_numeric()
+            },
+        )
+        buffer.seek(0)
+        body = buffer.read()
+        content_type = (
+            "application/vnd.openxmlformats-officedocument."
+            "spreadsheetml.sheet"
+        )
+    elif output_format == "csv":
+        body = df.write_csv().encode("utf-8")
+        content_type = "text/csv"
+    elif output_format == "tsv":
+        body = df.write_csv(separator="\t").encode("utf-8")
+        content_type = "text/tab-separated-values"
+    elif output_format == "jsonl":
+        # No ASCII escaping, null for missing values. NOT byte-identical
+        # to the pandas call this replaces: polars writes floats at
+        # round-trip precision where pandas truncated to 10 significant
+        # digits, renders a date32 as '2023-02-25' rather than
+        # '2023-02-25T00:00:00.000', renders a timestamp with a space
+        # instead of a 'T', and does not escape '/'. Polars is the more
+        # faithful of the two; the differences are listed in the
+        # changelog because they change exported bytes.
+        body = df.write_ndjson().encode("utf-8")
+        content_type = "application/x-ndjson"
+    else:
+        raise ValueError(f"Unhandled output format: {output_format}")
+
+    return body, content_type
+
+
+class DownloadHandler(_MeteredHandler):
     """Handler for downloading filtered and sorted data in specified format"""
 
     @tornado.web.authenticated
-    def get(self):
+    async def get(self):
         try:
             file_path = self.get_argument("path", "")
             download_format = self.get_argument(
@@ -770,217 +1125,60 @@ class DownloadHandler(APIHandler):
             output_filename = "_".join(parts) + output_ext
 
             try:
-                table = read_as_arrow_table(str(abs_path), sheet)
+                read_key, table = await run_blocking(
+                    read_with_key, str(abs_path), sheet
+                )
             except ValueError as e:
                 self.set_status(400)
                 self.finish(str(e))
                 return
 
-            # Apply filters if provided (same logic as ParquetDataHandler)
-            if filters:
-                filter_expressions = []
-                for col_name, filter_spec in filters.items():
-                    if col_name not in table.column_names:
-                        continue
-
-                    filter_type = filter_spec.get("type", "text")
-                    filter_value = filter_spec.get("value", "")
-
-                    if not filter_value:
-                        continue
-
-                    column = table.column(col_name)
-
-                    if filter_type == "text":
-                        column_str = pc.cast(column, pa.string())
-                        column_str = pc.fill_null(column_str, "(null)")
-
-                        if use_regex:
-                            try:
-                                filter_expressions.append(
-                                    pc.match_substring_regex(
-                                        column_str,
-                                        filter_value,
-                                        ignore_case=case_insensitive,
-                                    )
-                                )
-                            except Exception:
-                                filter_expressions.append(
-                                    pc.match_substring(
-                                        column_str,
-                                        filter_value,
-                                        ignore_case=case_insensitive,
-                                    )
-                                )
-                        else:
-                            filter_expressions.append(
-                                pc.match_substring(
-                                    column_str,
-                                    filter_value,
-                                    ignore_case=case_insensitive,
-                                )
-                            )
-                    elif filter_type == "number":
-                        operator = filter_spec.get("operator", "=")
-                        try:
-                            numeric_value = float(filter_value)
-
-                            if operator == ">":
-                                filter_expressions.append(
-                                    pc.greater(column, numeric_value)
-                                )
-                            elif operator == "<":
-                                filter_expressions.append(
-                                    pc.less(column, numeric_value)
-                                )
-                            elif operator == ">=":
-                                filter_expressions.append(
-                                    pc.greater_equal(column, numeric_value)
-                                )
-                            elif operator == "<=":
-                                filter_expressions.append(
-                                    pc.less_equal(column, numeric_value)
-                                )
-                            elif operator == "=":
-                                filter_expressions.append(
-                                    pc.equal(column, numeric_value)
-                                )
-                        except ValueError:
-                            pass
-
-                if filter_expressions:
-                    combined_filter = filter_expressions[0]
-                    for expr in filter_expressions[1:]:
-                        combined_filter = pc.and_(combined_filter, expr)
-
-                    table = table.filter(combined_filter)
-
-            # Apply sorting if requested
-            if sort_by and sort_by in table.column_names:
-                indices = _sort_indices(table, sort_by, sort_order)
-                table = pc.take(table, indices)
-
-            # Numeric buffers are shared with the arrow table rather than
-            # copied; string columns are converted, because polars' String is a
-            # view type. Still cheaper than the pandas call it replaces, which
-            # copied everything.
-            df = pl.from_arrow(table)
-
-            if output_format != "parquet":
-                # Binary is writable only by the parquet writer: the csv writer
-                # raises ComputeError, the xlsx writer TypeError, and
-                # write_ndjson panics in Rust - see the PanicException arm at
-                # the bottom of this method for why a panic needs its own.
-                #
-                # Hex, not a decode. Casting to String is a strict UTF-8 decode,
-                # and a real BLOB is image bytes or a hash, so it raised
-                # ComputeError on exactly the payloads worth exporting. Hex
-                # never raises, is lossless and is stable across formats. It
-                # matches neither of pandas' two behaviours - pandas wrote the
-                # Python repr b'...' to csv/tsv/xlsx and raised
-                # UnicodeDecodeError on jsonl - and the changelog says so.
-                df = df.with_columns(cs.binary().bin.encode("hex"))
-
-            # Export based on requested output format.
-            # NB: APIHandler.finish() overrides Content-Type to application/json
-            # unless the caller passes `set_content_type=`. We compute the
-            # body + content_type per branch then call finish() once.
-            import io
-
-            if output_format == "parquet":
-                buffer = io.BytesIO()
-                df.write_parquet(buffer)
-                buffer.seek(0)
-                body: bytes = buffer.read()
-                content_type = "application/octet-stream"
-            elif output_format == "excel":
-                buffer = io.BytesIO()
-                # Restore the General number format pandas wrote. Without this
-                # polars applies '#,##0.000;[Red]-#,##0.000', which displays a
-                # float rounded to 3 decimals with red negatives - the stored
-                # value stays exact, but the sheet does not show it.
-                #
-                # Keyed per column rather than per dtype: `dtype_formats` needs
-                # an exact dtype and polars seeds every integer and float WIDTH
-                # separately, so naming Int64 and Float64 left Int32, UInt32 and
-                # Float32 on polars' format. `column_formats` is consulted ahead
-                # of the dtype defaults, so it covers every width and leaves the
-                # date and time formats alone. The sheet also carries a defined
-                # table object, which is not suppressible here.
-                df = _uniquify_headers_for_excel(df)
-                # Excel stores every number as a double, so an integer past
-                # 2**53 is written rounded - a uint64 id came out as
-                # 9.223372036854776e+18 while the csv export of the same file
-                # kept every digit. Such a column is written as text, which is
-                # exact and is what the previous release produced for it.
-                too_wide = [
-                    name
-                    for name, dtype in df.schema.items()
-                    if dtype.is_integer()
-                    and (
-                        (df[name].max() or 0) > _JS_EXACT_INTEGER
-                        or (df[name].min() or 0) < -_JS_EXACT_INTEGER
-                    )
-                ]
-                if too_wide:
-                    df = df.cast({name: pl.String for name in too_wide})
-                # A frame one column past the grid is written as a single cell:
-                # add_table fails its dimension check and returns without writing
-                # a header or a value, silently, and the 200 carries an almost
-                # empty workbook. Measured - 16384 columns write in full, 16385
-                # yields A1:A1, and only 16386 raises. The row limit truncates the
-                # same way. A 400 naming the limit is the honest answer, and a
-                # spreadsheet cannot hold this data in any case.
-                if df.width > _XLSX_MAX_COLUMNS or df.height + 1 > _XLSX_MAX_ROWS:
-                    # Reported the way this handler reports its other client
-                    # error: inline, not raised - the arm below maps everything
-                    # it catches to 500, and this is the caller's data, not a
-                    # server fault.
-                    self.set_status(400)
-                    self.finish(
-                        f"{df.height} rows x {df.width} columns does not fit an "
-                        f"Excel worksheet (limit {_XLSX_MAX_ROWS - 1} rows x "
-                        f"{_XLSX_MAX_COLUMNS} columns) - export CSV or Parquet "
-                        "instead"
-                    )
-                    return
-                df.write_excel(
-                    buffer,
-                    autofilter=False,
-                    column_formats={
-                        name: "General"
-                        for name, dtype in df.schema.items()
-                        if dtype.is_numeric()
-                    },
-                )
-                buffer.seek(0)
-                body = buffer.read()
-                content_type = (
-                    "application/vnd.openxmlformats-officedocument."
-                    "spreadsheetml.sheet"
-                )
-            elif output_format == "csv":
-                body = df.write_csv().encode("utf-8")
-                content_type = "text/csv"
-            elif output_format == "tsv":
-                body = df.write_csv(separator="\t").encode("utf-8")
-                content_type = "text/tab-separated-values"
-            elif output_format == "jsonl":
-                # No ASCII escaping, null for missing values. NOT byte-identical
-                # to the pandas call this replaces: polars writes floats at
-                # round-trip precision where pandas truncated to 10 significant
-                # digits, renders a date32 as '2023-02-25' rather than
-                # '2023-02-25T00:00:00.000', renders a timestamp with a space
-                # instead of a 'T', and does not escape '/'. Polars is the more
-                # faithful of the two; the differences are listed in the
-                # changelog because they change exported bytes.
-                body = df.write_ndjson().encode("utf-8")
-                content_type = "application/x-ndjson"
-            else:
+            if output_format not in _EXPORT_FORMATS:
+                # The "original" format of a source no writer handles - a
+                # SQLite database cannot be re-exported as one.
                 self.set_status(400)
                 self.finish(f"Unhandled output format: {output_format}")
                 return
 
+            table = await run_blocking(
+                _filter_and_sort,
+                read_key,
+                table,
+                filters,
+                sort_by,
+                sort_order,
+                case_insensitive,
+                use_regex,
+            )
+
+            if output_format == "excel" and (
+                table.num_columns > _XLSX_MAX_COLUMNS
+                or table.num_rows + 1 > _XLSX_MAX_ROWS
+            ):
+                # A frame one column past the grid is written as a single cell:
+                # add_table fails its dimension check and returns without
+                # writing a header or a value, silently, and the 200 carries an
+                # almost empty workbook. Measured - 16384 columns write in full,
+                # 16385 yields A1:A1, and only 16386 raises. The row limit
+                # truncates the same way. A 400 naming the limit is the honest
+                # answer, and a spreadsheet cannot hold this data in any case.
+                #
+                # Reported the way this handler reports its other client error:
+                # inline, not raised - the arm below maps everything it catches
+                # to 500, and this is the caller's data, not a server fault.
+                self.set_status(400)
+                self.finish(
+                    f"{table.num_rows} rows x {table.num_columns} columns does "
+                    f"not fit an Excel worksheet (limit {_XLSX_MAX_ROWS - 1} rows "
+                    f"x {_XLSX_MAX_COLUMNS} columns) - export CSV or Parquet "
+                    "instead"
+                )
+                return
+
+            body, content_type = await run_blocking(
+                _export_body, table, output_format
+            )
+
             self.set_header(
                 "Content-Disposition", f'attachment; filename="{output_filename}"'
             )
@@ -1010,6 +1208,81 @@ class DownloadHandler(APIHandler):
             self.finish(f"Error downloading file: {str(e)}")
 
 
+class AdminConfigHandler(_MeteredHandler):
+    """Read or change the server's `TabularDataViewerConfig` while it runs.
+
+    GET answers every setting by name. POST (or PATCH) takes a JSON object of
+    settings to change and answers the full set as it now stands. The changes
+    are applied together: traitlets holds the notifications until every value
+    has validated, so one bad value rolls the others back and nothing reaches
+    the modules. An unknown name or a value its trait rejects is a 400.
+
+    Resizing the cache or a pool from a browser is a server administration
+    act, so besides a login it is authorized against its own resource: an
+    authorizer that distinguishes them can grant `read` on
+    `tabular_data_viewer` without `write`.
+    """
+
+    auth_resource = "tabular_data_viewer"
+
+    def _config(self):
+        return self.settings["tabular_data_viewer_config"]
+
+    @tornado.web.authenticated
+    @authorized
+    async def get(self):
+        self.finish(json.dumps(self._config().settings()))
+
+    @tornado.web.authenticated
+    @authorized
+    async def post(self):
+        config = self._config()
+        try:
+            changes = json.loads(self.request.body or b"{}")
+            if not isinstance(changes, dict):
+                raise ValueError("Expected a JSON object of settings")
+            unknown = sorted(set(changes) - set(config.settings()))
+            if unknown:
+                raise ValueError(f"Unknown setting(s): {', '.join(unknown)}")
+            with config.hold_trait_notifications():
+                for name, value in changes.items():
+                    setattr(config, name, value)
+        except (TraitError, ValueError) as e:
+            self.set_status(400)
+            self.finish(json.dumps({"error": str(e)}))
+            return
+        self.finish(json.dumps(config.settings()))
+
+    patch = post
+
+
+class MetricsHandler(APIHandler):
+    """The read cache's counters and the handlers' latencies, since start.
+
+    JSON by default; `?format=prometheus` answers the Prometheus text format
+    for a scraper. See `metrics` for what is counted. Not metered itself, so a
+    scraper's own requests do not show in the latencies it collects.
+    """
+
+    auth_resource = "tabular_data_viewer"
+
+    @tornado.web.authenticated
+    @authorized
+    async def get(self):
+        snap = metrics.snapshot(cache_state())
+        output_format = self.get_argument("format", "json")
+        if output_format == "prometheus":
+            self.finish(
+                metrics.prometheus_text(snap),
+                set_content_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+        elif output_format == "json":
+            self.finish(json.dumps(snap))
+        else:
+            self.set_status(400)
+            self.finish(json.dumps({"error": f"Invalid format: {output_format}"}))
+
+
 def setup_route_handlers(web_app):
     host_pattern = ".*$"
     base_url = web_app.settings["base_url"]
@@ -1020,6 +1293,9 @@ def setup_route_handlers(web_app):
     data_pattern = url_path_join(
         base_url, "jupyterlab-tabular-data-viewer-extension", "data"
     )
+    arrow_data_pattern = url_path_join(
+        base_url, "jupyterlab-tabular-data-viewer-extension", "data", "arrow"
+    )
     stats_pattern = url_path_join(
         base_url, "jupyterlab-tabular-data-viewer-extension", "column-stats"
     )
@@ -1030,12 +1306,23 @@ def setup_route_handlers(web_app):
         base_url, "jupyterlab-tabular-data-viewer-extension", "download"
     )
 
+    admin_config_pattern = url_path_join(
+        base_url, "jupyterlab-tabular-data-viewer-extension", "admin", "config"
+    )
+
+    metrics_pattern = url_path_join(
+        base_url, "jupyterlab-tabular-data-viewer-extension", "metrics"
+    )
+
     handlers = [
         (metadata_pattern, ParquetMetadataHandler),
         (data_pattern, ParquetDataHandler),
+        (arrow_data_pattern, ArrowDataHandler),
         (stats_pattern, ColumnStatsHandler),
         (unique_values_pattern, UniqueValuesHandler),
         (download_pattern, DownloadHandler),
+        (admin_config_pattern, AdminConfigHandler),
+        (metrics_pattern, MetricsHandler),
     ]
 
     web_app.add_handlers(host_pattern, handlers)
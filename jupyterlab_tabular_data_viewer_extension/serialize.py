@@ -0,0 +1,266 @@
+"""JSON-ready values for a page of rows, a whole column at a time.
+
+The data handler used to build its page cell by cell: `column(name)[i].as_py()`
+boxed every value into a python scalar and `convert_to_json_serializable` then
+inspected it. At 500 rows x 200 columns that is 100,000 boxings and type checks
+per page, and once the table is cached they were most of the request's time.
+
+`column_values` converts a whole column instead. The checks that the per-cell
+function made - a float that is not finite, an integer past what a double holds
+exactly, a temporal that needs ISO text - become masks and compute kernels over
+the column, and the one unavoidable conversion to python objects is a single
+`to_pylist`. Types with no vectorised rule - decimals, whose float conversion
+must round exactly as python's does, and lists, structs, maps and durations -
+still go cell by cell, through the same function the loop used, so their wire
+form is unchanged.
+
+`scripts/bench_page_serialization.py` measures the two against each other.
+"""
+
+import json
+import math
+from datetime import date, datetime
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# A double holds every integer up to 2**53 exactly and no more. Javascript has
+# only doubles, so `JSON.parse` silently rounds anything past this: a uint64
+# snowflake id 9223372036854775808 reached the grid as 9223372036854776000.
+_JS_EXACT_INTEGER = 2**53
+INF = math.inf
+
+
+def convert_to_json_serializable(value):
+    """Convert Python objects to JSON-serializable types"""
+    if value is None:
+        return None
+    elif isinstance(value, bool):
+        return value
+    elif isinstance(value, int) and abs(value) > _JS_EXACT_INTEGER:
+        # Sent as a string so the browser cannot round it. The column keeps its
+        # integer type, so sorting, filtering and statistics stay numeric; only
+        # the wire form of these particular values changes, and it is the only
+        # form in which they survive the trip.
+        return str(value)
+    elif isinstance(value, float) and (value != value or value in (INF, -INF)):
+        # NaN and +/-Infinity are not JSON. Python emits them as bare literals
+        # that `JSON.parse` rejects, so one such cell made the whole response
+        # unparseable and the panel reported a load failure for the column.
+        return None
+    elif isinstance(value, (date, datetime)):
+        return value.isoformat()
+    elif isinstance(value, Decimal):
+        return float(value)
+    elif isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    elif isinstance(value, (list, tuple)):
+        # Convert list/tuple to JSON string for display
+        return json.dumps(value)
+    elif isinstance(value, dict):
+        # Convert dict to JSON string for display
+        return json.dumps(value)
+    else:
+        return value
+
+
+def _integers(column):
+    """Integers as python ints, with those a double cannot hold as strings."""
+    values = column.to_pylist()
+    if column.type.bit_width < 64:
+        return values
+    # Bounds in the column's own type: a python int makes pyarrow compare in
+    # int64, which refuses outright once a uint64 value passes 2**63.
+    too_wide = pc.greater(column, pa.scalar(_JS_EXACT_INTEGER, column.type))
+    if pa.types.is_signed_integer(column.type):
+        too_wide = pc.or_(
+            too_wide, pc.less(column, pa.scalar(-_JS_EXACT_INTEGER, column.type))
+        )
+    # Only the offending cells are touched, and on a real table there are none
+    # or a handful.
+    for i in pc.indices_nonzero(too_wide.fill_null(False)).to_pylist():
+        values[i] = str(values[i])
+    return values
+
+
+def _floats(column):
+    """Floats as python floats, with NaN and +/-Infinity as None."""
+    if column.type != pa.float64():
+        column = pc.cast(column, pa.float64())
+    finite = pc.if_else(pc.is_finite(column), column, pa.scalar(None, pa.float64()))
+    return finite.to_pylist()
+
+
+def _timestamps(column):
+    """`datetime.isoformat()` text for every timestamp. See `_timestamp_text`."""
+    return _timestamp_text(column).to_pylist()
+
+
+def _timestamp_text(column):
+    """`datetime.isoformat()` text for every timestamp, computed in arrow.
+
+    isoformat writes the fraction only when the microseconds are non-zero, and
+    an offset with a colon only for a zoned value; both are rebuilt here, so
+    the text matches what the per-cell path produced. Nanoseconds are cut to
+    microseconds, the precision python's datetime holds.
+    """
+    zoned = column.type.tz is not None
+    if column.type.unit == "ns":
+        column = pc.floor_temporal(column, unit="microsecond").cast(
+            pa.timestamp("us", column.type.tz)
+        )
+    # Whole seconds in a second-unit type, where %S has no fraction to print
+    seconds = pc.floor_temporal(column, unit="second").cast(
+        pa.timestamp("s", column.type.tz)
+    )
+    base = pc.strftime(seconds, format="%Y-%m-%dT%H:%M:%S")
+    micros = pc.add(pc.multiply(pc.millisecond(column), 1000), pc.microsecond(column))
+    fraction = pc.if_else(
+        pc.equal(micros, 0),
+        "",
+        pc.binary_join_element_wise(
+            ".", pc.utf8_lpad(pc.cast(micros, pa.string()), 6, "0"), ""
+        ),
+    )
+    parts = [base, fraction]
+    if zoned:
+        offset = pc.strftime(column, format="%z")
+        parts.append(
+            pc.binary_join_element_wise(
+                pc.utf8_slice_codeunits(offset, 0, 3),
+                pc.utf8_slice_codeunits(offset, 3, 5),
+                ":",
+            )
+        )
+    return pc.binary_join_element_wise(*parts, "")
+
+
+def _binary(column):
+    """Bytes decoded as utf-8, with invalid sequences replaced as before."""
+    try:
+        return pc.cast(column, pa.large_string()).to_pylist()
+    except pa.ArrowInvalid:
+        # Not valid utf-8 somewhere - only a per-value decode can substitute
+        # the replacement character at the right places
+        return [
+            None if value is None else value.decode("utf-8", errors="replace")
+            for value in column.to_pylist()
+        ]
+
+
+def column_values(column):
+    """A column's values as a list of JSON-ready python values.
+
+    Exactly what `convert_to_json_serializable` gives for each cell, computed
+    per column. `column` is an arrow Array or ChunkedArray.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    column_type = column.type
+
+    if pa.types.is_dictionary(column_type):
+        return column_values(column.dictionary_decode())
+    if pa.types.is_null(column_type):
+        return [None] * len(column)
+    if pa.types.is_boolean(column_type) or pa.types.is_string(column_type):
+        return column.to_pylist()
+    if pa.types.is_large_string(column_type) or str(column_type) == "string_view":
+        return column.to_pylist()
+    if pa.types.is_integer(column_type):
+        return _integers(column)
+    if pa.types.is_floating(column_type):
+        return _floats(column)
+    if pa.types.is_date(column_type):
+        return pc.strftime(column, format="%Y-%m-%d").to_pylist()
+    if pa.types.is_timestamp(column_type):
+        return _timestamps(column)
+    if (
+        pa.types.is_binary(column_type)
+        or pa.types.is_large_binary(column_type)
+        or pa.types.is_fixed_size_binary(column_type)
+        or str(column_type) == "binary_view"
+    ):
+        return _binary(column)
+    return [convert_to_json_serializable(value) for value in column.to_pylist()]
+
+
+def page_columns(table):
+    """Every column of `table` through `column_values`, keyed by name.
+
+    A name the table carries twice keeps its last column, which is what the
+    per-row dictionaries of the row layout always did.
+    """
+    return {
+        name: column_values(table.column(index))
+        for index, name in enumerate(table.column_names)
+    }
+
+
+def page_rows(table, row_indices):
+    """The row layout: one dictionary per row, with its `__row_index__`."""
+    columns = page_columns(table)
+    names = list(columns)
+    rows = []
+    for values, row_index in zip(zip(*columns.values()), row_indices):
+        row = dict(zip(names, values))
+        row["__row_index__"] = row_index
+        rows.append(row)
+    if not names:
+        rows = [{"__row_index__": row_index} for row_index in row_indices]
+    return rows
+
+
+def ipc_column(column):
+    """A column in the few types the browser's IPC reader decodes.
+
+    The Arrow IPC page (see `routes._arrow_page_body`) keeps numbers and text
+    as the arrow values they are - which is its point: a 64-bit integer crosses
+    exactly, and nothing is printed or parsed. Everything the grid would only
+    display as text is sent as the text the JSON layouts carry, so both
+    transports show the same thing: dates and timestamps as their isoformat,
+    binary decoded, lists and structs as JSON, anything else by `str`. Decimals
+    go as float64, as in JSON, and half floats are widened.
+
+    The result is null, boolean, integer, float32/float64 or utf8, and
+    `src/arrow.ts` decodes exactly that set.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    column_type = column.type
+
+    if pa.types.is_dictionary(column_type):
+        return ipc_column(column.dictionary_decode())
+    if (
+        pa.types.is_null(column_type)
+        or pa.types.is_boolean(column_type)
+        or pa.types.is_integer(column_type)
+        or pa.types.is_string(column_type)
+        or column_type in (pa.float32(), pa.float64())
+    ):
+        return column
+    if pa.types.is_floating(column_type):
+        return pc.cast(column, pa.float32())
+    if pa.types.is_large_string(column_type) or str(column_type) == "string_view":
+        # A page is far below the 2 GiB a 32-bit offset addresses
+        return pc.cast(column, pa.string())
+    if pa.types.is_date(column_type):
+        return pc.strftime(column, format="%Y-%m-%d")
+    if pa.types.is_timestamp(column_type):
+        return _timestamp_text(column)
+    if pa.types.is_decimal(column_type):
+        return pa.array(column_values(column), pa.float64())
+    return pa.array(
+        [
+            value if value is None or isinstance(value, str) else str(value)
+            for value in column_values(column)
+        ],
+        pa.string(),
+    )
+
+
+def ipc_table(table):
+    """`table` with every column through `ipc_column`."""
+    return pa.table(
+        [ipc_column(column) for column in table.columns], names=table.column_names
+    )
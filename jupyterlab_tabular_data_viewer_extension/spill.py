@@ -0,0 +1,142 @@
+"""A second tier under the read cache: converted tables kept on disk.
+
+`readers._CACHE` lives in one process's memory, so every server restart pays
+each file's full conversion again - a minute through openpyxl for a 200k-row
+workbook - and a table bigger than `_CACHE_MAX_BYTES` pays it on every request.
+The conversion's result is an arrow table, and an uncompressed Arrow IPC file
+of it can be memory-mapped back without decoding or copying: a hit costs an
+`open` and a footer read, and the rows come from the page cache.
+
+Opt-in. A spill file is a full copy of the file's data, written wherever the
+directory points, so nothing is written unless the server is started with
+JUPYTERLAB_TABULAR_DATA_VIEWER_CACHE_DIR set or `spill_dir` configured (see
+`config`). Parquet is never spilled: it is already columnar and read in
+windows straight from the file.
+
+Every failure here is logged and swallowed. The tier can only ever make a read
+faster; a full disk, a read-only directory or a truncated file means the file
+is read the ordinary way, never that the request fails.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+_log = logging.getLogger(__name__)
+
+# Where spill files go, or None for no disk tier at all
+_SPILL_DIR = os.environ.get("JUPYTERLAB_TABULAR_DATA_VIEWER_CACHE_DIR") or None
+
+# The directory is pruned, least recently used first, back under this size
+# after every write. A hit refreshes the file's mtime, which is the LRU clock.
+_SPILL_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Part of every file's name. Bump it when a reader's output changes for the
+# same input file, or the directory keeps serving the old conversion.
+_SPILL_FORMAT = 1
+
+_SUFFIX = ".arrow"
+
+# Writes and prunes are serialised within the process; across processes the
+# write-then-rename keeps a reader from ever seeing half a file.
+_SPILL_LOCK = threading.Lock()
+
+
+def configure(directory=None, max_bytes=None):
+    """Change the directory or its size bound. None keeps a value; "" disables."""
+    global _SPILL_DIR, _SPILL_MAX_BYTES
+    if max_bytes is not None:
+        if max_bytes < 0:
+            raise ValueError("spill max_bytes must not be negative")
+        _SPILL_MAX_BYTES = max_bytes
+    if directory is not None:
+        _SPILL_DIR = os.path.expanduser(directory) if directory else None
+    if max_bytes is not None and _SPILL_DIR is not None and os.path.isdir(_SPILL_DIR):
+        with _SPILL_LOCK:
+            _prune()
+
+
+def _names(key):
+    """The file-independent prefix and the full file name for a read cache key.
+
+    The prefix hashes the path and sheet only, so every version of one file's
+    spill shares it and a new version can find and delete the old ones.
+    """
+    path, sheet = key[0], key[1]
+    source = hashlib.sha256(repr((path, sheet)).encode()).hexdigest()[:32]
+    version = hashlib.sha256(repr((_SPILL_FORMAT, key[2:])).encode()).hexdigest()
+    return source, f"{source}-{version[:32]}{_SUFFIX}"
+
+
+def spill_get(key):
+    """The table spilled for `key`, memory-mapped, or None."""
+    if _SPILL_DIR is None:
+        return None
+    target = os.path.join(_SPILL_DIR, _names(key)[1])
+    try:
+        table = feather.read_table(target, memory_map=True)
+    except FileNotFoundError:
+        return None
+    except (OSError, pa.ArrowInvalid) as e:
+        # Truncated or foreign: drop it, and the read that follows replaces it
+        _log.warning("discarding unreadable spill file %s: %s", target, e)
+        _remove(target)
+        return None
+    try:
+        os.utime(target)
+    except OSError:
+        pass
+    return table
+
+
+def spill_put(key, table):
+    """Write `table` as the spill for `key`, replacing older versions of its file."""
+    if _SPILL_DIR is None:
+        return
+    source, name = _names(key)
+    try:
+        os.makedirs(_SPILL_DIR, exist_ok=True)
+        with _SPILL_LOCK:
+            descriptor, temporary = tempfile.mkstemp(
+                dir=_SPILL_DIR, prefix=".", suffix=".tmp"
+            )
+            os.close(descriptor)
+            try:
+                feather.write_feather(table, temporary, compression="uncompressed")
+                os.replace(temporary, os.path.join(_SPILL_DIR, name))
+            except BaseException:
+                _remove(temporary)
+                raise
+            for entry in os.listdir(_SPILL_DIR):
+                if entry.startswith(source + "-") and entry != name:
+                    _remove(os.path.join(_SPILL_DIR, entry))
+            _prune()
+    except (OSError, pa.ArrowException) as e:
+        _log.warning("could not spill %s [%s] to %s: %s", key[0], key[1], _SPILL_DIR, e)
+
+
+def _prune():
+    """Delete the least recently used spill files until within _SPILL_MAX_BYTES."""
+    files = []
+    for entry in os.scandir(_SPILL_DIR):
+        if entry.name.endswith(_SUFFIX) and entry.is_file():
+            stat = entry.stat()
+            files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= _SPILL_MAX_BYTES:
+            break
+        _remove(path)
+        total -= size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
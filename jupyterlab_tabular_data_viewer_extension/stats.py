@@ -8,6 +8,8 @@ import pyarrow as pa
 import pyarrow.compute as pc
 from typing import Dict, Any
 
+from . import metrics
+
 
 def simplify_type(arrow_type: pa.DataType) -> str:
     """
@@ -92,6 +94,7 @@ def json_safe(stats: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+@metrics.phase("stats")
 def calculate_column_stats(table: pa.Table, column_name: str) -> Dict[str, Any]:
     """
     Calculate comprehensive statistics for a column.
@@ -275,3 +278,79 @@ def calculate_column_stats(table: pa.Table, column_name: str) -> Dict[str, Any]:
             print(f"Warning: Could not compute date stats for {column_name}: {e}")
 
     return stats
+
+
+def footer_column_stats(metadata, arrow_type: pa.DataType, column_name: str):
+    """The statistics a parquet footer answers for a column, without a scan.
+
+    A parquet footer records, for every row group and column chunk, the null
+    count and - for most types - the minimum and maximum. Summed and folded
+    across row groups those give the null counts, the numeric range and the
+    date range exactly, in the time it takes to read the footer; on a multi-GB
+    file `calculate_column_stats` takes seconds to decode the same column for
+    the same numbers. The distinct count, mean, median, quantiles and
+    everything string-shaped need the values, so they are left out and the
+    payload is marked `partial` - the caller fetches the full statistics next.
+
+    Returns None when the footer cannot answer even the null counts: the column
+    is nested or absent, or a row group was written without statistics.
+    `arrow_type` is the column's type as the readers present it.
+    """
+    leaf = None
+    for index in range(metadata.num_columns):
+        if metadata.schema.column(index).path == column_name:
+            leaf = index
+            break
+    if leaf is None:
+        return None
+
+    total_count = metadata.num_rows
+    chunks = [
+        metadata.row_group(group).column(leaf).statistics
+        for group in range(metadata.num_row_groups)
+    ]
+    if metadata.schema.column(leaf).logical_type.type == "UNKNOWN":
+        # Parquet's Null logical type - a column written null in every row.
+        # Writers record no statistics for it, and need none.
+        null_count = total_count
+        chunks = []
+    elif any(chunk is None or not chunk.has_null_count for chunk in chunks):
+        return None
+    else:
+        null_count = sum(chunk.null_count for chunk in chunks)
+    non_null_count = total_count - null_count
+    null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
+    non_null_percentage = (100 - null_percentage) if total_count > 0 else 0
+    simplified_type = simplify_type(arrow_type)
+
+    stats = {
+        "column_name": column_name,
+        "data_type": simplified_type,
+        "total_rows": total_count,
+        "non_null_count": non_null_count,
+        "non_null_percentage": round(non_null_percentage, 1),
+        "null_count": null_count,
+        "null_percentage": round(null_percentage, 1),
+        "partial": True,
+    }
+    ranged = ("int", "float", "date", "datetime")
+    if non_null_count == 0 or simplified_type not in ranged:
+        return stats
+
+    # A chunk holding values but no min/max - an all-NaN float chunk is one, as
+    # writers leave NaN out of the bounds - leaves the range to the full scan.
+    valued = [chunk for chunk in chunks if chunk.num_values > 0]
+    if not all(chunk.has_min_max for chunk in valued):
+        return stats
+    low = min(chunk.min for chunk in valued)
+    high = max(chunk.max for chunk in valued)
+
+    if simplified_type in ("int", "float"):
+        stats["min_value"] = float(low)
+        stats["max_value"] = float(high)
+    else:
+        stats["earliest_date"] = str(low)
+        stats["latest_date"] = str(high)
+        span = high - low
+        stats["date_range_days"] = span.days if hasattr(span, "days") else None
+    return stats
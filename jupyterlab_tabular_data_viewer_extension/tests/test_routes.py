@@ -433,6 +433,87 @@ def test_list_excel_sheets_excludes_chartsheets(tmp_path):
     assert list_excel_sheets(str(target)) == ["Data"]
 
 
+def test_list_excel_sheets_reads_only_the_workbook_part(tmp_path):
+    """Listing must not parse styles, shared strings or sheet data.
+
+    Those parts are what made a `load_workbook` take seconds, so here they are
+    replaced with XML that does not parse: the listing still answers, and only
+    the read - which does need them - reports the damage.
+    """
+    import zipfile
+
+    import openpyxl
+
+    from jupyterlab_tabular_data_viewer_extension.readers import (
+        _cache_clear,
+        _read_excel,
+        list_excel_sheets,
+    )
+
+    book = openpyxl.Workbook()
+    book.active.title = "First"
+    book.active.append(["a"])
+    book.create_sheet("Second").append(["b"])
+    intact = tmp_path / "intact.xlsx"
+    book.save(intact)
+
+    damaged = tmp_path / "damaged.xlsx"
+    with zipfile.ZipFile(intact) as src, zipfile.ZipFile(damaged, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename in ("xl/styles.xml", "xl/worksheets/sheet1.xml"):
+                data = b"<not xml"
+            dst.writestr(item, data)
+
+    try:
+        assert list_excel_sheets(str(damaged)) == ["First", "Second"]
+        with pytest.raises(ValueError, match="Cannot read excel file"):
+            _read_excel(str(damaged))
+        (tmp_path / "notes.xlsx").write_text("not a zip")
+        with pytest.raises(ValueError, match="Cannot read excel file"):
+            list_excel_sheets(str(tmp_path / "notes.xlsx"))
+    finally:
+        _cache_clear()
+
+
+def test_list_excel_sheets_is_cached_until_the_file_changes(tmp_path, monkeypatch):
+    """A second listing of the same file does not open it; an edited one does."""
+    import openpyxl
+
+    from jupyterlab_tabular_data_viewer_extension import readers, xlsx
+
+    calls = []
+    real = xlsx.sheet_names
+    monkeypatch.setattr(
+        xlsx, "sheet_names", lambda path: calls.append(path) or real(path)
+    )
+
+    target = tmp_path / "book.xlsx"
+    book = openpyxl.Workbook()
+    book.active.title = "Only"
+    book.save(target)
+    try:
+        assert readers.list_excel_sheets(str(target)) == ["Only"]
+        listed = readers.list_excel_sheets(str(target))
+        assert listed == ["Only"]
+        assert len(calls) == 1
+        # The caller's copy is its own
+        listed.append("mutated")
+        assert readers.list_excel_sheets(str(target)) == ["Only"]
+
+        book.create_sheet("Added")
+        book.save(target)
+        os.utime(target, ns=(0, os.stat(target).st_mtime_ns + 1_000_000_000))
+        assert readers.list_excel_sheets(str(target)) == ["Only", "Added"]
+        assert len(calls) == 2
+        # The stale listing is gone, not kept beside the new one
+        assert [k for k in readers._SHEET_LISTS if k[0] == str(target)] == [
+            readers._cache_key(str(target), None)
+        ]
+    finally:
+        readers._cache_clear()
+
+
 def test_read_excel_specific_sheet(tmp_path):
     """read_as_arrow_table with sheet param reads the named sheet"""
     from jupyterlab_tabular_data_viewer_extension.readers import read_as_arrow_table
@@ -755,9 +836,10 @@ def test_sheet_listing_survives_a_broken_external_link(tmp_path):
     openpyxl walks every <externalReference> unless `keep_links=False`, and an
     unresolvable one leaves it dereferencing None: AttributeError, which is not
     a ValueError, so the metadata request 500d with a traceback while the reader
-    - which passed keep_links=False - opened the same file. Both call sites now
-    load through `_OPENPYXL_LOAD`. Excel leaves this shape behind after a repair
-    or when a linked workbook is stripped from the package.
+    - which passed keep_links=False - opened the same file. Neither reads
+    through openpyxl now, and neither follows external links. Excel leaves this
+    shape behind after a repair or when a linked workbook is stripped from the
+    package.
     """
     import zipfile
 
@@ -2916,13 +2998,17 @@ def test_nullable_column_type_is_stable_across_any_row_window(tmp_path):
     the property instead of the defect.
 
     Two things ride on this. A nullable integer renders 42 rather than 42.0, and
-    the pushdown is no longer blocked by the reader's type inference.
+    the pushdown is no longer blocked by the reader's type inference - the
+    window below is the one the data handler now serves an unfiltered page from.
     """
     import sqlite3
 
     import polars as pl
 
-    from jupyterlab_tabular_data_viewer_extension.readers import _read_sqlite
+    from jupyterlab_tabular_data_viewer_extension.readers import (
+        _read_sqlite,
+        read_sqlite_window,
+    )
 
     target = tmp_path / "nullable.db"
     conn = sqlite3.connect(str(target))
@@ -2943,7 +3029,9 @@ def test_nullable_column_type_is_stable_across_any_row_window(tmp_path):
     assert full.column("v").to_pylist()[:3] == [0, 1, 2]
     assert full.column("v").to_pylist()[-1] is None
 
-    # The window a pushdown would serve, read the way the reader reads
+    # Both the window the pushdown serves and the one the raw reader would
+    # infer from the page's rows alone
+    served, _ = read_sqlite_window(str(target), 0, 10)
     conn = sqlite3.connect(str(target))
     try:
         windowed = pl.read_database(
@@ -2952,6 +3040,7 @@ def test_nullable_column_type_is_stable_across_any_row_window(tmp_path):
     finally:
         conn.close()
 
+    assert served.equals(full.slice(0, 10))
     assert str(windowed.schema.field("v").type) == "int64"
     assert windowed.column("v").to_pylist()[:3] == [0, 1, 2]
     assert str(windowed.schema.field("v").type) == str(full.schema.field("v").type), (
@@ -3266,36 +3355,162 @@ def test_cache_sees_a_wal_commit_from_an_open_writer(tmp_path):
         writer.close()
 
 
+def test_sqlite_cache_sees_a_commit_in_the_same_mtime_tick(tmp_path, monkeypatch):
+    """A rollback-journal database is versioned by its header's change counter.
+
+    A commit whose mtime is forced back to the previous one - two commits in
+    one tick of a coarse filesystem clock - must still be read again.
+    """
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target = str(tmp_path / "quiet.db")
+    conn = sqlite3.connect(target)
+    conn.execute("CREATE TABLE t (v INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.commit()
+
+    reads = []
+    real = readers._read_sqlite
+    monkeypatch.setattr(readers, "_read_sqlite", lambda *a: reads.append(a) or real(*a))
+
+    first = readers.read_as_arrow_table(target, "t")
+    assert readers.read_as_arrow_table(target, "t") is first
+    assert len(reads) == 1
+
+    before = os.stat(target)
+    conn.execute("UPDATE t SET v = 2")
+    conn.commit()
+    conn.close()
+    os.utime(target, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert os.stat(target).st_size == before.st_size
+    assert readers.read_as_arrow_table(target, "t").column("v").to_pylist() == [2]
+    assert len(reads) == 2
+
+
+@pytest.mark.parametrize("journal_mode", ["delete", "wal"])
+def test_sqlite_cache_sees_a_database_rebuilt_in_place(tmp_path, journal_mode):
+    """Two builds of one script have identical headers; the key still differs.
+
+    Deleted and rebuilt, a database may get its old inode back, so the header
+    and inode alone would key the new build as the old one - and serve, and
+    spill, the old rows. Replaced by another file with the old mtime forced
+    onto it, the inode tells them apart.
+    """
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    def build(path, seed):
+        conn = sqlite3.connect(path)
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.execute("INSERT INTO t VALUES (?)", (seed,))
+        conn.commit()
+        conn.close()
+
+    readers._cache_clear()
+    target = str(tmp_path / "built.db")
+    build(target, 1)
+    assert readers.read_as_arrow_table(target, "t").column("v").to_pylist() == [1]
+
+    os.remove(target)
+    build(target, 2)
+    assert readers.read_as_arrow_table(target, "t").column("v").to_pylist() == [2]
+
+    before = os.stat(target)
+    build(str(tmp_path / "other.db"), 3)
+    os.replace(tmp_path / "other.db", target)
+    os.utime(target, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert readers.read_as_arrow_table(target, "t").column("v").to_pylist() == [3]
+    readers._cache_clear()
+
+
+def test_cache_sees_a_wal_commit_that_leaves_the_log_looking_the_same(tmp_path):
+    """A WAL commit is seen through `PRAGMA data_version`, not the log's stat.
+
+    After a RESTART checkpoint the next commit rewrites the log from its start,
+    so one that changes the same pages leaves it the same size; with its mtime
+    on the same tick - forced here - the stat key could not tell the two
+    versions apart and served the first. Touching the files changes nothing.
+    """
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target = str(tmp_path / "wal.db")
+    writer = sqlite3.connect(target)
+    try:
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.execute("CREATE TABLE t (v INTEGER)")
+        writer.execute("INSERT INTO t VALUES (0)")
+        writer.commit()
+        writer.execute("UPDATE t SET v = 1")
+        writer.commit()
+        writer.execute("PRAGMA wal_checkpoint(RESTART)")
+
+        key = readers._cache_key(target, "t")
+        assert readers.read_as_arrow_table(target, "t").column("v").to_pylist() == [1]
+        log = os.stat(target + "-wal")
+
+        writer.execute("UPDATE t SET v = 2")
+        writer.commit()
+        os.utime(target + "-wal", ns=(log.st_atime_ns, log.st_mtime_ns))
+        again = os.stat(target + "-wal")
+        # The premise: the log's stat is unchanged
+        assert (again.st_mtime_ns, again.st_size) == (log.st_mtime_ns, log.st_size)
+
+        assert readers._cache_key(target, "t") != key
+        table = readers.read_as_arrow_table(target, "t")
+        assert table.column("v").to_pylist() == [2]
+
+        os.utime(target)
+        os.utime(target + "-wal")
+        assert readers.read_as_arrow_table(target, "t") is table
+    finally:
+        writer.close()
+        readers._cache_clear()
+
+
 def test_cache_byte_counter_tracks_contents_and_recency_is_lru(tmp_path):
-    """_CACHE_BYTES matches the resident tables, and eviction is LRU not FIFO"""
+    """_CACHE_BYTES matches the resident tables, and eviction is LRU not FIFO
+
+    With every read equally expensive per byte, the cost-aware ranking reduces
+    to recency and use: the entry read again outlives the one read once.
+    """
     from jupyterlab_tabular_data_viewer_extension import readers
 
     readers._cache_clear()
     target = tmp_path / "sample_database.db"
     shutil.copy(DATA_DIR / "sample_database.db", target)
+    tables = {
+        name: readers.read_as_arrow_table(str(target), name)
+        for name in ("attachments", "customers", "orders")
+    }
+    readers._cache_clear()
 
-    readers.read_as_arrow_table(str(target), "attachments")
-    readers.read_as_arrow_table(str(target), "customers")
+    def put(name):
+        key = (str(target), name, 0, 0, (0, 0))
+        readers._cache_put(key, tables[name], seconds=float(tables[name].nbytes))
+        return key
+
+    attachments = put("attachments")
+    put("customers")
     assert readers._CACHE_BYTES == sum(t.nbytes for t in readers._CACHE.values())
+    # Touch the oldest so it becomes the most recently used
+    readers._cache_get(attachments)
 
     # Size the budget so that exactly attachments + orders fit. Measured, not
     # guessed: an under-sized budget would make `orders` skip caching entirely
     # (the oversized path) and evict nothing, which would pass for the wrong
     # reason.
-    sizes = {
-        name: readers.read_as_arrow_table(str(target), name).nbytes
-        for name in ("attachments", "customers", "orders")
-    }
-    readers._cache_clear()
-    readers.read_as_arrow_table(str(target), "attachments")
-    readers.read_as_arrow_table(str(target), "customers")
-    # Touch the oldest so it becomes the most recently used
-    readers.read_as_arrow_table(str(target), "attachments")
-
     saved = readers._CACHE_MAX_BYTES
-    readers._CACHE_MAX_BYTES = sizes["attachments"] + sizes["orders"]
+    readers._CACHE_MAX_BYTES = tables["attachments"].nbytes + tables["orders"].nbytes
     try:
-        readers.read_as_arrow_table(str(target), "orders")
+        put("orders")
     finally:
         readers._CACHE_MAX_BYTES = saved
 
@@ -3306,3 +3521,2434 @@ def test_cache_byte_counter_tracks_contents_and_recency_is_lru(tmp_path):
     )
     assert "customers" not in resident
     assert readers._CACHE_BYTES == sum(t.nbytes for t in readers._CACHE.values())
+
+
+def _sized(nbytes):
+    """A stand-in table for the cache's bookkeeping, which reads only `nbytes`."""
+    import types
+
+    return types.SimpleNamespace(nbytes=nbytes)
+
+
+def test_cache_evicts_the_cheap_table_before_the_expensive_one(monkeypatch):
+    """A slow read outlives a fast one of the same size, whatever their ages."""
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    monkeypatch.setattr(readers, "_CACHE_MAX_BYTES", 250)
+    workbook, parquet, csv = (("/" + name, None, 0, 0, (0, 0)) for name in "wpc")
+
+    readers._cache_put(workbook, _sized(100), seconds=40.0)
+    readers._cache_put(parquet, _sized(100), seconds=0.05)
+    assert readers._cache_put(csv, _sized(100), seconds=1.0)
+
+    assert set(readers._CACHE) == {workbook, csv}
+    assert readers._CACHE_BYTES == 200
+
+
+def test_cache_refuses_a_cheap_table_that_would_displace_an_expensive_one(
+    monkeypatch,
+):
+    """Admission: a quick re-read is not worth evicting a slow one for.
+
+    Refused, it is remembered, so a table asked for often enough is admitted
+    after all.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    monkeypatch.setattr(readers, "_CACHE_MAX_BYTES", 150)
+    workbook, parquet = ("/w", None, 0, 0, (0, 0)), ("/p", None, 0, 0, (0, 0))
+    readers._cache_put(workbook, _sized(100), seconds=40.0)
+
+    assert not readers._cache_put(parquet, _sized(100), seconds=0.25)
+    assert list(readers._CACHE) == [workbook]
+
+    # 40 s against 0.25 s for the same bytes: the 160th request draws level
+    admitted = [
+        readers._cache_put(parquet, _sized(100), seconds=0.25) for _ in range(159)
+    ]
+    assert admitted[-1] and not admitted[-2]
+    assert list(readers._CACHE) == [parquet]
+
+
+def test_cache_trace_records_each_read_with_its_cost(tmp_path, monkeypatch):
+    """The replay benchmark's input: one line per read, a hit at the miss's cost."""
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    trace = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(readers, "_TRACE_PATH", str(trace))
+    target = tmp_path / "t.csv"
+    target.write_text("n\n1\n2\n")
+
+    table = readers.read_as_arrow_table(str(target))
+    readers.read_as_arrow_table(str(target))
+
+    miss, hit = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert miss == hit
+    assert miss["bytes"] == table.nbytes and miss["seconds"] > 0
+    assert str(tmp_path) not in trace.read_text()
+
+
+def test_concurrent_misses_share_one_read(tmp_path, monkeypatch):
+    """Callers that miss together wait on the one read already running.
+
+    The read is held open until every caller has arrived, so all four are
+    certain to have missed the cache; four reads of the file would have been
+    four calls to the reader.
+    """
+    import threading
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target = tmp_path / "sample_database.db"
+    shutil.copy(DATA_DIR / "sample_database.db", target)
+
+    calls = []
+    arrived = threading.Barrier(4)
+    real_read = readers._read
+
+    def counted_read(path, sheet):
+        calls.append(sheet)
+        # Wait until the other three are parked on this flight
+        for _ in range(200):
+            with readers._CACHE_LOCK:
+                flight = next(iter(readers._INFLIGHT.values()))
+                if flight.waiters == 3:
+                    break
+            threading.Event().wait(0.01)
+        return real_read(path, sheet)
+
+    monkeypatch.setattr(readers, "_read", counted_read)
+    before = readers._COALESCED_WAITERS
+
+    results = []
+
+    def worker():
+        arrived.wait()
+        results.append(readers.read_as_arrow_table(str(target), "customers"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["customers"], f"expected one read, got {len(calls)}"
+    assert len(results) == 4
+    assert all(table is results[0] for table in results)
+    assert readers._COALESCED_WAITERS - before == 3
+    assert readers._INFLIGHT == {}
+
+
+def test_a_failed_read_fails_every_waiter_without_rereading(tmp_path, monkeypatch):
+    """Waiters receive the leader's error; nobody retries the failed read."""
+    import threading
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target = tmp_path / "broken.csv"
+    target.write_text("a,b\n1,2\n")
+
+    calls = []
+    waiting = threading.Event()
+
+    def failing_read(path, sheet):
+        calls.append(path)
+        for _ in range(200):
+            with readers._CACHE_LOCK:
+                if next(iter(readers._INFLIGHT.values())).waiters:
+                    break
+            waiting.wait(0.01)
+        raise ValueError("Cannot read csv file: broken")
+
+    monkeypatch.setattr(readers, "_read", failing_read)
+
+    errors = []
+
+    def worker():
+        try:
+            readers.read_as_arrow_table(str(target))
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert errors == ["Cannot read csv file: broken"] * 2
+    assert readers._INFLIGHT == {}
+
+
+def test_a_restart_reads_the_spilled_table_instead_of_the_file(
+    tmp_path, monkeypatch
+):
+    """With a cache directory, a cold memory cache maps the spill back.
+
+    No reader runs: the table is the arrow file written after the first read,
+    memory-mapped, and equal to what the reader produced.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers, spill
+
+    monkeypatch.setattr(spill, "_SPILL_DIR", str(tmp_path / "spill"))
+    readers._cache_clear()
+    target = tmp_path / "sample_database.db"
+    shutil.copy(DATA_DIR / "sample_database.db", target)
+    first = readers.read_as_arrow_table(str(target), "customers")
+    assert len(os.listdir(tmp_path / "spill")) == 1
+
+    # A restart: nothing in memory, and any attempt to read the file fails
+    readers._cache_clear()
+
+    def no_read(*args):
+        raise AssertionError("read the file again")
+
+    monkeypatch.setattr(readers, "_read", no_read)
+    again = readers.read_as_arrow_table(str(target), "customers")
+
+    assert again.equals(first)
+
+
+def test_spill_keeps_one_version_per_file_and_survives_corruption(
+    tmp_path, monkeypatch
+):
+    """An edited file replaces its spill, and a damaged spill is just re-read."""
+    from jupyterlab_tabular_data_viewer_extension import readers, spill
+
+    spill_dir = tmp_path / "spill"
+    monkeypatch.setattr(spill, "_SPILL_DIR", str(spill_dir))
+    readers._cache_clear()
+    target = tmp_path / "t.csv"
+    target.write_text("n\n1\n2\n")
+    readers.read_as_arrow_table(str(target))
+    target.write_text("n\n1\n2\n3\n")
+    os.utime(target, ns=(1, 1))
+    readers._cache_clear()
+    readers.read_as_arrow_table(str(target))
+    (only,) = os.listdir(spill_dir)
+
+    (spill_dir / only).write_bytes(b"not arrow")
+    readers._cache_clear()
+    table = readers.read_as_arrow_table(str(target))
+
+    assert table.column("n").to_pylist() == [1, 2, 3]
+    assert os.listdir(spill_dir) == [only]
+    assert spill.spill_get(readers._cache_key(str(target), None)).equals(table)
+
+
+def test_parquet_and_a_disabled_spill_write_nothing(tmp_path, monkeypatch):
+    """Parquet is already columnar, and without a directory there is no tier."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers, spill
+
+    readers._cache_clear()
+    pq.write_table(pa.table({"n": [1, 2]}), tmp_path / "t.parquet")
+    (tmp_path / "t.csv").write_text("n\n1\n")
+    monkeypatch.setattr(spill, "_SPILL_DIR", str(tmp_path / "spill"))
+    readers.read_as_arrow_table(str(tmp_path / "t.parquet"))
+    assert not (tmp_path / "spill").exists()
+
+    monkeypatch.setattr(spill, "_SPILL_DIR", None)
+    readers.read_as_arrow_table(str(tmp_path / "t.csv"))
+    assert not (tmp_path / "spill").exists()
+
+
+# ---------------------------------------------------------------------------
+# Executors
+# ---------------------------------------------------------------------------
+
+
+async def test_a_slow_read_does_not_stall_other_requests(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """A read that blocks must not hold the IOLoop for every other request.
+
+    The stalled read waits on an event only the test sets, AFTER the second
+    request has been answered. With the read on the IOLoop the second request
+    could not be served until the wait timed out, so the order of completion is
+    the whole assertion.
+    """
+    import asyncio
+    import threading
+
+    from jupyterlab_tabular_data_viewer_extension import routes
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    shutil.copy(DATA_DIR / "sample_data.csv", target_dir / "sample_data.csv")
+    shutil.copy(DATA_DIR / "sample_data.parquet", target_dir / "sample_data.parquet")
+
+    release = threading.Event()
+    real_read = routes.read_with_key
+
+    def stalled_read(path, sheet=None):
+        if path.endswith(".csv"):
+            release.wait(10)
+        return real_read(path, sheet)
+
+    monkeypatch.setattr(routes, "read_with_key", stalled_read)
+
+    slow = asyncio.ensure_future(
+        jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps({"path": "data/sample_data.csv", "offset": 0, "limit": 5}),
+        )
+    )
+    try:
+        fast = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "metadata",
+            method="POST",
+            body=json.dumps({"path": "data/sample_data.parquet"}),
+        )
+        assert fast.code == 200
+        assert not slow.done(), "the stalled read finished first - nothing ran concurrently"
+    finally:
+        release.set()
+    assert (await slow).code == 200
+
+
+async def test_unloading_the_extension_releases_its_pools(
+    jp_fetch, jp_root_dir, jp_serverapp
+):
+    """The server's shutdown stops the read pools and pooled SQLite connections.
+
+    A read after it starts them again.
+    """
+    import jupyterlab_tabular_data_viewer_extension as extension
+    from jupyterlab_tabular_data_viewer_extension import executors, readers
+
+    readers._cache_clear()
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    shutil.copy(DATA_DIR / "sample_database.db", target_dir / "sample_database.db")
+
+    async def page():
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps({"path": "data/sample_database.db", "limit": 5}),
+        )
+        return response.code
+
+    assert await page() == 200
+    assert executors._thread_pool is not None and readers._SQLITE_POOL
+
+    extension._unload_jupyter_server_extension(jp_serverapp)
+    assert executors._thread_pool is None and executors._process_pool is None
+    assert readers._SQLITE_POOL == {}
+
+    assert await page() == 200
+    readers._cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Row views
+# ---------------------------------------------------------------------------
+
+
+async def test_later_pages_of_a_view_reuse_its_positions(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """Filters and sort run once per view, not once per page.
+
+    Every page of a filtered, sorted grid used to re-filter and re-sort the
+    whole table. The second and third pages, and the download of the same view,
+    must be served from the first page's positions - and must still continue
+    its ordering and match the rows it counted.
+    """
+    from jupyterlab_tabular_data_viewer_extension import views
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    shutil.copy(DATA_DIR / "sample_database.db", target_dir / "sample_database.db")
+
+    views._views_clear()
+    computed = []
+    real_put = views._view_put
+
+    # Every view computed is stored, whether the kernels or SQLite computed it
+    def counting_put(key, positions):
+        computed.append(key)
+        return real_put(key, positions)
+
+    monkeypatch.setattr(views, "_view_put", counting_put)
+
+    view = dict(
+        filters={"unit_price": {"type": "number", "operator": ">", "value": "20"}},
+        sortBy="unit_price",
+        sortOrder="desc",
+        # Irrelevant without a text filter, so it must not split the view
+        caseInsensitive=True,
+    )
+    first = await _sqlite_page(jp_fetch, offset=0, limit=5, **view)
+    view["caseInsensitive"] = False
+    second = await _sqlite_page(jp_fetch, offset=5, limit=5, **view)
+    every = await _sqlite_page(jp_fetch, offset=0, limit=1000, **view)
+    response, _, _ = await _download(
+        jp_fetch,
+        path="data/sample_database.db",
+        sheet="orders",
+        format="jsonl",
+        filters=json.dumps(view["filters"]),
+        sortBy="unit_price",
+        sortOrder="desc",
+    )
+
+    assert len(computed) == 1
+    assert first["totalRows"] == second["totalRows"] == every["totalRows"]
+    assert first["data"] + second["data"] == every["data"][:10]
+    prices = [row["unit_price"] for row in every["data"]]
+    assert prices == sorted(prices, reverse=True) and min(prices) > 20
+    exported = [json.loads(line) for line in response.body.decode().splitlines()]
+    assert [row["order_id"] for row in exported] == [
+        row["order_id"] for row in every["data"]
+    ]
+
+
+def test_a_view_is_not_served_for_an_edited_file(tmp_path):
+    """An edited file reads under a new key, so its old view can never answer.
+
+    The old version's views are dropped when the new one is stored rather than
+    left to age out of the budget.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    views._views_clear()
+    positive = {"n": {"type": "number", "operator": ">", "value": "0"}}
+    path = tmp_path / "t.csv"
+    path.write_text("n\n3\n1\n2\n")
+    key, table = readers.read_with_key(str(path))
+    before = views.row_view(key, table, positive, "n", "asc", False, False)
+    assert before.to_pylist() == [1, 2, 0]
+
+    path.write_text("n\n1\n9\n5\n7\n")
+    os.utime(path, ns=(1, 1))
+    key, table = readers.read_with_key(str(path))
+    after = views.row_view(key, table, positive, "n", "asc", False, False)
+
+    assert after.to_pylist() == [0, 2, 3, 1]
+    spec = ((("n", "number", "0", ">"),), ("n", "asc"), None)
+    assert list(views._VIEWS) == [(key, spec)]
+    assert views._VIEWS_BYTES == after.nbytes
+
+
+def test_toggling_the_sort_direction_does_not_sort_again(tmp_path, monkeypatch):
+    """The opposite direction, and a filter on top, reuse the cached permutation.
+
+    Both must be exactly the stable sort they replace: equal values in file
+    order, NaN and empty cells last in either direction.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    path = tmp_path / "t.csv"
+    path.write_text("n,k\n2,a\n,b\n1,c\nnan,d\n2,e\n1,f\n3,g\n,h\n2,i\n")
+    key, table = readers.read_with_key(str(path))
+    expected = {
+        order: views._sort_indices(table, "n", order).to_pylist()
+        for order in ("asc", "desc")
+    }
+    big = {"n": {"type": "number", "operator": ">=", "value": "2"}}
+    expected_big = [i for i in expected["desc"] if i in (0, 4, 6, 8)]
+
+    ascending = views.row_view(key, table, {}, "n", "asc", False, False)
+
+    def no_sort(*args):
+        raise AssertionError("sorted again")
+
+    monkeypatch.setattr(views, "_sort_indices", no_sort)
+    descending = views.row_view(key, table, {}, "n", "desc", False, False)
+    filtered = views.row_view(key, table, big, "n", "desc", False, False)
+
+    assert ascending.to_pylist() == expected["asc"]
+    assert descending.to_pylist() == expected["desc"]
+    assert filtered.to_pylist() == expected_big
+    # Held on the table's read cache entry and counted with it, not as views
+    assert readers._CACHE_BYTES == (
+        table.nbytes + ascending.nbytes + descending.nbytes
+    )
+    spec = views.view_spec(table.column_names, big, "n", "desc", False, False)
+    assert list(views._VIEWS) == [(key, spec)]
+
+
+def test_sort_permutations_leave_the_cache_with_their_table(tmp_path, monkeypatch):
+    """Evicting a table takes its permutations and their bytes with it."""
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    first.write_text("n\n3\n1\n2\n")
+    second.write_text("n\n5\n4\n")
+    key, table = readers.read_with_key(str(first))
+    permutation = views.row_view(key, table, {}, "n", "asc", False, False)
+    assert readers.cached_derived(key, ("sort", "n", "asc")) is permutation
+
+    # Ranked as cheap as the second will be: a process's first csv read pays
+    # polars' warm-up, which would otherwise make the first table the keeper
+    readers._CACHE_COST[key][2] = 0.0
+    # Room for the second table, but not beside the first and its permutation
+    monkeypatch.setattr(
+        readers, "_CACHE_MAX_BYTES", table.nbytes + permutation.nbytes + 1
+    )
+    other_key, other = readers.read_with_key(str(second))
+
+    assert list(readers._CACHE) == [other_key]
+    assert readers.cached_derived(key, ("sort", "n", "asc")) is None
+    assert readers._CACHE_BYTES == other.nbytes
+
+
+def test_a_selected_first_page_is_the_head_of_the_full_sort(monkeypatch):
+    """Selection gives exactly the rows the stable sort would put first.
+
+    Including where the page boundary falls inside a run of equal values, whose
+    rows must still come in file order, and with NaN and null keys present.
+    """
+    import pyarrow as pa
+
+    from jupyterlab_tabular_data_viewer_extension import views
+
+    rows = 2000
+    table = pa.table(
+        {
+            "f": [
+                None if i % 11 == 0 else float("nan") if i % 13 == 0 else i % 7
+                for i in range(rows)
+            ],
+            "t": [str((i * 37) % 50) for i in range(rows)],
+            "w": [f"w{i % 5}" for i in range(rows)],
+        }
+    )
+    cases = [
+        (sort_by, order, filters)
+        for sort_by in ("f", "t", "w")
+        for order in ("asc", "desc")
+        for filters in ({}, {"w": {"type": "text", "value": "w3"}})
+    ]
+    expected = [
+        views.row_view(None, table, filters, sort_by, order, False, False)
+        for sort_by, order, filters in cases
+    ]
+
+    def no_sort(*args):
+        raise AssertionError("sorted every row")
+
+    monkeypatch.setattr(views, "_sort_indices", no_sort)
+    for case, whole in zip(cases, expected):
+        sort_by, order, filters = case
+        positions, total = views.page_view(
+            None, table, filters, sort_by, order, False, False, 25
+        )
+        assert total == len(whole), case
+        assert positions.to_pylist()[:25] == whole.to_pylist()[:25], case
+
+
+async def test_early_sorted_pages_select_and_deeper_ones_sort(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """Pages near the top of a fresh sort come from one cached selection.
+
+    A page past `_TOP_K_FRACTION` of the rows computes the whole view, and the
+    pages agree with each other wherever they meet.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    # Eight row groups, so the view comes from the parquet scan, not the cache
+    monkeypatch.setattr(readers, "_PARQUET_CACHE_MAX_GROUPS", 4)
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    rows = 2000
+    pq.write_table(
+        pa.table({"n": [(i * 7919) % 300 for i in range(rows)]}),
+        target_dir / "sorted.parquet",
+        row_group_size=256,
+    )
+    selections, sorts = [], []
+    real_prefix, real_compute = views._compute_prefix, views._compute_view
+
+    def counting_prefix(table, spec, count):
+        selections.append(count)
+        return real_prefix(table, spec, count)
+
+    def counting_compute(table, spec, read_key=None):
+        sorts.append(spec)
+        return real_compute(table, spec, read_key)
+
+    monkeypatch.setattr(views, "_compute_prefix", counting_prefix)
+    monkeypatch.setattr(views, "_compute_view", counting_compute)
+
+    async def page(offset, limit=20):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(
+                {
+                    "path": "data/sorted.parquet",
+                    "offset": offset,
+                    "limit": limit,
+                    "sortBy": "n",
+                    "sortOrder": "desc",
+                }
+            ),
+        )
+        return json.loads(response.body)
+
+    first, second = await page(0), await page(20)
+    assert (selections, sorts) == ([20 * views._TOP_K_PAGES_AHEAD], [])
+    deep = await page(0, limit=1000)
+    assert len(sorts) == 1
+
+    assert first["totalRows"] == second["totalRows"] == deep["totalRows"] == rows
+    assert first["data"] + second["data"] == deep["data"][:40]
+    values = [row["n"] for row in deep["data"]]
+    assert values == sorted(values, reverse=True)
+    ties = [row["__row_index__"] for row in deep["data"] if row["n"] == values[0]]
+    assert ties == sorted(ties)
+
+
+async def test_download_applies_a_numeric_filter_the_grid_applies(
+    jp_fetch, jp_root_dir
+):
+    """The export of a filtered view holds exactly the rows the grid counted.
+
+    The download kept its own copy of the filter loop, which compared numbers
+    against a bare float: on a uint64 column the kernel refused, the refusal
+    was caught as a non-numeric entry, and the `_filtered` export carried the
+    whole table while the grid showed one row.
+    """
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    (target_dir / "ids.csv").write_text(
+        "id,who\n9223372036854775808,big\n12,small\n7,tiny\n"
+    )
+
+    response, filename, _ = await _download(
+        jp_fetch,
+        path="data/ids.csv",
+        format="csv",
+        filters=json.dumps({"id": {"type": "number", "operator": ">", "value": "100"}}),
+    )
+
+    assert response.code == 200
+    assert filename == "ids_filtered.csv"
+    assert response.body.decode().splitlines() == ["id,who", "9223372036854775808,big"]
+
+
+# ---------------------------------------------------------------------------
+# Parquet browse pages
+# ---------------------------------------------------------------------------
+
+
+def _row_group_parquet(path, rows=95, row_group_size=10):
+    """A parquet of `rows` rows in groups of `row_group_size`, with a null column."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table(
+        {
+            "n": pa.array(range(rows), pa.int64()),
+            "label": [f"row {i}" for i in range(rows)],
+            "nothing": pa.nulls(rows),
+        }
+    )
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+
+async def test_parquet_browse_page_decodes_only_its_row_groups(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """An unfiltered, unsorted page of a parquet too big to cache never reads it whole.
+
+    The page spans two row groups and must be cut from exactly those, numbered
+    from the file's first row, and typed as the whole-table read types it - the
+    all-null column included. A whole-table read would raise here.
+    """
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    # Ten row groups: more than the cache path takes, so the page is windowed
+    monkeypatch.setattr(readers, "_PARQUET_CACHE_MAX_GROUPS", 5)
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _row_group_parquet(target_dir / "groups.parquet")
+
+    decoded = []
+    real_read_row_groups = pq.ParquetFile.read_row_groups
+
+    def recording_read_row_groups(self, row_groups, *args, **kwargs):
+        decoded.append(list(row_groups))
+        return real_read_row_groups(self, row_groups, *args, **kwargs)
+
+    def no_whole_read(*args):
+        raise AssertionError("browse page read the whole file")
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", recording_read_row_groups)
+    monkeypatch.setattr(readers, "_read", no_whole_read)
+
+    response = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "data",
+        method="POST",
+        body=json.dumps({"path": "data/groups.parquet", "offset": 15, "limit": 10}),
+    )
+    payload = json.loads(response.body)
+
+    assert decoded == [[1, 2]]
+    assert payload["totalRows"] == 95
+    assert payload["hasMore"] is True
+    assert [row["n"] for row in payload["data"]] == list(range(15, 25))
+    assert [row["__row_index__"] for row in payload["data"]] == list(range(16, 26))
+    assert all(row["nothing"] is None for row in payload["data"])
+
+    last = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "data",
+        method="POST",
+        body=json.dumps({"path": "data/groups.parquet", "offset": 90, "limit": 10}),
+    )
+    last = json.loads(last.body)
+    assert [row["n"] for row in last["data"]] == list(range(90, 95))
+    assert last["hasMore"] is False
+
+
+async def test_parquet_that_fits_the_cache_is_decoded_once_for_two_pages(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """Scrolling a parquet the cache can hold reads it whole once, then pages it.
+
+    Reading each page from its row groups decoded them again on every scroll;
+    the second page must come from the cached table without touching the file.
+    """
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _row_group_parquet(target_dir / "groups.parquet")
+
+    decodes = []
+    real_read_table = pq.read_table
+    real_read_row_groups = pq.ParquetFile.read_row_groups
+
+    def recording_read_table(source, *args, **kwargs):
+        decodes.append("whole")
+        return real_read_table(source, *args, **kwargs)
+
+    def recording_read_row_groups(self, row_groups, *args, **kwargs):
+        decodes.append(list(row_groups))
+        return real_read_row_groups(self, row_groups, *args, **kwargs)
+
+    monkeypatch.setattr(pq, "read_table", recording_read_table)
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", recording_read_row_groups)
+
+    pages = []
+    for offset in (0, 10):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(
+                {"path": "data/groups.parquet", "offset": offset, "limit": 10}
+            ),
+        )
+        pages.append(json.loads(response.body))
+
+    assert decodes == ["whole"]
+    assert [row["n"] for row in pages[1]["data"]] == list(range(10, 20))
+    assert [row["__row_index__"] for row in pages[1]["data"]] == list(range(11, 21))
+    assert pages[1]["totalRows"] == 95
+
+
+async def test_sorted_pages_of_a_parquet_that_fits_the_cache_decode_it_once(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """A filtered, sorted page of a cacheable parquet is paged from the cache.
+
+    Reading each such page's rows by position decoded every row group holding
+    one of them, for every page.
+    """
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _row_group_parquet(target_dir / "groups.parquet")
+
+    decodes = []
+    real_read_table = pq.read_table
+
+    def recording_read_table(source, *args, **kwargs):
+        decodes.append(kwargs.get("columns"))
+        return real_read_table(source, *args, **kwargs)
+
+    def no_row_groups(*args, **kwargs):
+        raise AssertionError("page decoded row groups")
+
+    monkeypatch.setattr(pq, "read_table", recording_read_table)
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", no_row_groups)
+
+    pages = []
+    for offset in (0, 5):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(
+                {
+                    "path": "data/groups.parquet",
+                    "offset": offset,
+                    "limit": 5,
+                    "filters": {
+                        "n": {"type": "number", "operator": ">", "value": "72"}
+                    },
+                    "sortBy": "n",
+                    "sortOrder": "desc",
+                }
+            ),
+        )
+        pages.append(json.loads(response.body))
+
+    assert decodes == [None]
+    assert [row["n"] for row in pages[1]["data"]] == [89, 88, 87, 86, 85]
+    assert pages[1]["totalRows"] == 22
+
+
+def test_parquet_window_matches_the_whole_table_read(tmp_path):
+    """A window is the same rows, in the same types, as a slice of the full read.
+
+    Past the last row it is empty but keeps the file's columns; and once the
+    whole table is cached the window is cut from it instead of the file.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    path = str(tmp_path / "groups.parquet")
+    _row_group_parquet(path)
+
+    window, total = readers.read_parquet_window(path, 37, 20)
+    whole = readers._read_uncached(path, None)
+    assert total == 95
+    assert window.equals(whole.slice(37, 20))
+
+    empty, total = readers.read_parquet_window(path, 200, 20)
+    assert total == 95 and empty.num_rows == 0
+    assert empty.schema == whole.schema
+
+    cached = readers.read_as_arrow_table(path)
+    window, _ = readers.read_parquet_window(path, 0, 5)
+    assert window.column("n").chunks[0].buffers()[1].address == (
+        cached.column("n").chunks[0].buffers()[1].address
+    )
+
+
+async def test_parquet_filter_reads_only_its_columns_and_matching_groups(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """A filtered, sorted page of an uncacheable parquet comes from a pruned scan.
+
+    `n > 72` can only match the last three row groups, so the scan must skip the
+    other seven on their statistics and read just the filter and sort columns;
+    the page then reads its rows, and the next pages' rows, by position. The
+    answer must be the one the in-memory path gives once the whole table is
+    cached.
+    """
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    monkeypatch.setattr(readers, "_PARQUET_CACHE_MAX_GROUPS", 5)
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _row_group_parquet(target_dir / "groups.parquet")
+
+    scans = []
+    real_read_row_groups = pq.ParquetFile.read_row_groups
+
+    def recording_read_row_groups(self, row_groups, columns=None, **kwargs):
+        scans.append((list(row_groups), columns))
+        return real_read_row_groups(self, row_groups, columns=columns, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", recording_read_row_groups)
+
+    request = {
+        "path": "data/groups.parquet",
+        "offset": 2,
+        "limit": 5,
+        "filters": {
+            "n": {"type": "number", "operator": ">", "value": "72"},
+            "label": {"type": "text", "value": "ROW"},
+        },
+        "caseInsensitive": True,
+        "sortBy": "label",
+        "sortOrder": "desc",
+    }
+
+    async def page():
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(request),
+        )
+        return json.loads(response.body)
+
+    pushed = await page()
+    assert scans[0] == ([7, 8, 9], ["n", "label"])
+    # The page's rows and the next pages' in one read
+    assert scans[1:] == [([7, 8, 9], None)]
+
+    # ... so the next page decodes nothing
+    request["offset"] = 7
+    following = await page()
+    assert len(scans) == 2
+    assert [row["n"] for row in following["data"]] == [87, 86, 85, 84, 83]
+    request["offset"] = 2
+
+    readers.read_as_arrow_table(str(target_dir / "groups.parquet"))
+    views._views_clear()
+    in_memory = await page()
+
+    assert pushed == in_memory
+    assert pushed["totalRows"] == 22
+    assert [row["n"] for row in pushed["data"]] == [92, 91, 90, 89, 88]
+    assert [row["__row_index__"] for row in pushed["data"]] == [93, 92, 91, 90, 89]
+
+
+async def test_statistics_on_parquet_read_only_their_column(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """Statistics and unique values decode one column, not the whole file."""
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _row_group_parquet(target_dir / "groups.parquet")
+
+    requested = []
+    real_read_table = pq.read_table
+
+    def recording_read_table(source, columns=None, **kwargs):
+        requested.append(columns)
+        return real_read_table(source, columns=columns, **kwargs)
+
+    monkeypatch.setattr(pq, "read_table", recording_read_table)
+
+    for endpoint in ("column-stats", "unique-values"):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            endpoint,
+            method="POST",
+            body=json.dumps({"path": "data/groups.parquet", "columnName": "label"}),
+        )
+        assert response.code == 200
+    assert requested == [["label"], ["label"]]
+
+    with pytest.raises(Exception) as missing:
+        await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "column-stats",
+            method="POST",
+            body=json.dumps({"path": "data/groups.parquet", "columnName": "absent"}),
+        )
+    assert missing.value.code == 400
+
+
+# ---------------------------------------------------------------------------
+# Quick statistics from the parquet footer
+# ---------------------------------------------------------------------------
+
+
+async def test_quick_statistics_agree_with_the_full_scan(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """What the footer answers must be what the full statistics say.
+
+    Asked for with every page decode made to fail, so an answer proves the
+    footer alone produced it. Columns the footer has no range for - text, all
+    null - still get their null counts; every quick answer is marked partial.
+    """
+    import datetime as dt
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    table = pa.table(
+        {
+            "i": pa.array([5, None, -3, 12, None], pa.int64()),
+            "f": [1.5, float("nan"), None, -2.25, 8.0],
+            "d": [dt.date(2021, 3, 1), None, dt.date(2020, 1, 1), None, None],
+            "ts": pa.array(
+                [dt.datetime(2020, 5, 1, 12), None, None, dt.datetime(2019, 1, 1), None],
+                pa.timestamp("us"),
+            ),
+            "s": ["b", None, "a", "c", None],
+            "nothing": pa.nulls(5),
+        }
+    )
+    pq.write_table(table, target_dir / "footer.parquet", row_group_size=2)
+
+    async def stats(column, quick):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "column-stats",
+            method="POST",
+            body=json.dumps(
+                {"path": "data/footer.parquet", "columnName": column, "quick": quick}
+            ),
+        )
+        return json.loads(response.body)
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("quick statistics decoded the file")
+
+    quick = {}
+    with monkeypatch.context() as patched:
+        patched.setattr(pq, "read_table", no_decode)
+        patched.setattr(pq.ParquetFile, "read_row_groups", no_decode)
+        for column in table.column_names:
+            quick[column] = await stats(column, True)
+
+    for column, answer in quick.items():
+        full = await stats(column, False)
+        assert answer.pop("partial") is True
+        assert "partial" not in full
+        assert answer == {key: full[key] for key in answer}, column
+    assert set(quick["i"]) >= {"min_value", "max_value", "null_count"}
+    assert set(quick["ts"]) >= {"earliest_date", "latest_date", "date_range_days"}
+    assert "min_value" not in quick["s"]
+
+
+async def test_quick_statistics_fall_back_to_the_full_scan(jp_fetch, jp_root_dir):
+    """A source with no footer answers `quick` with the full statistics."""
+    metadata = await _metadata(jp_fetch, jp_root_dir, "sample_data.csv")
+    column = metadata["columns"][0]["name"]
+    response = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "column-stats",
+        method="POST",
+        body=json.dumps(
+            {"path": "data/sample_data.csv", "columnName": column, "quick": True}
+        ),
+    )
+    payload = json.loads(response.body)
+
+    assert "partial" not in payload
+    assert "unique_count" in payload
+
+
+# ---------------------------------------------------------------------------
+# Page serialization
+# ---------------------------------------------------------------------------
+
+
+def _every_wire_type_table():
+    """One column per arrow type the serializer has a rule for, with edge values."""
+    import datetime as dt
+    from decimal import Decimal
+
+    import pyarrow as pa
+
+    when = [dt.datetime(2020, 1, 1, 1, 2, 3, 4500), dt.datetime(1960, 5, 5), None]
+    return pa.table(
+        {
+            "i64": pa.array([2**53 + 1, -(2**53) - 1, None], pa.int64()),
+            "u64": pa.array([2**63, 2**53, None], pa.uint64()),
+            "i8": pa.array([-128, 127, None], pa.int8()),
+            "f64": [1.25, float("nan"), float("-inf")],
+            "f32": pa.array([0.1, None, float("inf")], pa.float32()),
+            "dec": pa.array([Decimal("1.10"), None, Decimal("-3.333")]),
+            "bool": [True, None, False],
+            "str": ["a", None, "ü"],
+            "large": pa.array(["x", "y", None], pa.large_string()),
+            "dict": pa.array(["p", None, "p"]).dictionary_encode(),
+            "bin": [b"ok", b"\xff\xfe", None],
+            "date": [dt.date(2021, 2, 3), None, dt.date(1, 1, 1)],
+            "ts": pa.array(when, pa.timestamp("us")),
+            "ts_ms": pa.array(when, pa.timestamp("ms")),
+            "ts_tz": pa.array(when, pa.timestamp("us", tz="America/New_York")),
+            "ts_ns": pa.array(when, pa.timestamp("ns", tz="UTC")),
+            "list": [[1, 2], None, []],
+            "struct": [{"a": 1}, None, {"a": None}],
+            "nothing": pa.nulls(3),
+        }
+    )
+
+
+def test_column_serializer_matches_the_per_cell_conversion():
+    """Every column converts to exactly what the per-cell loop produced."""
+    from jupyterlab_tabular_data_viewer_extension.serialize import (
+        column_values,
+        convert_to_json_serializable,
+    )
+
+    table = _every_wire_type_table()
+    for name in table.column_names:
+        column = table.column(name)
+        per_cell = [convert_to_json_serializable(column[i].as_py()) for i in range(3)]
+        assert column_values(column) == per_cell, name
+
+
+async def test_columnar_page_carries_the_rows_of_the_row_layout(jp_fetch, jp_root_dir):
+    """The two layouts are one page: same values, same row indices, same totals."""
+    import pyarrow.parquet as pq
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    pq.write_table(_every_wire_type_table(), target_dir / "wire.parquet")
+
+    async def page(**extra):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(
+                {"path": "data/wire.parquet", "offset": 1, "limit": 5, **extra}
+            ),
+        )
+        return json.loads(response.body)
+
+    rows = await page()
+    columnar = await page(layout="columns")
+
+    assert columnar["layout"] == "columns"
+    assert columnar["rowIndex"] == [row["__row_index__"] for row in rows["data"]]
+    assert {
+        key: columnar[key] for key in ("offset", "limit", "totalRows", "hasMore")
+    } == {key: rows[key] for key in ("offset", "limit", "totalRows", "hasMore")}
+    for name, values in columnar["columns"].items():
+        assert values == [row[name] for row in rows["data"]], name
+
+
+async def test_arrow_page_is_the_json_page_with_exact_integers(jp_fetch, jp_root_dir):
+    """The IPC variant carries the same rows, row indices and page fields.
+
+    Integers a double cannot hold arrive as themselves, not as the strings the
+    JSON layouts substitute; everything else matches the row layout once
+    serialized the same way.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from jupyterlab_tabular_data_viewer_extension.serialize import column_values
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    source = _every_wire_type_table()
+    pq.write_table(source, target_dir / "wire.parquet")
+    request = {
+        "path": "data/wire.parquet",
+        "offset": 0,
+        "limit": 2,
+        "sortBy": "i8",
+        "sortOrder": "desc",
+    }
+
+    response = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "data",
+        "arrow",
+        method="POST",
+        body=json.dumps(request),
+    )
+    rows = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "data",
+        method="POST",
+        body=json.dumps(request),
+    )
+    rows = json.loads(rows.body)
+
+    assert response.headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+    page = pa.ipc.open_stream(response.body).read_all()
+    fields = {
+        key.decode(): json.loads(value) for key, value in page.schema.metadata.items()
+    }
+    assert fields == {"offset": 0, "limit": 2, "totalRows": 3, "hasMore": True}
+    assert page.column("__row_index__").to_pylist() == [2, 1]
+    assert page.column("u64").to_pylist() == [2**53, 2**63]
+    # Only the types src/arrow.ts decodes go on the wire
+    assert {str(field.type) for field in page.schema} <= {
+        "null", "bool", "int8", "int64", "uint64", "float", "double", "string"
+    }
+    for name in source.column_names:
+        assert column_values(page.column(name)) == [
+            row[name] for row in rows["data"]
+        ], name
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+
+def test_configure_evicts_to_a_smaller_budget_and_caps_one_table(monkeypatch):
+    """A budget cut applies at once; a table over the per-table cap is not kept."""
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    monkeypatch.setattr(readers, "_CACHE_MAX_BYTES", 1000)
+    monkeypatch.setattr(readers, "_TABLE_MAX_BYTES", 0)
+    first, second, big = (("/" + name, None, 0, 0, (0, 0)) for name in "fsb")
+    readers._cache_put(first, _sized(100), seconds=1.0)
+    readers._cache_put(second, _sized(100), seconds=1.0)
+
+    readers.configure(cache_max_bytes=150)
+    assert len(readers._CACHE) == 1
+    assert readers._CACHE_BYTES == 100
+
+    readers.configure(cache_max_bytes=1000, table_max_bytes=200)
+    assert not readers._cache_put(big, _sized(300), seconds=60.0)
+    assert big not in readers._CACHE
+
+    with pytest.raises(ValueError):
+        readers.configure(max_concurrent_reads=-1)
+    readers._cache_clear()
+
+
+def test_read_slots_bound_the_reads_running_at_once(monkeypatch):
+    """With one slot a second read waits until the first has finished."""
+    import threading
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    monkeypatch.setattr(readers, "_MAX_CONCURRENT_READS", 1)
+    inside = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def read(name, hold):
+        with readers._read_slot():
+            order.append(name)
+            if hold:
+                inside.set()
+                release.wait(10)
+
+    first = threading.Thread(target=read, args=("first", True))
+    second = threading.Thread(target=read, args=("second", False))
+    first.start()
+    assert inside.wait(10)
+    second.start()
+    second.join(0.2)
+    assert second.is_alive(), "the second read ran while the only slot was held"
+    release.set()
+    first.join(10)
+    second.join(10)
+    assert order == ["first", "second"]
+    assert readers._READS_RUNNING == 0
+
+
+def test_default_polars_threads_keep_the_servers_environment(monkeypatch):
+    """polars_threads = 0 leaves POLARS_MAX_THREADS as the server started with it.
+
+    Building the config applies every trait, and applying the default used to
+    delete the operator's variable - and replace the Excel pool for it. A value
+    set later and then cleared puts the inherited variable back.
+    """
+    from jupyterlab_tabular_data_viewer_extension import executors
+    from jupyterlab_tabular_data_viewer_extension.config import TabularDataViewerConfig
+
+    recycled = []
+    monkeypatch.setattr(executors, "recycle_process_pool", lambda: recycled.append(1))
+    monkeypatch.setenv("POLARS_MAX_THREADS", "3")
+
+    config = TabularDataViewerConfig()
+    assert os.environ["POLARS_MAX_THREADS"] == "3"
+    assert recycled == []
+
+    config.polars_threads = 5
+    assert os.environ["POLARS_MAX_THREADS"] == "5"
+    config.polars_threads = 0
+    assert os.environ["POLARS_MAX_THREADS"] == "3"
+    assert len(recycled) == 2
+
+    monkeypatch.delenv("POLARS_MAX_THREADS")
+    config = TabularDataViewerConfig(polars_threads=2)
+    assert os.environ["POLARS_MAX_THREADS"] == "2"
+    config.polars_threads = 0
+    assert "POLARS_MAX_THREADS" not in os.environ
+
+
+async def test_admin_config_reads_and_changes_the_running_limits(jp_fetch):
+    """GET answers the settings; POST applies them all or, on a bad one, none."""
+    from tornado.httpclient import HTTPClientError
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    async def call(method="GET", **changes):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "admin",
+            "config",
+            method=method,
+            body=json.dumps(changes) if method != "GET" else None,
+        )
+        return json.loads(response.body)
+
+    before = await call()
+    assert before["cache_max_bytes"] == readers._CACHE_MAX_BYTES
+    assert {"thread_workers", "spill_dir", "max_concurrent_reads"} <= set(before)
+
+    try:
+        after = await call(
+            "POST", cache_max_bytes=64 * 1024 * 1024, max_concurrent_reads=3
+        )
+        assert after["cache_max_bytes"] == 64 * 1024 * 1024
+        assert readers._CACHE_MAX_BYTES == 64 * 1024 * 1024
+        assert readers._MAX_CONCURRENT_READS == 3
+
+        for bad in (
+            {"no_such_setting": 1},
+            {"cache_max_bytes": 1, "thread_workers": 0},
+        ):
+            with pytest.raises(HTTPClientError) as error:
+                await call("POST", **bad)
+            assert error.value.code == 400
+        assert readers._CACHE_MAX_BYTES == 64 * 1024 * 1024, (
+            "a rejected request still changed a setting"
+        )
+    finally:
+        await call(
+            "POST",
+            cache_max_bytes=before["cache_max_bytes"],
+            max_concurrent_reads=before["max_concurrent_reads"],
+        )
+    assert readers._CACHE_MAX_BYTES == before["cache_max_bytes"]
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+async def test_metrics_count_cache_traffic_and_time_reads(jp_fetch, jp_root_dir):
+    """A miss then a hit on one file shows in the counters, timings and gauges."""
+    from jupyterlab_tabular_data_viewer_extension import metrics, readers
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    shutil.copy(DATA_DIR / "sample_data.csv", target_dir / "sample_data.csv")
+    readers._cache_clear()
+    metrics._reset()
+
+    for _ in range(2):
+        await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps({"path": "data/sample_data.csv", "offset": 0, "limit": 5}),
+        )
+    response = await jp_fetch("jupyterlab-tabular-data-viewer-extension", "metrics")
+    snap = json.loads(response.body)
+
+    assert snap["counters"]["cache_misses"] == 1
+    assert snap["counters"]["cache_hits"] == 1
+    assert snap["reads"]["csv"]["count"] == 1
+    assert snap["requests"]["ParquetDataHandler"]["count"] == 2
+    assert snap["requests"]["ParquetDataHandler"]["quantiles"]["0.5"] > 0
+    assert snap["gauges"]["cache_entries"] == 1
+    assert snap["gauges"]["cache_bytes"] == readers._CACHE_BYTES
+    assert snap["gauges"]["reads_in_flight"] == 0
+    readers._cache_clear()
+
+
+async def test_metrics_in_prometheus_text_format(jp_fetch):
+    """Every family is declared, and the read histogram ends at +Inf."""
+    from jupyterlab_tabular_data_viewer_extension import metrics
+
+    metrics._reset()
+    metrics.count("cache_evictions", 3)
+    metrics.observe_read("excel", 12.0)
+    metrics.observe_request("ParquetDataHandler", 0.02)
+
+    response = await jp_fetch(
+        "jupyterlab-tabular-data-viewer-extension",
+        "metrics",
+        params={"format": "prometheus"},
+    )
+    text = response.body.decode()
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    prefix = "jupyterlab_tabular_data_viewer_"
+    lines = text.splitlines()
+    assert f"# TYPE {prefix}cache_evictions_total counter" in lines
+    assert f"{prefix}cache_evictions_total 3" in lines
+    assert f"# TYPE {prefix}cache_bytes gauge" in lines
+    assert f'{prefix}read_seconds_bucket{{format="excel",le="10.0"}} 0' in lines
+    assert f'{prefix}read_seconds_bucket{{format="excel",le="30.0"}} 1' in lines
+    assert f'{prefix}read_seconds_bucket{{format="excel",le="+Inf"}} 1' in lines
+    assert (
+        f'{prefix}request_seconds{{handler="ParquetDataHandler",quantile="0.99"}} 0.02'
+        in lines
+    )
+    # Every sample belongs to a declared family
+    declared = {line.split()[2] for line in lines if line.startswith("# TYPE")}
+    for line in lines:
+        if not line.startswith("#"):
+            name = line.split("{")[0].split()[0]
+            assert any(name == d or name.startswith(d + "_") for d in declared), line
+
+    metrics._reset()
+
+
+def test_nested_phases_are_charged_exclusively():
+    """An inner phase pauses the outer one, so nothing is counted twice."""
+    import time
+
+    from jupyterlab_tabular_data_viewer_extension import metrics
+
+    timings = metrics.RequestTimings()
+    timings.enter("stats")
+    time.sleep(0.02)
+    timings.enter("read")
+    time.sleep(0.05)
+    timings.exit()
+    timings.exit()
+
+    assert timings.phases["read"] >= 0.05
+    # Charged inclusively, stats would hold the read's 50 ms as well
+    assert 0.02 <= timings.phases["stats"] < timings.phases["read"]
+    timings.note_cache("hit")
+    timings.note_cache("miss")
+    timings.note_cache("hit")
+    assert timings.cache == "miss"
+
+
+async def test_server_timing_header_breaks_down_each_response(
+    jp_fetch, jp_root_dir, jp_serverapp, caplog
+):
+    """The header names the phases that ran and the cache's outcome."""
+    import logging
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    shutil.copy(DATA_DIR / "sample_data.csv", target_dir / "sample_data.csv")
+    readers._cache_clear()
+    config = jp_serverapp.web_app.settings["tabular_data_viewer_config"]
+    config.log_timings = True
+
+    def phases(response):
+        entries = [e.strip() for e in response.headers["Server-Timing"].split(",")]
+        return {e.split(";")[0]: e.split(";", 1)[1] for e in entries}
+
+    async def page():
+        return await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            "data",
+            method="POST",
+            body=json.dumps(
+                {
+                    "path": "data/sample_data.csv",
+                    "offset": 0,
+                    "limit": 5,
+                    "sortBy": "age",
+                    "filters": {"age": {"type": "number", "value": 0, "operator": ">"}},
+                }
+            ),
+        )
+
+    try:
+        with caplog.at_level(logging.INFO):
+            first = phases(await page())
+            second = phases(await page())
+    finally:
+        config.log_timings = False
+        readers._cache_clear()
+
+    assert {"read", "filter", "sort", "serialize", "total"} <= set(first)
+    assert first["cache"] == 'desc="miss"'
+    assert second["cache"] == 'desc="hit"'
+    assert all(v.startswith("dur=") for k, v in first.items() if k != "cache")
+    logged = [
+        json.loads(r.getMessage().split(" ", 2)[2])
+        for r in caplog.records
+        if r.getMessage().startswith("tabular-data-viewer timing")
+    ]
+    assert [entry["cache"] for entry in logged][-2:] == ["miss", "hit"]
+    assert logged[-1]["handler"] == "ParquetDataHandler"
+
+
+# ---------------------------------------------------------------------------
+# Benchmark data
+# ---------------------------------------------------------------------------
+
+
+def test_benchmark_files_read_alike_in_every_format(tmp_path, monkeypatch):
+    """The generated table reads back with the same shape from every format.
+
+    `code` has its first string at row 150, past a 100-row inference window,
+    so every reader must type it as text - the regression the benchmark tiers
+    are large enough to catch and the committed fixtures are not.
+    """
+    import importlib.util
+
+    import pyarrow as pa
+
+    from jupyterlab_tabular_data_viewer_extension import executors, readers
+
+    spec = importlib.util.spec_from_file_location(
+        "make_sample_database",
+        Path(__file__).parent.parent.parent / "scripts" / "make_sample_database.py",
+    )
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+
+    paths = generator.build_benchmark_files(str(tmp_path), 1200)
+    assert set(paths) == set(generator.BENCHMARK_FORMATS)
+    monkeypatch.setattr(executors, "_process_workers", 0)
+    for fmt, path in paths.items():
+        table = readers.read_as_arrow_table(path)
+        assert table.shape == (1200, 7), fmt
+        assert pa.types.is_large_string(table.schema.field("code").type), fmt
+        assert table.column("code")[1150].as_py() == "pending", fmt
+        assert table.column("amount").null_count == 13, fmt
+
+    # Kept, not rewritten, when asked for again
+    before = {fmt: os.path.getmtime(p) for fmt, p in paths.items()}
+    generator.build_benchmark_files(str(tmp_path), 1200)
+    assert before == {fmt: os.path.getmtime(p) for fmt, p in paths.items()}
+    readers._cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Streaming xlsx engine
+# ---------------------------------------------------------------------------
+
+
+def _openpyxl_reference(path, sheet=None):
+    """A worksheet read the way `_read_excel` read it before `xlsx` existed.
+
+    Every row through openpyxl's `iter_rows`, then the same naming and typing,
+    so the streaming engine is checked against openpyxl's own reading.
+    """
+    import openpyxl
+    import polars as pl
+
+    from jupyterlab_tabular_data_viewer_extension.readers import (
+        _cast_unsupported_columns_to_string,
+        _column_series,
+        _header_names,
+        _null_marker_to_none,
+    )
+
+    with open(path, "rb") as handle:
+        book = openpyxl.load_workbook(
+            handle, read_only=True, data_only=True, keep_links=False
+        )
+        worksheet = book.worksheets[0] if sheet is None else book[sheet]
+        worksheet.reset_dimensions()
+        rows = list(worksheet.iter_rows(values_only=True))
+        book.close()
+    while len(rows) > 1 and all(v is None for v in rows[-1]):
+        rows.pop()
+    if not rows:
+        return pl.DataFrame().to_arrow()
+    header_row, data_rows = rows[0], rows[1:]
+    width = max(len(header_row), max((len(row) for row in data_rows), default=0))
+    columns = {}
+    for i, name in enumerate(_header_names(header_row, width)):
+        values = [
+            _null_marker_to_none(row[i] if i < len(row) else None) for row in data_rows
+        ]
+        columns[name] = _column_series(name, values)
+    return _cast_unsupported_columns_to_string(pl.DataFrame(columns)).to_arrow()
+
+
+def _assert_reads_like_openpyxl(path, sheet=None):
+    from jupyterlab_tabular_data_viewer_extension.readers import _read_excel
+
+    expected = _openpyxl_reference(str(path), sheet)
+    actual = _read_excel(str(path), sheet)
+    assert actual.schema == expected.schema
+    assert actual.to_pylist() == expected.to_pylist()
+
+
+def _kinds_workbook(path, date1904=False):
+    """A sheet of every value kind, typed across chunk boundaries when chunks are small."""
+    import datetime as dt
+
+    import openpyxl
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+    book = openpyxl.Workbook()
+    if date1904:
+        book.epoch = CALENDAR_MAC_1904
+    sheet = book.active
+    sheet.title = "Kinds"
+    sheet.append([
+        "int", "float", "widened", "late_text", "stamp", "clock", "elapsed",
+        "flag", "flag_or_int", "errors", "markers", "huge", None, "int", "    ",
+    ])
+    for i in range(30):
+        sheet.append([
+            i,
+            i + 0.25,
+            i if i % 3 else i / 2,
+            "late" if i == 27 else i,
+            dt.datetime(2024, 1, 1) + dt.timedelta(days=i, seconds=i),
+            dt.time(i % 24, 30),
+            dt.timedelta(hours=i, minutes=5),
+            bool(i % 2),
+            True if i == 13 else i,
+            "#DIV/0!" if i % 7 == 0 else float(i),
+            "NA" if i % 5 == 0 else f"label {i}",
+            2**70 + i if i == 29 else i,
+            None,
+            -i,
+            None if i % 4 else " ",
+        ])
+    sheet.cell(row=5, column=15).value = None
+    sheet.cell(row=40, column=2, value=1.5)
+    # Styled but empty, past the data in both directions: not a column, not a row
+    sheet.cell(row=45, column=20).number_format = "0.00"
+    sheet.cell(row=41, column=17).number_format = "yyyy-mm-dd"
+    extra = book.create_sheet("Extra")
+    extra.append(["only"])
+    extra.append(["=1+1"])
+    book.save(path)
+    return path
+
+
+@pytest.mark.parametrize("scanner", ["fast", "expat"])
+@pytest.mark.parametrize("chunk_shift", [2, 13])
+@pytest.mark.parametrize("date1904", [False, True])
+def test_xlsx_engine_reads_every_value_kind_as_openpyxl_did(
+    tmp_path, monkeypatch, scanner, chunk_shift, date1904
+):
+    """The streamed read matches openpyxl's, value for value and type for type.
+
+    Four-row chunks put every column's kind changes on chunk boundaries: a
+    column typed as one kind in early chunks and mixed in a later one must
+    still come out as text, as a Python list of every value would. Both
+    scanners are checked - the fast patterns, and expat, which reads whatever
+    the patterns do not cover.
+    """
+    from jupyterlab_tabular_data_viewer_extension import xlsx
+
+    monkeypatch.setattr(xlsx, "_CHUNK_SHIFT", chunk_shift)
+    monkeypatch.setattr(xlsx, "_CHUNK_ROWS", 1 << chunk_shift)
+    if scanner == "expat":
+        monkeypatch.setattr(xlsx, "_scan_fast", lambda *args: False)
+    path = _kinds_workbook(tmp_path / "kinds.xlsx", date1904=date1904)
+
+    _assert_reads_like_openpyxl(path)
+    _assert_reads_like_openpyxl(path, "Extra")
+
+
+_HAND_WRITTEN_SHEET = """<?xml version="1.0" encoding="UTF-8"?>
+<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<x:dimension ref="A1"/>
+<x:sheetData>
+<x:row r="1"><x:c r="A1" t="s"><x:v>0</x:v></x:c><x:c r="C1" t="inlineStr"><x:is><x:t>third</x:t></x:is></x:c><x:c t="str"><x:v>fourth</x:v></x:c></x:row>
+<x:row><x:c t="inlineStr"><x:is><x:r><x:t>ri</x:t></x:r><x:r><x:t>ch</x:t></x:r><x:rPh sb="0" eb="2"><x:t>yomi</x:t></x:rPh></x:is></x:c><x:c><x:v>2</x:v></x:c><x:c t="b"><x:v>1</x:v></x:c><x:c t="e"><x:v>#REF!</x:v></x:c></x:row>
+<x:row r="5"><x:c r="B5"><x:v>1E3</x:v></x:c><x:c r="A5" t="s"><x:v>1</x:v></x:c></x:row>
+<x:row r="4"><x:c r="A4" t="str"><x:v>skipped: numbered below its predecessor</x:v></x:c></x:row>
+<x:row r="7"><x:c r="D7" t="d"><x:v>2024-02-29T12:00:00</x:v></x:c><x:c r="E7" t="inlineStr"/><x:c r="F7" s="0"/></x:row>
+<x:row r="9"><x:c r="A9" t="str"><x:v>   </x:v></x:c></x:row>
+<x:row r="12"><x:c r="H12" t="str"><x:v>#N/A</x:v></x:c></x:row>
+<x:row r="13"><x:c r="J13"/></x:row>
+</x:sheetData>
+</x:worksheet>
+"""
+
+
+_FAST_LAYOUT_SHEET = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>\n"
+    '<row r="1" spans="1:4"><c r="A1" t="s"><v>0</v></c>'
+    '<c r="B1" t="inlineStr"><is><t xml:space="preserve"> padded </t></is></c>'
+    '<c r="C1" t="str"><v>a &amp; b</v></c></row>\n'
+    '<row r="2"><c r="A2" s="0"><f>1+1</f><v>2</v></c>'
+    '<c r="B2" t="inlineStr"><is><t>line&#10;break &lt;tag&gt;</t></is></c>'
+    '<c r="C2" t="str"><v>crlf\r\nend</v></c><c r="D2"><v></v></c></row>\n'
+    '<row r="3"/>\n'
+    '<row r="4"><c r="A4" t="e"><v>#N/A</v></c><c r="B4" t="inlineStr"><v>ignored</v></c>'
+    '<c r="C4" t="inlineStr"><is><t></t></is></c></row>\n'
+    '<row r="6"><c r="A6"><v>3.5</v></c><c r="C6" t="b"><v>0</v></c></row>\n'
+    "</sheetData></worksheet>"
+)
+
+
+def _workbook_with_sheet_xml(tmp_path, name, sheet_xml):
+    """An xlsxwriter workbook whose first sheet's XML is replaced by `sheet_xml`.
+
+    xlsxwriter, not openpyxl, for the base: it writes a shared string table,
+    holding "first" and "second".
+    """
+    import zipfile
+
+    import xlsxwriter
+
+    base = tmp_path / f"{name}-base.xlsx"
+    book = xlsxwriter.Workbook(str(base))
+    book.add_worksheet().write_row(0, 0, ["first", "second"])
+    book.close()
+    path = tmp_path / f"{name}.xlsx"
+    with zipfile.ZipFile(base) as source, zipfile.ZipFile(path, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = sheet_xml.encode()
+            target.writestr(item, data)
+    return path
+
+
+@pytest.mark.parametrize(
+    "label,sheet_xml,fast",
+    [
+        # Prefixed tags, rows and cells without references, a row numbered
+        # below its predecessor: only expat reads these
+        ("hand written", _HAND_WRITTEN_SHEET, False),
+        # Entities, line ends, formulas, empty and self-closing elements in
+        # the layout the fast patterns cover
+        ("fast layout", _FAST_LAYOUT_SHEET, True),
+    ],
+)
+def test_xlsx_engine_follows_openpyxl_on_hand_written_xml(
+    tmp_path, monkeypatch, label, sheet_xml, fast
+):
+    """Inline and rich strings, missing and out-of-order refs, escaped text.
+
+    Each is something some writer emits and openpyxl reads a particular way:
+    a row without `r` follows the previous one, a row numbered below its
+    predecessor is never yielded, a row is as long as its last cell so a cell
+    written after it in a higher column is dropped, phonetic text is not part
+    of a rich string's value, and text reads with its references replaced and
+    its line ends normalised, as an XML parser reports it.
+    """
+    from jupyterlab_tabular_data_viewer_extension import xlsx
+
+    scanned = []
+    scan_fast = xlsx._scan_fast
+
+    def spy(stream, root, *args):
+        result = scan_fast(stream, root, *args)
+        if root == "worksheet":
+            scanned.append(result)
+        return result
+
+    monkeypatch.setattr(xlsx, "_scan_fast", spy)
+    _assert_reads_like_openpyxl(_workbook_with_sheet_xml(tmp_path, "hand", sheet_xml))
+    assert scanned == [fast]
+
+
+def test_xlsx_engine_rejects_a_file_that_is_not_a_workbook(tmp_path):
+    """A non-zip or a zip without a workbook part is a ValueError, so a 400."""
+    import zipfile
+
+    from jupyterlab_tabular_data_viewer_extension.readers import _read_excel
+
+    text = tmp_path / "text.xlsx"
+    text.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError):
+        _read_excel(str(text))
+
+    empty = tmp_path / "empty.xlsx"
+    with zipfile.ZipFile(empty, "w") as archive:
+        archive.writestr("readme.txt", "nothing here")
+    with pytest.raises(ValueError):
+        _read_excel(str(empty))
+
+
+# ---------------------------------------------------------------------------
+# Whole-workbook reads
+# ---------------------------------------------------------------------------
+
+
+def _monthly_workbook(path):
+    import openpyxl
+
+    book = openpyxl.Workbook()
+    book.active.title = "Jan"
+    for title in ("Feb", "Mar"):
+        book.create_sheet(title)
+    for n, sheet in enumerate(book.worksheets):
+        sheet.append(["day", "amount"])
+        for day in range(1, 4):
+            sheet.append([day, day * (n + 1) * 1.5])
+    book.save(path)
+
+
+@pytest.fixture
+def workbook_passes(monkeypatch):
+    """The sheets of each `xlsx.read_sheets` call, reading in this process."""
+    from jupyterlab_tabular_data_viewer_extension import executors, readers, xlsx
+
+    passes = []
+    real = xlsx.read_sheets
+
+    def spy(file_path, sheets, nulls=frozenset()):
+        passes.append(list(sheets))
+        return real(file_path, sheets, nulls)
+
+    monkeypatch.setattr(xlsx, "read_sheets", spy)
+    monkeypatch.setattr(executors, "_process_workers", 0)
+    readers._cache_clear()
+    yield passes
+    readers.configure(excel_workbook_reads="off")
+    readers._cache_clear()
+
+
+def test_eager_workbook_read_caches_every_sheet_in_one_pass(tmp_path, workbook_passes):
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    path = str(tmp_path / "year.xlsx")
+    _monthly_workbook(path)
+    readers.configure(excel_workbook_reads="eager")
+
+    first = readers.read_as_arrow_table(path, "Feb")
+
+    assert workbook_passes == [["Feb", "Jan", "Mar"]]
+    for title in ("Jan", "Feb", "Mar"):
+        assert readers._cache_key(path, title) in readers._CACHE
+    assert first.column("amount").to_pylist() == [3.0, 6.0, 9.0]
+    # Every tab after the first is a hit, and reads as the sheet alone would
+    readers.configure(excel_workbook_reads="off")
+    for title in ("Jan", "Mar"):
+        expected = readers._read_excel(path, title)
+        assert readers.read_as_arrow_table(path, title) == expected
+    assert len(workbook_passes) == 3  # the two `_read_excel` calls above
+
+    # A read without a sheet is the first sheet's read, built and cached once
+    readers._cache_clear()
+    readers.configure(excel_workbook_reads="eager")
+    january = readers.read_as_arrow_table(path)
+    assert workbook_passes[3:] == [["Jan", "Feb", "Mar"]]
+    assert readers._cache_key(path, None) not in readers._CACHE
+    assert len(readers._CACHE) == 3
+    assert readers._CACHE_BYTES == sum(t.nbytes for t in readers._CACHE.values())
+    assert readers.read_as_arrow_table(path, "Jan") is january
+    assert len(workbook_passes) == 4
+
+
+def test_background_workbook_read_fills_the_other_sheets(tmp_path, workbook_passes):
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    path = str(tmp_path / "year.xlsx")
+    _monthly_workbook(path)
+    readers.configure(excel_workbook_reads="background")
+
+    readers.read_as_arrow_table(path, "Jan")
+    # Joins the background pass if it is still running, rather than reading
+    march = readers.read_as_arrow_table(path, "Mar")
+    readers.read_as_arrow_table(path, "Feb")
+
+    assert workbook_passes == [["Jan"], ["Feb", "Mar"]]
+    assert march.column("amount").to_pylist() == [4.5, 9.0, 13.5]
+    assert not readers._INFLIGHT
+    # Already cached: nothing to read ahead again
+    readers.read_as_arrow_table(path, "Jan")
+    assert len(workbook_passes) == 2
+
+    # A read without a sheet is the first sheet's, which is not read ahead again
+    readers._cache_clear()
+    january = readers.read_as_arrow_table(path)
+    readers.read_as_arrow_table(path, "Mar")
+    assert workbook_passes[2:] == [["Jan"], ["Feb", "Mar"]]
+    assert readers.read_as_arrow_table(path, "Jan") is january
+    assert len(workbook_passes) == 4
+
+
+def test_workbook_read_of_a_broken_file_reports_the_read_error(
+    tmp_path, workbook_passes
+):
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    path = tmp_path / "broken.xlsx"
+    path.write_text("not a zip")
+    readers.configure(excel_workbook_reads="eager")
+
+    with pytest.raises(ValueError, match="Cannot read excel file"):
+        readers.read_as_arrow_table(str(path))
+    assert not readers._INFLIGHT
+    with pytest.raises(ValueError, match="excel_workbook_reads"):
+        readers.configure(excel_workbook_reads="sometimes")
+
+
+# ---------------------------------------------------------------------------
+# Chunked delimited reads
+# ---------------------------------------------------------------------------
+
+
+_PIECEWISE_CSVS = {
+    # Integers for pieces, then a float: Float64, as one read types it
+    "widens to float": "n\n" + "1\n" * 40 + "2.5\n",
+    # A leading-zero id in an integer piece must come back as written
+    "widens to text": "id\n" + "007\n" * 40 + "x1\n",
+    "int128 beside int64": "n\n" + "5\n" * 40 + f"{2**64}\n",
+    # Three numeric types are String to full inference; the pieces cannot
+    # tell, so the file is read whole
+    "three numeric types": "n\n" + "-3\n" * 20 + ".5\n" * 20 + f"{2**63}\n",
+    "quoted newlines": 'a,b\n' + '"x\ny",1\n"p""q\n",2\n' * 20,
+    "duplicate and blank headers": "a,a,\n" + "1,,\n" * 30 + "2,x,3\n",
+    "blank lines": "a,b\n" + "1,2\n\n" * 20,
+    "no final newline": "a,b\n" + "1,2\n" * 30 + "3,4",
+    "latin1": "name,n\n" + "caf\xe9,1\n" * 30,
+    "ragged": "a,b\n" + "1,2\n" * 30 + "1,2,3\n",
+}
+
+
+@pytest.mark.parametrize("label", list(_PIECEWISE_CSVS))
+def test_chunked_csv_read_matches_a_whole_read(tmp_path, monkeypatch, label):
+    """However the file is cut, the table - or the error - is the whole read's."""
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    text = _PIECEWISE_CSVS[label]
+    path = tmp_path / "piecewise.csv"
+    path.write_bytes(text.encode("latin1" if label == "latin1" else "utf-8"))
+
+    def read(chunk_bytes):
+        monkeypatch.setattr(readers, "_CSV_CHUNK_BYTES", chunk_bytes)
+        try:
+            table = readers._read_uncached(str(path), None)
+        except ValueError as e:
+            return "error", str(e)
+        return table.schema, table.to_pylist()
+
+    whole = read(1 << 40)
+    for chunk_bytes in (8, 24, 64):
+        assert read(chunk_bytes) == whole, chunk_bytes
+
+
+def test_chunked_csv_read_reads_pieces_and_widens_them(tmp_path, monkeypatch):
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    path = tmp_path / "widening.csv"
+    path.write_text("id,amount\n" + "007,1\n" * 40 + "x1,2.5\n")
+    monkeypatch.setattr(readers, "_CSV_CHUNK_BYTES", 32)
+
+    df, encoding = readers._read_delimited_chunked(str(path), ",")
+
+    assert encoding == "utf8" and df.n_chunks() > 1
+    assert df.schema == {"id": readers.pl.String, "amount": readers.pl.Float64}
+    assert df["id"].to_list()[:2] == ["007", "007"]
+
+
+def test_record_bounds_never_cut_inside_quotes():
+    from jupyterlab_tabular_data_viewer_extension.readers import _record_bounds
+
+    data = b'h,"x\ny"\n' + b'1,"a\nb\nc"\n' * 10
+    bounds = _record_bounds(data, 4)
+
+    assert bounds[0] == len(b'h,"x\ny"\n')
+    assert bounds[-1] == len(data)
+    for start in bounds[1:-1]:
+        assert data[start:].startswith(b"1,")
+    assert _record_bounds(b'a,"never closed\n', 4) == []
+
+
+# ---------------------------------------------------------------------------
+# Windowed SQLite reads
+# ---------------------------------------------------------------------------
+
+
+def _mixed_sqlite(path, rows=60):
+    """A table whose columns change storage class, or go NULL, past the first page."""
+    import sqlite3
+
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("CREATE TABLE log (n INTEGER, reading, tag, photo BLOB, gone)")
+        conn.executemany(
+            "INSERT INTO log VALUES (?, ?, ?, ?, NULL)",
+            [
+                (
+                    None if i % 7 == 0 else i,
+                    2.5 if i == rows - 1 else i,
+                    "late" if i == rows - 2 else i * 10,
+                    b"\x00" * i if i % 2 else None,
+                )
+                for i in range(rows)
+            ],
+        )
+        # A gap in the rowids, so a position is not a rowid
+        conn.execute("DELETE FROM log WHERE rowid BETWEEN 21 AND 25")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_sqlite_window_matches_the_whole_table_read(tmp_path, monkeypatch):
+    """Every window is the full read's slice - same rows, same types.
+
+    The types come from the one aggregate `typeof()` query, not from the page:
+    `reading` is integers until its last row and `tag` until its next to last,
+    yet the first page already reads them as double and string. Later pages
+    start from a keyset bookmark rather than stepping over the rows before them.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    path = str(tmp_path / "mixed.db")
+    _mixed_sqlite(path)
+    whole = readers._read_sqlite(path)
+
+    schema, rows = readers.sqlite_schema(path)
+    assert (schema, rows) == (whole.schema, 55)
+    assert str(schema.field("reading").type) == "double"
+    assert str(schema.field("gone").type) == "large_string"
+
+    queries = []
+    real = readers.pl.read_database
+    monkeypatch.setattr(
+        readers.pl,
+        "read_database",
+        lambda query, *a, **k: queries.append(query) or real(query, *a, **k),
+    )
+    for offset in range(0, 60, 10):
+        window, total = readers.read_sqlite_window(path, offset, 10)
+        assert total == 55
+        assert window.equals(whole.slice(offset, 10)), offset
+    assert "WHERE" not in queries[0]
+    assert all("WHERE rowid > " in q and "OFFSET 0" in q for q in queries[1:])
+
+    # A page between bookmarks starts from the one below it
+    window, _ = readers.read_sqlite_window(path, 13, 4)
+    assert window.equals(whole.slice(13, 4))
+    assert "OFFSET 3" in queries[-1]
+
+
+def test_sqlite_window_declines_a_table_without_a_rowid(tmp_path):
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    path = str(tmp_path / "keyed.db")
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("CREATE TABLE plain (k TEXT PRIMARY KEY, v) WITHOUT ROWID")
+        conn.execute("CREATE TABLE shadowed (rowid TEXT, v)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    for table in ("plain", "shadowed"):
+        assert readers.sqlite_schema(path, table) is None
+        assert readers.read_sqlite_window(path, 0, 10, table) is None
+
+
+async def test_sqlite_page_and_metadata_skip_the_whole_table_read(
+    jp_fetch, jp_root_dir, monkeypatch
+):
+    """Neither a page nor the metadata reads the table whole.
+
+    All of them give the rows the full read has.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    views._views_clear()
+    target_dir = jp_root_dir / "data"
+    target_dir.mkdir(exist_ok=True)
+    _mixed_sqlite(target_dir / "mixed.db")
+    whole = readers._read_sqlite(str(target_dir / "mixed.db"))
+
+    full_reads = []
+    real = readers._read_sqlite
+    monkeypatch.setattr(
+        readers,
+        "_read_sqlite",
+        lambda *args: full_reads.append(args) or real(*args),
+    )
+
+    async def post(endpoint, **body):
+        response = await jp_fetch(
+            "jupyterlab-tabular-data-viewer-extension",
+            endpoint,
+            method="POST",
+            body=json.dumps({"path": "data/mixed.db", "sheet": "log", **body}),
+        )
+        return json.loads(response.body)
+
+    metadata = await post("metadata")
+    assert metadata["totalRows"] == 55
+    assert {c["name"]: c["type"] for c in metadata["columns"]}["reading"] == "double"
+
+    page = await post("data", offset=50, limit=10)
+    assert page["totalRows"] == 55 and page["hasMore"] is False
+    assert [row["tag"] for row in page["data"]] == whole.column("tag").to_pylist()[50:]
+    assert [row["__row_index__"] for row in page["data"]] == list(range(51, 56))
+    assert full_reads == []
+
+    filtered = await post(
+        "data", offset=0, limit=10, filters={"tag": {"type": "text", "value": "late"}}
+    )
+    assert [row["n"] for row in filtered["data"]] == [58]
+    assert full_reads == []
+
+
+# ---------------------------------------------------------------------------
+# SQLite filter and sort pushdown
+# ---------------------------------------------------------------------------
+
+
+_PUSHDOWN_VIEWS = [
+    # (filters, sort_by, sort_order, case_insensitive, use_regex)
+    (
+        {"quantity": {"type": "number", "operator": ">=", "value": "3"}},
+        None,
+        "asc",
+        False,
+        False,
+    ),
+    (
+        {"quantity": {"type": "number", "operator": "<", "value": "2.5"}},
+        "unit_price",
+        "desc",
+        False,
+        False,
+    ),
+    (
+        {"unit_price": {"type": "number", "operator": "=", "value": " 4 "}},
+        None,
+        "asc",
+        False,
+        False,
+    ),
+    ({"product": {"type": "text", "value": "e"}}, "quantity", "asc", False, False),
+    ({"product": {"type": "text", "value": "E"}}, "quantity", "desc", True, False),
+    ({"product": {"type": "text", "value": "^[A-M]"}}, "order_id", "desc", False, True),
+    ({"order_id": {"type": "text", "value": "1"}}, "product", "asc", True, False),
+    (
+        {"order_id": {"type": "number", "operator": ">", "value": "x"}},
+        "ordered_at",
+        "asc",
+        False,
+        False,
+    ),
+    ({}, "unit_price", "asc", False, False),
+    (
+        {"n": {"type": "number", "operator": ">", "value": "4.5"}},
+        "reading",
+        "desc",
+        False,
+        False,
+    ),
+    ({"n": {"type": "text", "value": "NULL"}}, "n", "asc", True, False),
+    ({"tag": {"type": "text", "value": "late"}}, "tag", "asc", False, False),
+    (
+        {"reading": {"type": "number", "operator": "<=", "value": "10"}},
+        "n",
+        "desc",
+        False,
+        False,
+    ),
+    ({"photo": {"type": "text", "value": "BLOB"}}, "photo", "asc", False, False),
+    ({"gone": {"type": "text", "value": "(null)"}}, "gone", "desc", False, False),
+]
+
+
+@pytest.mark.parametrize("view", _PUSHDOWN_VIEWS)
+def test_sqlite_pushdown_matches_the_kernels(tmp_path, view):
+    """SQL and the kernels select the same rows in the same order.
+
+    The differential check behind the pushdown: every view over the fixture
+    database's `orders` and over a table of mixed storage classes, computed by
+    `views.sqlite_page_view` from SQL and a narrow scan, must equal `row_view`
+    over the full read - and so must the rows its page reads back.
+    """
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    readers._cache_clear()
+    shutil.copy(DATA_DIR / "sample_database.db", tmp_path / "sample_database.db")
+    _mixed_sqlite(tmp_path / "mixed.db")
+    filters, sort_by, sort_order, case_insensitive, use_regex = view
+    for path, table in (
+        (tmp_path / "sample_database.db", "orders"),
+        (tmp_path / "mixed.db", "log"),
+    ):
+        whole = readers._read_sqlite(str(path), table)
+        if not set(filters) | {sort_by} <= set(whole.column_names) | {None}:
+            continue
+        expected = views.row_view(
+            None, whole, filters, sort_by, sort_order, case_insensitive, use_regex
+        )
+        positions, total = views.sqlite_page_view(
+            None, str(path), table, filters, sort_by, sort_order, case_insensitive,
+            use_regex, len(whole),
+        )
+        assert positions.to_pylist() == expected.to_pylist()
+        assert total == len(expected)
+        rows = readers.read_sqlite_rows(str(path), positions, table)
+        assert rows.equals(whole.take(expected))
+
+
+def test_sqlite_pushdown_sends_only_exact_predicates_to_sql():
+    from jupyterlab_tabular_data_viewer_extension.views import _sqlite_pushdown
+
+    classes = {
+        "n": frozenset({"integer"}),
+        "x": frozenset({"integer", "real"}),
+        "s": frozenset({"text"}),
+    }
+    spec = (
+        (
+            ("n", "number", "7", ">"),
+            ("s", "text", "K", None),
+            ("x", "number", "2", "<="),
+        ),
+        ("x", "desc"),
+        (True, False),
+    )
+
+    where, params, order, residual = _sqlite_pushdown(classes, spec, lambda c: False)
+
+    assert where == '"n" > ? AND CAST("x" AS REAL) <= ?'
+    assert params == [7, 2.0]
+    assert order == '"x" IS NULL, CAST("x" AS REAL) DESC'
+    # Case folding of a text column is left to pyarrow, which folds Unicode
+    assert residual == ((("s", "text", "K", None),), None, (True, False))
+
+    # A float entry against integers a double cannot hold pushes nothing
+    spec = ((("n", "number", "2.5", ">"),), ("x", "asc"), None)
+    assert _sqlite_pushdown(classes, spec, lambda c: True) == ("", [], "", spec)
+
+
+def test_filtering_an_empty_table_matches_nothing(tmp_path):
+    """A filter over no rows is an empty view, not a crashed server."""
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers, views
+
+    path = str(tmp_path / "empty.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (a TEXT)")
+    conn.commit()
+    conn.close()
+
+    readers._cache_clear()
+    filters = {"a": {"type": "text", "value": "x"}}
+    whole = readers._read_sqlite(path)
+    assert (
+        views.row_view(None, whole, filters, None, "asc", False, False).to_pylist()
+        == []
+    )
+    positions, total = views.sqlite_page_view(
+        None, path, None, filters, None, "asc", False, True, 10
+    )
+    assert positions.to_pylist() == [] and total == 0
+
+
+# ---------------------------------------------------------------------------
+# Append refresh
+# ---------------------------------------------------------------------------
+
+
+def test_append_refresh_is_off_by_default():
+    from jupyterlab_tabular_data_viewer_extension import readers
+    from jupyterlab_tabular_data_viewer_extension.config import TabularDataViewerConfig
+
+    assert readers._APPEND_REFRESH is False
+    assert (
+        TabularDataViewerConfig.class_traits()["append_refresh"].default_value is False
+    )
+
+
+def test_csv_append_reads_only_the_new_bytes(tmp_path, monkeypatch):
+    """A grown csv is its cached table plus the records after it.
+
+    Unless a column the old rows typed would change type, or the old bytes
+    themselves changed - either of which reads the whole file again.
+    """
+    from jupyterlab_tabular_data_viewer_extension import metrics, readers
+
+    readers._cache_clear()
+    monkeypatch.setattr(readers, "_APPEND_REFRESH", True)
+    reads = []
+    real = readers._read_delimited_frame
+    monkeypatch.setattr(
+        readers, "_read_delimited_frame", lambda *a: reads.append(a) or real(*a)
+    )
+    path = tmp_path / "log.csv"
+    path.write_text("id,note,gone\n1,a,\n2,b,\n")
+    appended = metrics._counts["append_refreshes"]
+
+    def grow(text):
+        with open(path, "a") as handle:
+            handle.write(text)
+        table = readers.read_as_arrow_table(str(path))
+        counted = len(reads)
+        assert table.equals(readers._read_uncached(str(path), None))
+        del reads[counted:]
+        return table
+
+    readers.read_as_arrow_table(str(path))
+    table = grow('3,"c, d",9\n4,,\n')
+    assert len(reads) == 1 and table.num_rows == 4
+    assert metrics._counts["append_refreshes"] == appended + 1
+    # The all-null column the old rows read as String took the new rows' type
+    assert table.schema.field("gone").type == "int64"
+    grow("5,e,\n")
+    assert len(reads) == 1
+
+    # An integer column gaining a float: the old rows are read again
+    table = grow("6.5,f,\n")
+    assert len(reads) == 2 and table.schema.field("id").type == "double"
+
+    # A changed byte before the old end is no append
+    path.write_bytes(path.read_bytes().replace(b"e,", b"E,"))
+    grow("7,g,\n")
+    assert len(reads) == 3
+
+
+def test_sqlite_append_reads_only_the_new_rows(tmp_path, monkeypatch):
+    """New rowids past the cached table's last are read on their own.
+
+    A deleted row, a changed last row, or a type the new rows would change
+    each read the whole table again.
+    """
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    monkeypatch.setattr(readers, "_APPEND_REFRESH", True)
+    reads = []
+    real = readers._sqlite_frame
+    monkeypatch.setattr(
+        readers, "_sqlite_frame", lambda *a: reads.append(a) or real(*a)
+    )
+    path = str(tmp_path / "log.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (n INTEGER, x, note)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, ?, ?)", [(1, None, "a"), (2, None, None)]
+    )
+    conn.commit()
+
+    def grow(sql, *params):
+        conn.execute(sql, *params)
+        conn.commit()
+        table = readers.read_as_arrow_table(path, "t")
+        counted = len(reads)
+        assert table.equals(readers._read_sqlite(path, "t"))
+        del reads[counted:]
+        return table
+
+    readers.read_as_arrow_table(path, "t")
+    reads.clear()
+    table = grow("INSERT INTO t VALUES (3, 1.5, x'00ff')")
+    assert reads == [] and table.schema.field("x").type == "double"
+    grow("INSERT INTO t VALUES (4, 2, 'd')")
+    assert reads == []
+
+    grow("DELETE FROM t WHERE n = 1")
+    assert len(reads) == 1
+    grow("UPDATE t SET note = 'z' WHERE n = 4")
+    assert len(reads) == 2
+    grow("INSERT INTO t VALUES ('five', 3, 'e')")
+    assert len(reads) == 3
+    grow("INSERT INTO t VALUES (6, 4, 'f')")
+    assert len(reads) == 3
+    conn.close()
+
+
+# ---------------------------------------------------------------------------
+# SQLite connection pool
+# ---------------------------------------------------------------------------
+
+
+def test_sqlite_connections_are_reused_until_the_file_is_replaced(
+    tmp_path, monkeypatch
+):
+    """Queries on one database share a pooled connection, tuned once.
+
+    A database replaced by another file - a new inode - gets a new connection
+    rather than one still reading the old file, and an idle connection is
+    closed by the sweep.
+    """
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    opened = []
+    real = sqlite3.connect
+    monkeypatch.setattr(
+        sqlite3, "connect", lambda *a, **k: opened.append(a) or real(*a, **k)
+    )
+
+    def make(path, table):
+        conn = real(path)
+        conn.execute(f"CREATE TABLE {table} (v INTEGER)")
+        conn.commit()
+        conn.close()
+
+    target = str(tmp_path / "pooled.db")
+    make(target, "first")
+    assert readers.list_sqlite_tables(target) == ["first"]
+    assert readers.list_sqlite_tables(target) == ["first"]
+    assert len(opened) == 1
+    with readers._sqlite_conn(target) as conn:
+        assert conn.execute("PRAGMA query_only").fetchone() == (1,)
+        assert conn.execute("PRAGMA cache_size").fetchone() == (
+            -readers._SQLITE_CACHE_BYTES // 1024,
+        )
+
+    make(str(tmp_path / "other.db"), "second")
+    os.replace(tmp_path / "other.db", target)
+    assert readers.list_sqlite_tables(target) == ["second"]
+    assert len(opened) == 2
+
+    monkeypatch.setattr(readers, "_SQLITE_POOL_IDLE_SECONDS", 0.0)
+    readers._sqlite_pool_sweep()
+    assert readers._SQLITE_POOL == {}
+    readers._cache_clear()
+
+
+def test_sqlite_pool_size_zero_opens_a_connection_per_query(tmp_path, monkeypatch):
+    import sqlite3
+
+    from jupyterlab_tabular_data_viewer_extension import readers
+
+    readers._cache_clear()
+    shutil.copy(DATA_DIR / "sample_database.db", tmp_path / "sample_database.db")
+    target = str(tmp_path / "sample_database.db")
+    opened = []
+    real = sqlite3.connect
+    monkeypatch.setattr(
+        sqlite3, "connect", lambda *a, **k: opened.append(a) or real(*a, **k)
+    )
+    readers.configure(sqlite_pool_size=0)
+    try:
+        readers.list_sqlite_tables(target)
+        readers.list_sqlite_tables(target)
+        assert len(opened) == 2 and readers._SQLITE_POOL == {}
+    finally:
+        readers.configure(sqlite_pool_size=4)
+    with pytest.raises(ValueError, match="sqlite_mmap_bytes"):
+        readers.configure(sqlite_mmap_bytes=-1)
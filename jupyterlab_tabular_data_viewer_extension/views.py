@@ -0,0 +1,867 @@
+"""Row views: which rows of a table a request sees, and in what order.
+
+A view is the grid's filters and sort applied to a cached table, reduced to the
+one thing that survives between requests - the row positions, in display order.
+Scrolling a filtered, sorted grid used to re-run the whole pipeline for every
+page: cast each filtered column to text, match it, filter the table, sort it
+and take every row, on a 20M-row parquet seconds per scroll step, all to
+return 500 rows. With the positions cached a later page is a `take` of a
+500-element slice of them, and the download of the same view is a `take` of
+all of them, so exporting exactly what is on screen costs nothing extra.
+
+Only positions are cached, never rows: a view of a table is at most 8 bytes per
+row, where a filtered copy of the table is as wide as the table itself.
+
+Full-table sort permutations are kept apart from the views, on the read cache
+entry of the table they order (see `readers.cache_derived`), and serve more
+than their own view: the opposite direction is derived from one in linear time
+rather than sorted again, and a filtered view sorted on the same column is the
+permutation with the filtered-out rows dropped.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from . import metrics
+from .readers import (
+    _quote_ident,
+    cache_derived,
+    cached_derived,
+    count_sqlite,
+    scan_parquet,
+    scan_sqlite,
+    sqlite_beyond_double,
+    sqlite_schema,
+    sqlite_storage_classes,
+)
+from .stats import numeric_view
+
+# A permutation of a 20M-row table is 160 MB; the budget holds one of those
+# alongside the smaller views of the other open tabs.
+_VIEWS_MAX_BYTES = 256 * 1024 * 1024
+
+# (read cache key, view spec) -> uint64 positions, in least-recently-used order
+_VIEWS = OrderedDict()
+_VIEWS_BYTES = 0
+
+# Handlers compute views on the executor's thread pool; every access to _VIEWS
+# and _VIEWS_BYTES goes through this lock. Views are computed outside it.
+_VIEWS_LOCK = threading.Lock()
+
+
+# A sorted page whose view is not cached yet is answered by selection rather
+# than a full sort while the rows it reaches - `offset + limit` - are at most
+# this fraction of the rows it is selected from. Past that the view is computed
+# and cached whole, and pages after it are slices again.
+_TOP_K_FRACTION = 0.05
+
+# How many pages' worth a selection takes. The next few pages of a fresh sort
+# then reuse the cached prefix instead of selecting from every row again.
+_TOP_K_PAGES_AHEAD = 4
+
+
+class _Prefix:
+    """The first positions of a view, and how many rows the whole view has.
+
+    What a selection leaves in the view cache in place of the whole view; it
+    serves any page that ends within it.
+    """
+
+    def __init__(self, positions, total):
+        self.positions = positions
+        self.total = total
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes
+
+
+def _numeric_scalar(filter_value, column_type):
+    """A comparison scalar in the COLUMN's type, not a bare python float.
+
+    `pc.greater(uint64_column, 100.0)` makes pyarrow promote the column to
+    double, and it refuses outright when a value exceeds a double's exact
+    integer range - `ArrowInvalid: Integer value 9223372036854775808 not in
+    range`. ArrowInvalid is a ValueError, so the arm meant for a non-numeric
+    entry swallowed it and the filter silently matched every row. Building the
+    scalar in the column's own type compares exactly and never promotes.
+
+    Raises ValueError when the entry is not a number, which is the caller's
+    signal that there is no predicate to add.
+    """
+    text = str(filter_value).strip()
+    if pa.types.is_integer(column_type):
+        try:
+            return pa.scalar(int(text), column_type)
+        except (ValueError, OverflowError, pa.ArrowInvalid):
+            # A decimal entry against an integer column, or one outside the
+            # column type's range: fall through to a float comparison, which
+            # pyarrow can still answer for an in-range integer column.
+            pass
+    return float(text)
+
+
+_NUMBER_KERNELS = {
+    ">": pc.greater,
+    "<": pc.less,
+    ">=": pc.greater_equal,
+    "<=": pc.less_equal,
+    "=": pc.equal,
+}
+
+
+@metrics.phase("sort")
+def _sort_indices(table, sort_by, sort_order):
+    """Sort indices for one column, numerically when a text column holds numbers.
+
+    A worksheet cell can hold a number as text, so the column is a string column
+    and stays one - forcing it numeric would strip a zip code's leading zeros.
+    Sorting it as text puts 10 before 2, which is the wrong answer for the same
+    values. Sorting on `numeric_view`'s reading of the column gives the numeric
+    order while the stored, displayed and exported values remain the text the
+    file holds. Both the grid and the export sort through here, so a downloaded
+    file is ordered exactly as the grid showed it.
+    """
+    direction = "ascending" if sort_order == "asc" else "descending"
+    key = _sort_key(table, sort_by)
+    return pc.sort_indices(pa.table({sort_by: key}), sort_keys=[(sort_by, direction)])
+
+
+def _sort_key(table, sort_by):
+    """The values `_sort_indices` orders `sort_by` by."""
+    column = table.column(sort_by)
+    numeric = numeric_view(column)
+    return column if numeric is None else numeric
+
+
+@metrics.phase("sort")
+def _reverse_permutation(table, sort_by, permutation):
+    """The stable sort of `sort_by` in the other direction, from `permutation`.
+
+    `pc.sort_indices` is stable - equal values keep file order - and puts NaN
+    and then nulls last in both directions. So the opposite order is not simply
+    the permutation reversed: the run of NaN and null rows stays where it is,
+    and each run of equal values keeps its own order while the runs reverse.
+    Reversing the head outright reverses both the runs and the rows within
+    them; a gather then turns each run back round. All of it is linear, where
+    sorting again is n log n - about a second on ten million rows.
+    """
+    key = _sort_key(table, sort_by)
+    tail = key.null_count
+    if pa.types.is_floating(key.type):
+        tail += pc.sum(pc.is_nan(key).cast(pa.int64())).as_py() or 0
+    head = len(permutation) - tail
+    if head < 2:
+        return permutation
+
+    # The ordered head, back to front: runs in the new order, each reversed
+    reversed_head = permutation.take(
+        pc.subtract(pa.scalar(head - 1, pa.uint64()), _row_positions(0, head))
+    )
+    values = key.take(reversed_head)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    starts_run = pa.concat_arrays(
+        [
+            pa.array([True]),
+            pc.not_equal(values.slice(1), values.slice(0, head - 1)),
+        ]
+    )
+    run_starts = pc.indices_nonzero(starts_run)
+    run_ends = pa.concat_arrays(
+        [run_starts.slice(1), pa.array([head], run_starts.type)]
+    )
+    run = pc.subtract(pc.cumulative_sum(starts_run.cast(pa.uint64())), 1)
+    # Position j of a run spanning [start, end) takes its element start + end - 1 - j
+    source = pc.subtract(
+        pc.subtract(
+            pc.add(run_starts.take(run), run_ends.take(run)), pa.scalar(1, pa.uint64())
+        ),
+        _row_positions(0, head),
+    )
+    return pa.concat_arrays(
+        [reversed_head.take(source), permutation.slice(head)]
+    )
+
+
+def _sort_permutation(read_key, table, sort_by, sort_order, compute=True):
+    """Every row of `table` in `sort_by` order, and whether it is cached.
+
+    Looks on the read cache entry for this direction, then for the opposite one
+    to reverse; sorts only when neither is there, and only if `compute` - a
+    filtered view sorts its surviving rows more cheaply than all of them. A
+    result is stored on the entry whenever the table is cached; the second
+    value says so. Returns (None, False) when nothing was found or computed.
+    """
+    name = ("sort", sort_by, sort_order)
+    permutation = cached_derived(read_key, name)
+    if permutation is not None:
+        return permutation, True
+
+    opposite = "desc" if sort_order == "asc" else "asc"
+    reversible = cached_derived(read_key, ("sort", sort_by, opposite))
+    if reversible is not None:
+        permutation = _reverse_permutation(table, sort_by, reversible)
+    elif compute:
+        permutation = _sort_indices(table, sort_by, sort_order)
+        if isinstance(permutation, pa.ChunkedArray):
+            permutation = permutation.combine_chunks()
+    else:
+        return None, False
+    return permutation, cache_derived(read_key, name, permutation)
+
+
+def view_spec(column_names, filters, sort_by, sort_order, case_insensitive, use_regex):
+    """The request's filters and sort, reduced to what changes the rows.
+
+    Two requests that select the same rows in the same order get the same spec,
+    whatever else differs: filters on columns the table lacks and filters with
+    an empty value are dropped, as the pipeline ignores both; the operator
+    matters only to a number filter and the case and regex flags only when a
+    text filter is present. The spec is hashable, so it can key the cache, and
+    None means the table's own rows in file order - no view at all.
+    """
+    predicates = []
+    for col_name, filter_spec in (filters or {}).items():
+        if col_name not in column_names:
+            continue
+        filter_type = filter_spec.get("type", "text")
+        filter_value = filter_spec.get("value", "")
+        if not filter_value:
+            continue
+        if filter_type == "text":
+            predicates.append((col_name, "text", str(filter_value), None))
+        elif filter_type == "number":
+            operator = filter_spec.get("operator", "=")
+            if operator in _NUMBER_KERNELS:
+                predicates.append((col_name, "number", str(filter_value), operator))
+    predicates.sort()
+
+    sort = None
+    if sort_by and sort_by in column_names:
+        sort = (sort_by, "asc" if sort_order == "asc" else "desc")
+
+    if not predicates and sort is None:
+        return None
+    has_text = any(p[1] == "text" for p in predicates)
+    flags = (bool(case_insensitive), bool(use_regex)) if has_text else None
+    return (tuple(predicates), sort, flags)
+
+
+@metrics.phase("filter")
+def _filter_mask(table, predicates, flags):
+    """Boolean mask of the rows every predicate keeps, or None when none applies.
+
+    The grid and the download once carried a copy each of this loop, and the
+    copies drifted: the download compared numbers against a bare float, so on a
+    wide integer column the kernel's refusal was caught as a non-numeric entry
+    and the export shipped every row under a `_filtered` filename. There is one
+    copy now, and the two cannot disagree.
+    """
+    case_insensitive, use_regex = flags or (False, False)
+    masks = []
+    for col_name, filter_type, filter_value, operator in predicates:
+        column = table.column(col_name)
+
+        if filter_type == "text":
+            # Cast column to string for text filtering (handles both string and
+            # numeric columns), with nulls matched as the "(null)" the grid shows
+            column_str = pc.fill_null(pc.cast(column, pa.string()), "(null)")
+            if use_regex:
+                try:
+                    masks.append(
+                        pc.match_substring_regex(
+                            column_str, filter_value, ignore_case=case_insensitive
+                        )
+                    )
+                    continue
+                except Exception:
+                    # Fall back to simple substring matching if regex is invalid
+                    pass
+            masks.append(
+                pc.match_substring(
+                    column_str, filter_value, ignore_case=case_insensitive
+                )
+            )
+        else:
+            try:
+                numeric_value = _numeric_scalar(filter_value, column.type)
+            except ValueError:
+                continue
+            # Outside the try: the kernel's own refusal must not be mistaken
+            # for a non-numeric entry, or the filter silently matches every row.
+            masks.append(_NUMBER_KERNELS[operator](column, numeric_value))
+
+    if not masks:
+        return None
+    combined = masks[0]
+    for mask in masks[1:]:
+        combined = pc.and_(combined, mask)
+    if isinstance(combined, pa.ChunkedArray):
+        # A kernel over an empty column returns a mask of no chunks at all, and
+        # `pc.indices_nonzero` on one crashes the process rather than raising -
+        # so filtering an empty table took the server down.
+        combined = combined.combine_chunks()
+    return combined
+
+
+def _compute_view(table, spec, read_key=None):
+    """Positions of the rows `spec` selects, in the order it sorts them.
+
+    `read_key` is the read cache key of `table`, through which a sort can use
+    and store the table's cached sort permutations; None computes everything.
+    """
+    predicates, sort, flags = spec
+    positions = None
+
+    mask = _filter_mask(table, predicates, flags)
+    if sort is not None and mask is not None:
+        permutation, _ = _sort_permutation(read_key, table, *sort, compute=False)
+        if permutation is not None:
+            # The rows in sorted order, less the ones the filter drops: the
+            # same stable order as sorting the survivors, in linear time
+            keep = mask.take(permutation).fill_null(False)
+            if isinstance(keep, pa.ChunkedArray):
+                keep = keep.combine_chunks()
+            return permutation.filter(keep)
+    if mask is not None:
+        # A null in the mask - a comparison against a null cell - is not a
+        # match, which is also how `Table.filter` treated it.
+        positions = pc.indices_nonzero(mask)
+
+    if sort is not None:
+        sort_by, sort_order = sort
+        if positions is None:
+            positions, _ = _sort_permutation(read_key, table, sort_by, sort_order)
+        else:
+            # Sort only the surviving rows, and only the sort column of them:
+            # taking the whole filtered table first would copy every column to
+            # order one.
+            order = _sort_indices(
+                table.select([sort_by]).take(positions), sort_by, sort_order
+            )
+            positions = positions.take(order)
+
+    if positions is None:
+        # Every predicate was a non-numeric entry in a number filter
+        positions = _row_positions(0, len(table))
+    if isinstance(positions, pa.ChunkedArray):
+        positions = positions.combine_chunks()
+    return positions
+
+
+def _row_positions(start, count):
+    """The uint64 positions start, start + 1, ..., start + count - 1.
+
+    A running sum over a constant rather than `pa.array(range(...))`, which
+    converts one python int at a time - seconds for a 20M-row table, against a
+    fraction of one.
+    """
+    if count == 0:
+        return pa.array([], pa.uint64())
+    one = pa.scalar(1, pa.uint64())
+    running = pc.cumulative_sum(
+        pa.repeat(one, count), start=pa.scalar(start, pa.uint64())
+    )
+    return pc.subtract(running, one)
+
+
+def row_view(
+    read_key, table, filters, sort_by, sort_order, case_insensitive, use_regex
+):
+    """Positions of the rows the grid shows for this request, or None for all.
+
+    None means no filter or sort applies and the table's own rows, in file
+    order, are the view - there is nothing to compute or cache. Otherwise the
+    result is a uint64 array of row positions in `table`, in display order.
+
+    `read_key` is the read cache's key for `table` (see
+    `readers.read_with_key`); a view is cached under it, so an edited file,
+    which reads under a new key, can never be served its old version's view.
+    None disables caching for the call.
+    """
+    spec = view_spec(
+        table.column_names, filters, sort_by, sort_order, case_insensitive, use_regex
+    )
+    if spec is None:
+        return None
+    predicates, sort, _ = spec
+    if not predicates:
+        # A plain sort is the table's sort permutation, which lives on its read
+        # cache entry when it can; keeping it as a view too would hold it twice.
+        # Only a table too big to cache keeps its permutation as a view.
+        permutation, cached = _sort_permutation(
+            read_key, table, *sort, compute=False
+        )
+        if permutation is None:
+            permutation = _view_get(read_key, spec)
+            if permutation is not None:
+                return permutation
+            permutation, cached = _sort_permutation(read_key, table, *sort)
+        if not cached and read_key is not None:
+            _view_put((read_key, spec), permutation)
+        return permutation
+    return _cached_view(
+        read_key, spec, lambda: _compute_view(table, spec, read_key)
+    )
+
+
+def page_view(
+    read_key,
+    table,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    count,
+):
+    """At least the first `count` positions of `row_view`, and the view's length.
+
+    A page that only needs the head of a sorted view does not need all of it
+    sorted: while `count` is a small fraction of the rows (`_TOP_K_FRACTION`)
+    and nothing cached already orders them, the head is chosen by selection -
+    linear in the rows, where a sort is n log n - and only the rows chosen are
+    sorted. A deeper page computes and caches the whole view as `row_view`
+    does. Returns (None, len(table)) when no view applies.
+    """
+    spec = view_spec(
+        table.column_names, filters, sort_by, sort_order, case_insensitive, use_regex
+    )
+    if spec is None:
+        return None, len(table)
+    return _page_view(
+        read_key,
+        spec,
+        count,
+        len(table),
+        lambda: row_view(
+            read_key,
+            table,
+            filters,
+            sort_by,
+            sort_order,
+            case_insensitive,
+            use_regex,
+        ),
+        lambda k: _compute_prefix(table, spec, k),
+        has_permutation=read_key is not None
+        and spec[1] is not None
+        and any(
+            cached_derived(read_key, ("sort", spec[1][0], order)) is not None
+            for order in ("asc", "desc")
+        ),
+    )
+
+
+def _page_view(read_key, spec, count, row_count, whole, prefix, has_permutation):
+    """`page_view` for any source: `whole()` computes the view, `prefix(k)` its head.
+
+    `prefix` returns a `_Prefix`, or None when selection cannot answer.
+    """
+    selectable = (
+        spec[1] is not None
+        and not has_permutation
+        and count <= row_count * _TOP_K_FRACTION
+    )
+    if selectable and read_key is not None and _view_get(read_key, spec) is None:
+        cached = _view_get(read_key, ("prefix", spec))
+        if cached is not None and len(cached.positions) >= min(count, cached.total):
+            return cached.positions, cached.total
+        head = prefix(count * _TOP_K_PAGES_AHEAD)
+        if head is not None:
+            _view_put((read_key, ("prefix", spec)), head)
+            return head.positions, head.total
+    elif selectable and read_key is None:
+        head = prefix(count)
+        if head is not None:
+            return head.positions, head.total
+    positions = whole()
+    return positions, len(positions)
+
+
+def _selectable(key_type):
+    """Whether selection and the boundary comparison both handle a sort key type.
+
+    Dictionary columns are left to the full sort: selecting on one crashes
+    pyarrow rather than raising.
+    """
+    return (
+        pa.types.is_integer(key_type)
+        or pa.types.is_floating(key_type)
+        or pa.types.is_string(key_type)
+        or pa.types.is_large_string(key_type)
+        or pa.types.is_boolean(key_type)
+        or pa.types.is_date(key_type)
+        or pa.types.is_timestamp(key_type)
+    )
+
+
+@metrics.phase("sort")
+def _compute_prefix(table, spec, count):
+    """The first `count` positions of `spec`'s view by selection, as a `_Prefix`.
+
+    `pc.select_k_unstable` finds `count` leading rows, but not necessarily the
+    ones a stable sort leads with: among rows equal to the last one selected it
+    may pick any. So it is used only for that boundary value - every row at
+    least as far forward is taken, ties included, and those rows are sorted
+    stably, which puts exactly the sort's first `count` rows first. Returns
+    None when selection would reach NaN or null keys, whose order among
+    themselves it does not keep, or cannot handle the key's type.
+    """
+    predicates, (sort_by, sort_order), flags = spec
+    key = _sort_key(table, sort_by)
+    if not _selectable(key.type):
+        return None
+
+    mask = _filter_mask(table, predicates, flags)
+    candidates = None if mask is None else pc.indices_nonzero(mask)
+    values = key if candidates is None else key.take(candidates)
+    total = len(values)
+    if count >= total:
+        return None
+
+    direction = "ascending" if sort_order == "asc" else "descending"
+    chosen = values.take(
+        pc.select_k_unstable(
+            pa.table({sort_by: values}), k=count, sort_keys=[(sort_by, direction)]
+        )
+    )
+    if chosen.null_count or (
+        pa.types.is_floating(key.type) and pc.any(pc.is_nan(chosen)).as_py()
+    ):
+        return None
+    if sort_order == "asc":
+        leading = pc.less_equal(values, pc.max(chosen))
+    else:
+        leading = pc.greater_equal(values, pc.min(chosen))
+
+    inside = pc.indices_nonzero(leading.fill_null(False))
+    order = pc.sort_indices(
+        pa.table({sort_by: values.take(inside)}), sort_keys=[(sort_by, direction)]
+    )
+    local = inside.take(order.slice(0, count))
+    positions = local if candidates is None else candidates.take(local)
+    if isinstance(positions, pa.ChunkedArray):
+        positions = positions.combine_chunks()
+    return _Prefix(positions, total)
+
+
+def parquet_page_view(
+    read_key,
+    path,
+    schema,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    count,
+):
+    """`page_view` for a parquet file that is not in the read cache.
+
+    Reads only the columns the view filters or sorts on, from only the row
+    groups its number filters can match (see `readers.scan_parquet`), instead
+    of the whole table. The predicates are then applied by the same kernels as
+    `row_view`, so the two compute the identical view and share one cache
+    entry - whichever of them ran first serves the other. `schema` is the
+    file's schema as `readers.parquet_schema` types it. Returns (None, None)
+    when no view applies.
+    """
+    spec = view_spec(
+        schema.names, filters, sort_by, sort_order, case_insensitive, use_regex
+    )
+    if spec is None:
+        return None, None
+    if read_key is not None:
+        positions = _view_get(read_key, spec)
+        if positions is not None:
+            return positions, len(positions)
+
+    narrow, file_rows = _scan_view_columns(path, schema, spec)
+    return _page_view(
+        read_key,
+        spec,
+        count,
+        len(narrow),
+        lambda: _cached_view(
+            read_key,
+            spec,
+            lambda: _to_file_rows(file_rows, _compute_view(narrow, spec)),
+        ),
+        lambda k: _prefix_to_file_rows(file_rows, _compute_prefix(narrow, spec, k)),
+        has_permutation=False,
+    )
+
+
+def _scan_view_columns(path, schema, spec):
+    """The view's columns from a narrow, pruned scan, and the file row of each row.
+
+    The second value is a list of uint64 arrays, one per row group read: row i
+    of the scan is file row i of their concatenation.
+    """
+    predicates, sort, _ = spec
+    needed = {p[0] for p in predicates}
+    if sort is not None:
+        needed.add(sort[0])
+    columns = [name for name in schema.names if name in needed]
+
+    narrow, spans = scan_parquet(path, columns, _prune_expression(schema, predicates))
+    # The groups read are consecutive in the scan, each starting at its own
+    # first file row.
+    return narrow, [_row_positions(start, count) for start, count in spans]
+
+
+def _to_file_rows(file_rows, local):
+    """Positions in a `_scan_view_columns` scan as positions in the file."""
+    if not file_rows:
+        return local
+    return pa.chunked_array(file_rows, pa.uint64()).take(local).combine_chunks()
+
+
+def _prefix_to_file_rows(file_rows, prefix):
+    """`_to_file_rows` for a `_Prefix`, which may be None."""
+    if prefix is None:
+        return None
+    return _Prefix(_to_file_rows(file_rows, prefix.positions), prefix.total)
+
+
+def _prune_expression(schema, predicates):
+    """The number filters as one dataset expression, or None if there are none.
+
+    Only used to skip row groups whose statistics rule every row out, so it may
+    leave a predicate out but must never add one: text filters cannot be judged
+    from min/max and are omitted, and so is a decimal entry against an integer
+    column - compared as a float it can make the dataset layer refuse the
+    expression where the in-memory kernel would not.
+    """
+    expression = None
+    for col_name, filter_type, filter_value, operator in predicates:
+        if filter_type != "number":
+            continue
+        column_type = schema.field(col_name).type
+        if not (pa.types.is_integer(column_type) or pa.types.is_floating(column_type)):
+            continue
+        try:
+            value = _numeric_scalar(filter_value, column_type)
+        except ValueError:
+            continue
+        if pa.types.is_integer(column_type) and not isinstance(value, pa.Scalar):
+            continue
+        term = _NUMBER_KERNELS[operator](pc.field(col_name), value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def sqlite_page_view(
+    read_key,
+    path,
+    table,
+    filters,
+    sort_by,
+    sort_order,
+    case_insensitive,
+    use_regex,
+    count,
+):
+    """`page_view` for a SQLite table that is not in the read cache.
+
+    What SQLite can answer exactly as `_filter_mask` and `_sort_indices` would
+    is sent to it as SQL (see `_sqlite_pushdown`), where the table's own
+    indexes can serve it; the rest is applied by those same kernels to only the
+    columns it needs, of only the rows the SQL kept. The two paths therefore
+    compute the identical view and share one cache entry, as the parquet one
+    does. When all of a sorted view is SQL, a page near its head is a `LIMIT`
+    and a `count(*)` rather than the whole view. Returns (None, None) when no
+    view applies; the table must be one `readers.sqlite_schema` describes.
+    """
+    schema, rows = sqlite_schema(path, table)
+    spec = view_spec(
+        schema.names, filters, sort_by, sort_order, case_insensitive, use_regex
+    )
+    if spec is None:
+        return None, None
+    if read_key is not None:
+        positions = _view_get(read_key, spec)
+        if positions is not None:
+            return positions, len(positions)
+
+    where, params, order, residual = _sqlite_pushdown(
+        sqlite_storage_classes(path, table),
+        spec,
+        lambda column: sqlite_beyond_double(path, column, table),
+    )
+    predicates, sort, _ = residual
+    needed = {p[0] for p in predicates}
+    if sort is not None:
+        needed.add(sort[0])
+    columns = [name for name in schema.names if name in needed]
+
+    def whole():
+        narrow, file_rows = scan_sqlite(
+            path, columns, where, params, order, table=table
+        )
+        if not predicates and sort is None:
+            return file_rows
+        return file_rows.take(_compute_view(narrow, residual))
+
+    def prefix(k):
+        if predicates or sort is not None:
+            return None
+        _, file_rows = scan_sqlite(path, [], where, params, order, limit=k, table=table)
+        return _Prefix(file_rows, count_sqlite(path, where, params, table))
+
+    return _page_view(
+        read_key,
+        spec,
+        count,
+        rows,
+        lambda: _cached_view(read_key, spec, whole),
+        prefix,
+        has_permutation=False,
+    )
+
+
+def _sqlite_pushdown(classes, spec, beyond_double):
+    """`spec` as the SQL SQLite answers identically to the kernels, and the rest.
+
+    Returns (where, params, order, residual): the WHERE and ORDER BY clauses
+    for `readers.scan_sqlite`, and a spec of the predicates and sort they leave
+    out. Only what is provably the same answer is pushed, judged from the
+    storage classes a column's values have (`classes`):
+
+    - a number filter on a column of numbers. An integer entry against a
+      column of integers compares as integers; anything else compares as
+      REAL, which is the double pyarrow promotes the column to. SQLite keeps
+      no NaN, and a comparison with NULL keeps no row, as a null in the mask
+      does not. pyarrow refuses that promotion when an integer is past what a
+      double holds exactly, so where `beyond_double(column)` says one is,
+      nothing is pushed at all: the kernels then see every row, and refuse as
+      they do on the full read.
+    - a text filter, without regex, on a column of integers - whose text is
+      the same digits in both - or, case-sensitively, on a column of text,
+      with NULL matched as "(null)". Case folding is pushed only for an ASCII
+      entry against digits: pyarrow folds Unicode and SQLite's `lower` does
+      not, and a column of text may hold a KELVIN SIGN.
+    - a sort on a column of numbers, NULLs last and ties in file order in both
+      directions, as `pc.sort_indices` orders them. A text column is sorted by
+      `numeric_view` when it holds numbers and so is never pushed.
+    """
+    predicates, sort, flags = spec
+    case_insensitive, use_regex = flags or (False, False)
+    terms, params, residual = [], [], []
+    for predicate in predicates:
+        col_name, filter_type, filter_value, operator = predicate
+        present = classes[col_name]
+        col = _quote_ident(col_name)
+        numbers = bool(present) and present <= {"integer", "real"}
+        if filter_type == "number" and numbers:
+            column_type = pa.int64() if present == {"integer"} else pa.float64()
+            try:
+                value = _numeric_scalar(filter_value, column_type)
+            except ValueError:
+                # No predicate, as `_filter_mask` adds none
+                continue
+            if isinstance(value, pa.Scalar):
+                terms.append(f"{col} {operator} ?")
+                params.append(value.as_py())
+            elif present == {"integer"} and beyond_double(col_name):
+                return "", [], "", spec
+            else:
+                expr = col if present == {"real"} else f"CAST({col} AS REAL)"
+                terms.append(f"{expr} {operator} ?")
+                params.append(value)
+        elif filter_type == "text" and not use_regex and present == {"integer"} and (
+            not case_insensitive or filter_value.isascii()
+        ):
+            expr = f"coalesce(CAST({col} AS TEXT), '(null)')"
+            if case_insensitive:
+                expr, filter_value = f"lower({expr})", filter_value.lower()
+            terms.append(f"instr({expr}, ?) > 0")
+            params.append(filter_value)
+        elif (
+            filter_type == "text"
+            and not use_regex
+            and not case_insensitive
+            and present == {"text"}
+        ):
+            terms.append(f"instr(coalesce({col}, '(null)'), ?) > 0")
+            params.append(filter_value)
+        else:
+            residual.append(predicate)
+
+    order = ""
+    if sort is not None:
+        sort_by, sort_order = sort
+        present = classes[sort_by]
+        if present and present <= {"integer", "real"}:
+            col = _quote_ident(sort_by)
+            expr = col if len(present) == 1 else f"CAST({col} AS REAL)"
+            direction = "ASC" if sort_order == "asc" else "DESC"
+            order = f"{col} IS NULL, {expr} {direction}"
+            sort = None
+    return " AND ".join(terms), params, order, (tuple(residual), sort, flags)
+
+
+def _cached_view(read_key, spec, compute):
+    """The view cached for (`read_key`, `spec`), computing and storing it on a miss."""
+    if read_key is None:
+        return compute()
+
+    positions = _view_get(read_key, spec)
+    if positions is None:
+        positions = compute()
+        _view_put((read_key, spec), positions)
+    return positions
+
+
+def _view_get(read_key, spec):
+    """The view cached for (`read_key`, `spec`), or None. Marks it recently used."""
+    key = (read_key, spec)
+    with _VIEWS_LOCK:
+        if key in _VIEWS:
+            _VIEWS.move_to_end(key)
+            return _VIEWS[key]
+    return None
+
+
+def _view_put(key, positions):
+    """Store a view, dropping views of older versions of its table and evicting LRU."""
+    global _VIEWS_BYTES
+    size = positions.nbytes
+    read_key = key[0]
+    path, sheet = read_key[0], read_key[1]
+    with _VIEWS_LOCK:
+        # Views of the file's previous versions are unreachable once it reads
+        # under a new key; drop them now rather than let them age out.
+        for stale in [
+            k
+            for k in _VIEWS
+            if k[0][0] == path and k[0][1] == sheet and k[0] != read_key
+        ]:
+            _VIEWS_BYTES -= _VIEWS.pop(stale).nbytes
+        if size > _VIEWS_MAX_BYTES:
+            return
+        if key in _VIEWS:
+            # Two requests computed the same view at once; keep the first.
+            return
+        _VIEWS[key] = positions
+        _VIEWS_BYTES += size
+        while _VIEWS_BYTES > _VIEWS_MAX_BYTES:
+            _VIEWS_BYTES -= _VIEWS.popitem(last=False)[1].nbytes
+
+
+def _views_clear():
+    """Empty the view cache. Used by tests."""
+    global _VIEWS_BYTES
+    with _VIEWS_LOCK:
+        _VIEWS.clear()
+        _VIEWS_BYTES = 0
+
+
+def apply_view(table, positions):
+    """`table` restricted to and ordered by `positions`; `table` itself for None."""
+    return table if positions is None else table.take(positions)
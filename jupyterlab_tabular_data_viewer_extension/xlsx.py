@@ -0,0 +1,797 @@
+"""A worksheet's cells, streamed from the xlsx package into column buffers.
+
+`readers._read_excel` took its rows from openpyxl's `iter_rows`, which builds
+a dict per cell, then a tuple per row, and kept every row in a list before a
+single column was typed - on a 500k x 40 sheet twenty million Python objects
+alive at once and several GB of peak RSS, for a table arrow holds in a few
+hundred MB. This reads the same parts of the package - the workbook, its
+relationships, the styles, the shared strings and the one worksheet - with
+expat, incrementally, and drops each cell's value straight into a per-column
+buffer. Every `_CHUNK_ROWS` rows a buffer whose values are all of one kind is
+converted to an arrow array, so only the current chunk is ever held as Python
+objects.
+
+What comes out is what openpyxl's read-only `iter_rows(values_only=True)`
+produced after `reset_dimensions()`, and the parsing below follows its
+reader's rules cell for cell: a `<row>` without `r` follows the previous one
+and rows it skips read as empty, a row is as long as its LAST cell (styled,
+valueless cells included), `t="n"` is an int unless its text carries '.', 'E'
+or 'e', a number styled with a date format goes through `from_excel` and one
+outside the calendar becomes '#VALUE!', and a shared string has openpyxl's
+'x005F_' escape removed. The date-format test, the serial-date conversion and
+the calendars are openpyxl's own functions, so the two cannot disagree on what
+a date is. The test suite reads a range of workbooks both ways and compares.
+
+The header row comes back raw and the data with `nulls` already mapped to
+None; naming and typing the columns is left to `readers`.
+"""
+
+import codecs
+import datetime as dt
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+import pyarrow as pa
+from openpyxl.styles.numbers import (
+    builtin_format_code,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    CALENDAR_WINDOWS_1900,
+    from_excel,
+    from_ISO8601,
+)
+
+# Rows per column buffer. A chunk of a text column is 8k string objects, which
+# bounds the Python-object working set at well under a MB per column
+_CHUNK_SHIFT = 13
+_CHUNK_ROWS = 1 << _CHUNK_SHIFT
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELATIONSHIPS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+_DOCUMENT_RELATIONSHIP = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+)
+
+# The workbook part's content types, in the order openpyxl looks for them
+_WORKBOOK_TYPES = (
+    "application/vnd.ms-excel.template.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.template.main+xml",
+    "application/vnd.ms-excel.sheet.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml",
+)
+_SHARED_STRINGS_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+)
+# openpyxl reads the styles from this fixed name, whatever the relationships say
+_STYLES_PART = "xl/styles.xml"
+
+# expat reports a namespaced element as "<namespace uri>}<local name>"
+_SEP = "}"
+_C = _MAIN + _SEP + "c"
+_V = _MAIN + _SEP + "v"
+_ROW = _MAIN + _SEP + "row"
+_IS = _MAIN + _SEP + "is"
+_SI = _MAIN + _SEP + "si"
+_T = _MAIN + _SEP + "t"
+_RPH = _MAIN + _SEP + "rPh"
+
+# The kinds of value a chunk holds, as bits. A chunk holding exactly one kind
+# (or integers and floats together, which polars widens to Float64 just as it
+# does a Python list of both) is kept as an arrow array; anything else stays a
+# list for `readers._column_series` to resolve, as every column used to.
+_INT = 1
+_FLOAT = 2
+_TEXT = 4
+_BOOL = 8
+_DATETIME = 16
+_OTHER = 32
+
+_ARROW_TYPES = {
+    _INT: pa.int64(),
+    _FLOAT: pa.float64(),
+    _INT | _FLOAT: pa.float64(),
+    _TEXT: pa.large_string(),
+    _BOOL: pa.bool_(),
+    _DATETIME: pa.timestamp("us"),
+}
+
+_DIGITS = "0123456789"
+
+# What a file that is not a well-formed xlsx package raises on the way in: not
+# a zip, a part the package names but lacks, or XML that does not parse
+_PACKAGE_ERRORS = (
+    zipfile.BadZipFile,
+    KeyError,
+    ElementTree.ParseError,
+    expat.ExpatError,
+)
+
+# The fast path's patterns: a cell as Excel, xlsxwriter and openpyxl all write
+# it - `r`, `s` and `t` in that order, a formula at most, then a <v> or a plain
+# inline string - and a shared string without runs. Anything else sends the
+# whole part to expat.
+_BLOCK_BYTES = 1 << 20
+_PROLOG = re.compile(r"\ufeff?(?:<\?xml([^>]*)\?>)?\s*")
+_UTF8 = re.compile(r"""encoding=["']utf-?8["']""", re.IGNORECASE)
+_FAST_TOKEN = re.compile(
+    r"\s*(?:"
+    r'<c r="([A-Z]{1,3})[0-9]+"(?: s="([0-9]+)")?(?: t="([A-Za-z]+)")?'
+    r'(?: (?:cm|vm|ph)="[0-9]+")* ?'
+    r"(?:/>|>(?:<f\b[^>]*?(?:/>|>[^<]*</f>))?"
+    r'(?:<v>([^<]*)</v>|<is><t(?: xml:space="preserve")?>([^<]*)</t></is>)?</c>)'
+    r'|<row r="([0-9]+)"[^>]*?(/?)>'
+    r"|(</row>)"
+    # Anything else: the first character of something only expat can read
+    r"|(\S))"
+)
+_FAST_SI = re.compile(r'\s*<si>(?:<t(?: xml:space="preserve")?>([^<]*)</t>|<t/>)</si>')
+_ENTITIES = {"amp": "&", "lt": "<", "gt": ">", "quot": '"', "apos": "'"}
+
+
+def _column_index(letters):
+    """1-based column number of a cell reference's letters: A is 1, AA is 27."""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _xml(archive, name):
+    return ElementTree.fromstring(archive.read(name))
+
+
+def _relationships(archive, part):
+    """Id -> (type, target path) of a part's relationships, as openpyxl does."""
+    folder, file_name = posixpath.split(part)
+    rels_part = posixpath.join(folder, "_rels", file_name + ".rels")
+    if rels_part not in archive.NameToInfo:
+        return {}
+    relationships = {}
+    for rel in _xml(archive, rels_part).iter(f"{{{_RELATIONSHIPS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        relationships[rel.get("Id")] = (rel.get("Type", ""), target)
+    return relationships
+
+
+def _package_parts(archive):
+    """The workbook part's path and the shared strings' path, or None for none."""
+    types = _xml(archive, "[Content_Types].xml")
+    overrides = {}
+    for override in types.iter(f"{{{_CONTENT_TYPES}}}Override"):
+        overrides.setdefault(override.get("ContentType"), override.get("PartName", ""))
+    workbook = next((overrides[t] for t in _WORKBOOK_TYPES if overrides.get(t)), None)
+    if workbook is None:
+        # Some writers declare the workbook's type as a default for .xml
+        defaults = {
+            d.get("ContentType") for d in types.iter(f"{{{_CONTENT_TYPES}}}Default")
+        }
+        if not defaults & set(_WORKBOOK_TYPES):
+            raise ValueError("File contains no valid workbook part")
+        workbook = "/xl/workbook.xml"
+    strings = overrides.get(_SHARED_STRINGS_TYPE)
+    return workbook[1:], strings[1:] if strings else None
+
+
+def worksheets(archive):
+    """(title, part path) of each worksheet, in workbook order; epoch; strings path.
+
+    Worksheets only, as openpyxl's `book.worksheets`: a chartsheet holds no
+    cells, and a sheet whose part is missing from the package is skipped.
+    """
+    workbook_part, strings_part = _package_parts(archive)
+    rels = _relationships(archive, workbook_part)
+    workbook = _xml(archive, workbook_part)
+    properties = workbook.find(f"{{{_MAIN}}}workbookPr")
+    date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+    sheets = []
+    for sheet in workbook.iter(f"{{{_MAIN}}}sheet"):
+        rel = rels.get(sheet.get(_DOCUMENT_RELATIONSHIP))
+        if rel is None:
+            continue
+        rel_type, target = rel
+        if target not in archive.NameToInfo or "chartsheet" in rel_type:
+            continue
+        sheets.append((sheet.get("name"), target))
+    epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+    return sheets, epoch, strings_part
+
+
+def _date_styles(archive):
+    """The cell style indices, as strings, formatted as dates and as durations."""
+    dates, durations = set(), set()
+    if _STYLES_PART not in archive.NameToInfo:
+        return dates, durations
+    styles = _xml(archive, _STYLES_PART)
+    custom = {}
+    number_formats = styles.find(f"{{{_MAIN}}}numFmts")
+    if number_formats is not None:
+        for number_format in number_formats.iter(f"{{{_MAIN}}}numFmt"):
+            custom[int(number_format.get("numFmtId", 0))] = number_format.get(
+                "formatCode"
+            )
+    cell_formats = styles.find(f"{{{_MAIN}}}cellXfs")
+    if cell_formats is None:
+        return dates, durations
+    for index, xf in enumerate(cell_formats.iter(f"{{{_MAIN}}}xf")):
+        format_id = int(xf.get("numFmtId", 0))
+        code = (
+            custom[format_id] if format_id in custom else builtin_format_code(format_id)
+        )
+        if is_date_format(code):
+            dates.add(str(index))
+        if is_timedelta_format(code):
+            durations.add(str(index))
+    return dates, durations
+
+
+def _shared_strings(archive, part):
+    """The shared string table, one entry per <si>, as openpyxl reads it."""
+    if part is None or part not in archive.NameToInfo:
+        return []
+    strings = []
+    with archive.open(part) as stream:
+        if _scan_fast(stream, "sst", "sst", "</si>", _fast_strings(strings)):
+            return strings
+
+    strings = []
+    text = []
+    collecting = False
+    phonetic = False
+
+    def start(name, attrs):
+        nonlocal text, collecting, phonetic
+        if name == _T:
+            collecting = not phonetic
+        elif name == _SI:
+            text = []
+        elif name == _RPH:
+            phonetic = True
+
+    def end(name):
+        nonlocal collecting, phonetic
+        if name == _T:
+            collecting = False
+        elif name == _SI:
+            strings.append("".join(text).replace("x005F_", ""))
+        elif name == _RPH:
+            phonetic = False
+
+    def data(chunk):
+        if collecting:
+            text.append(chunk)
+
+    with archive.open(part) as stream:
+        _parse(stream, start, end, data)
+    return strings
+
+
+def _fast_strings(strings):
+    """A `_scan_fast` scan appending each plain <si> to `strings`."""
+    match = _FAST_SI.match
+
+    def scan(text, pos, limit):
+        while pos < limit:
+            item = match(text, pos)
+            if item is None:
+                return limit if text[pos:limit].isspace() else -1
+            value = item[1] or ""
+            if "&" in value or "\r" in value:
+                value = _unescape(value)
+                if value is None:
+                    return -1
+            strings.append(value.replace("x005F_", ""))
+            pos = item.end()
+        return pos
+
+    return scan
+
+
+def _parse(stream, start, end, data):
+    parser = expat.ParserCreate(namespace_separator=_SEP)
+    parser.buffer_text = True
+    parser.buffer_size = 1 << 16
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = data
+    parser.ParseFile(stream)
+
+
+def _unescape(text):
+    """Text as expat reports it: line ends normalised and references replaced.
+
+    None for a reference only a DTD could define, which expat rejects.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if "&" not in text:
+        return text
+    pieces = text.split("&")
+    out = [pieces[0]]
+    for piece in pieces[1:]:
+        name, semicolon, rest = piece.partition(";")
+        if not semicolon:
+            return None
+        try:
+            if name in _ENTITIES:
+                out.append(_ENTITIES[name])
+            elif name.startswith("#x"):
+                out.append(chr(int(name[2:], 16)))
+            elif name.startswith("#"):
+                out.append(chr(int(name[1:])))
+            else:
+                return None
+        except (ValueError, OverflowError):
+            return None
+        out.append(rest)
+    return "".join(out)
+
+
+def _scan_fast(stream, root, container, item_close, scan):
+    """Hand `scan` the items of a part's `container` element, a block at a time.
+
+    True once every item is scanned. False as soon as the part is laid out in
+    a way the fast patterns do not cover - another encoding, a namespace
+    prefix, attributes in an unusual order, rich text - and the caller reads
+    it again with expat, which covers everything. `scan(text, pos, limit)`
+    consumes the whole items between the two offsets and returns where it
+    stopped, or -1 for something it does not recognise.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        text = decoder.decode(stream.read(_BLOCK_BYTES))
+        prolog = _PROLOG.match(text)
+        declaration = prolog[1] or ""
+        if "encoding" in declaration and not _UTF8.search(declaration):
+            return False
+        pos = prolog.end()
+        if not text.startswith(f'<{root} xmlns="{_MAIN}"', pos):
+            return False
+        opening = re.compile(rf"<{container}\b[^>]*?(/?)>")
+        while True:
+            opened = opening.search(text, pos)
+            if opened is not None:
+                break
+            more = stream.read(_BLOCK_BYTES)
+            if not more:
+                return False
+            text += decoder.decode(more)
+        if opened[1]:
+            return True
+        pos = opened.end()
+        closing = f"</{container}>"
+        while True:
+            stop = text.find(closing, pos)
+            if stop >= 0:
+                limit = stop
+            else:
+                limit = text.rfind(item_close)
+                limit = limit + len(item_close) if limit >= pos else pos
+            pos = scan(text, pos, limit)
+            if pos < 0:
+                return False
+            if stop >= 0:
+                return True
+            more = stream.read(_BLOCK_BYTES)
+            if not more:
+                return False
+            text = text[pos:] + decoder.decode(more)
+            pos = 0
+    except UnicodeDecodeError:
+        return False
+
+
+def _chunk_array(values, kinds):
+    """One chunk of a column as an arrow array when it holds one kind, else the list."""
+    arrow_type = _ARROW_TYPES.get(kinds)
+    if arrow_type is None:
+        return values
+    try:
+        return pa.array(values, type=arrow_type)
+    except (OverflowError, pa.ArrowException):
+        # An integer outside int64: polars widens it to Int128 or rejects it,
+        # and `_column_series` knows what to do with either
+        return values
+
+
+def _column(chunks, n_rows):
+    """A column's chunks joined: a ChunkedArray if it is one kind, else a list."""
+    last = (n_rows - 1) >> _CHUNK_SHIFT if n_rows else -1
+    kinds = 0
+    for index, (_, chunk_kinds) in chunks.items():
+        if index <= last:
+            kinds |= chunk_kinds
+    arrow_type = _ARROW_TYPES.get(kinds)
+    pieces = []
+    for index in range(last + 1):
+        length = min(_CHUNK_ROWS, n_rows - (index << _CHUNK_SHIFT))
+        values, _ = chunks.get(index, (None, 0))
+        if values is None:
+            pieces.append(None if arrow_type is None else pa.nulls(length, arrow_type))
+        elif arrow_type is None or isinstance(values, list):
+            arrow_type = None
+            pieces.append(values[:length])
+        else:
+            pieces.append(values.slice(0, length).cast(arrow_type, safe=False))
+    if arrow_type is not None:
+        return pa.chunked_array(pieces, type=arrow_type)
+    column = []
+    for index, piece in enumerate(pieces):
+        if piece is None:
+            length = min(_CHUNK_ROWS, n_rows - (index << _CHUNK_SHIFT))
+            column.extend([None] * length)
+        elif isinstance(piece, list):
+            column.extend(piece)
+        else:
+            column.extend(piece.to_pylist())
+    return column
+
+
+def sheet_names(file_path):
+    """Worksheet titles in workbook order, from the workbook part alone.
+
+    Only [Content_Types].xml, xl/workbook.xml and its relationships are read -
+    no styles, no shared strings, no sheet data. Raises ValueError for a file
+    that is not an xlsx package.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return [title for title, _ in worksheets(archive)[0]]
+    except _PACKAGE_ERRORS as e:
+        raise ValueError(f"Cannot read excel file: {e}")
+
+
+def read_sheet(file_path, sheet=None, nulls=frozenset()):
+    """The header row and columns of one worksheet, or (None, []) for no rows.
+
+    `sheet` is a worksheet title, or None for the first. The header row is a
+    list of the first row's raw values. Each column is a pyarrow ChunkedArray
+    when every value in it is of one kind, and otherwise a list of Python
+    values; either way it holds one entry per data row, with a string in
+    `nulls` read as None. Raises ValueError for a missing sheet and for a file
+    that is not an xlsx package.
+    """
+    return read_sheets(file_path, [sheet], nulls)[sheet]
+
+
+def read_sheets(file_path, sheets, nulls=frozenset()):
+    """`read_sheet` for several worksheets at once: {sheet: (header_row, columns)}.
+
+    One open of the package, one parse of its shared strings and styles, then
+    each worksheet part in turn - the shared parts are most of the cost of a
+    small sheet, and a workbook of twelve monthly tabs paid them twelve times.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            titled, epoch, strings_part = worksheets(archive)
+            if not titled:
+                # A workbook of nothing but chartsheets
+                raise ValueError("Workbook contains no worksheets")
+            parts = {}
+            for sheet in sheets:
+                if sheet is None:
+                    parts[sheet] = titled[0][1]
+                    continue
+                # First match, as openpyxl's own __getitem__ resolves it
+                parts[sheet] = next((p for title, p in titled if title == sheet), None)
+                if parts[sheet] is None:
+                    raise ValueError(f"Sheet not found: {sheet}")
+            strings = _shared_strings(archive, strings_part)
+            dates, durations = _date_styles(archive)
+            # Each part once, though None and its title both name the first
+            read = {}
+            for part in parts.values():
+                if part not in read:
+                    read[part] = _read_cells(
+                        archive, part, strings, dates, durations, epoch, nulls
+                    )
+            return {sheet: read[part] for sheet, part in parts.items()}
+    except _PACKAGE_ERRORS as e:
+        raise ValueError(f"Cannot read excel file: {e}")
+    except IndexError:
+        raise ValueError(
+            "Cannot read excel file: a cell refers past the shared strings"
+        )
+
+
+def _read_cells(archive, part, raw_strings, dates, durations, epoch, nulls):
+    """One worksheet part's header and columns. See `read_sheet`."""
+    sink = _column_sink(raw_strings, dates, durations, epoch, nulls)
+    with archive.open(part) as stream:
+        if _scan_fast(
+            stream, "worksheet", "sheetData", "</row>", _fast_cells(*sink[:3])
+        ):
+            return sink[3]()
+    sink = _column_sink(raw_strings, dates, durations, epoch, nulls)
+    with archive.open(part) as stream:
+        _parse(stream, *_expat_cells(*sink[:3]))
+    return sink[3]()
+
+
+def _fast_cells(begin_row, add_cell, end_row):
+    """A `_scan_fast` scan feeding each row's cells to a `_column_sink`."""
+    tokens = _FAST_TOKEN.findall
+    column_numbers = {}
+
+    def scan(text, pos, limit):
+        # One findall per block rather than a match per cell: the tuples are
+        # built in C, and the loop below is all the Python a cell costs
+        for letters, style, kind, value, inline, row, empty, row_end, other in tokens(
+            text, pos, limit
+        ):
+            if letters:
+                col = column_numbers.get(letters)
+                if col is None:
+                    col = column_numbers[letters] = _column_index(letters)
+                if not kind:
+                    kind = "n"
+                elif kind == "inlineStr":
+                    value = inline
+                if value and ("&" in value or "\r" in value):
+                    value = _unescape(value)
+                    if value is None:
+                        return -1
+                add_cell(col, kind, style or "0", value)
+            elif row:
+                begin_row(int(row))
+                if empty:
+                    end_row()
+            elif row_end:
+                end_row()
+            else:
+                return -1
+        return limit
+
+    return scan
+
+
+def _expat_cells(begin_row, add_cell, end_row):
+    """Expat handlers feeding a worksheet's cells to a `_column_sink`.
+
+    The reading of any worksheet XML: `_FAST_TOKEN` only covers the common
+    layout of it.
+    """
+    column_numbers = {}
+    # openpyxl's counters, for a <row> or <c> without a reference
+    row_counter = 0
+    col_counter = 0
+
+    # The cell being parsed. `value_text` is its <v>'s text, or for an inline
+    # string the text of its <is> - "" once an <is> is seen, so that an empty
+    # one reads as "" where a cell without one reads as None, as in openpyxl
+    cell_type = "n"
+    cell_style = "0"
+    cell_col = 0
+    value_text = None
+    phonetic = False
+    collecting = False
+
+    def start(name, attrs):
+        nonlocal cell_type, cell_style, cell_col, col_counter, value_text
+        nonlocal collecting, phonetic, row_counter
+        if name == _C:
+            reference = attrs.get("r")
+            if reference:
+                letters = reference.rstrip(_DIGITS)
+                col = column_numbers.get(letters)
+                if col is None:
+                    col = column_numbers[letters] = _column_index(letters)
+            else:
+                col = col_counter + 1
+            col_counter = cell_col = col
+            cell_type = attrs.get("t", "n")
+            cell_style = attrs.get("s", "0")
+            value_text = None
+        elif name == _V:
+            # An inline string's <v>, if it has one, is ignored
+            collecting = cell_type != "inlineStr"
+        elif name == _T:
+            collecting = cell_type == "inlineStr" and not phonetic
+        elif name == _IS:
+            if cell_type == "inlineStr":
+                value_text = ""
+        elif name == _ROW:
+            reference = attrs.get("r")
+            if reference:
+                try:
+                    row_counter = int(reference)
+                except ValueError:
+                    number = float(reference)
+                    if not number.is_integer():
+                        raise ValueError(f"{reference} is not a valid row number")
+                    row_counter = int(number)
+            else:
+                row_counter += 1
+            col_counter = 0
+            begin_row(row_counter)
+        elif name == _RPH:
+            phonetic = True
+
+    def end(name):
+        nonlocal collecting, phonetic
+        if name == _V or name == _T:
+            collecting = False
+        elif name == _C:
+            add_cell(cell_col, cell_type, cell_style, value_text)
+        elif name == _ROW:
+            end_row()
+        elif name == _RPH:
+            phonetic = False
+
+    def data(text):
+        nonlocal value_text
+        if collecting:
+            value_text = text if value_text is None else value_text + text
+
+    return start, end, data
+
+
+def _column_sink(raw_strings, dates, durations, epoch, nulls):
+    """Where a worksheet's rows go: (begin_row, add_cell, end_row, result).
+
+    `begin_row(number)`, `add_cell(column, t, s, text)` for each of its
+    cells, `end_row()`, in document order; `result()` is `read_sheet`'s.
+    """
+    strings = [None if s in nulls else s for s in raw_strings]
+    header = {}
+    header_width = 0
+    # column -> {chunk index: (array or list, kinds)}
+    chunks = {}
+    # column -> [this chunk's values, their kinds]
+    buffers = {}
+    chunk = 0
+
+    # The next row iter_rows would yield - a row numbered below it never is
+    next_row = 1
+    any_row = False
+
+    # The row being parsed: its position (0 is the header), slot in the
+    # chunk, last cell's column and leftmost cell holding a raw value
+    skip = True
+    position = -1
+    slot = 0
+    last_col = 0
+    first_raw = 0
+    out_of_order = False
+
+    # Widest row so far, and the widest and last of the rows the trailing
+    # trim keeps - the header and every row up to the last non-empty one
+    widest = 0
+    width = 0
+    last_position = 0
+
+    def flush():
+        nonlocal buffers
+        for col, (values, kinds) in buffers.items():
+            chunks.setdefault(col, {})[chunk] = (_chunk_array(values, kinds), kinds)
+        buffers = {}
+
+    def begin_row(number):
+        nonlocal next_row, any_row, skip, position, slot, chunk
+        nonlocal last_col, first_raw, out_of_order
+        skip = number < next_row
+        if skip:
+            return
+        any_row = True
+        next_row = number + 1
+        position = number - 1
+        if position:
+            index = (position - 1) >> _CHUNK_SHIFT
+            if index != chunk:
+                flush()
+                chunk = index
+            slot = (position - 1) & (_CHUNK_ROWS - 1)
+        last_col = 0
+        first_raw = 1 << 30
+        out_of_order = False
+
+    def add_cell(col, kind, style, text):
+        nonlocal last_col, first_raw, out_of_order
+        if skip:
+            return
+        if col < last_col:
+            out_of_order = True
+        last_col = col
+        if text is None:
+            return
+        if kind == "n":
+            if not text:
+                return
+            if "." in text or "E" in text or "e" in text:
+                value = float(text)
+                kind = _FLOAT
+            else:
+                value = int(text)
+                kind = _INT
+            if style in dates:
+                try:
+                    value = from_excel(value, epoch, timedelta=style in durations)
+                    kind = _DATETIME if type(value) is dt.datetime else _OTHER
+                except (OverflowError, ValueError):
+                    value = "#VALUE!"
+                    kind = _TEXT
+            mapped = None if kind == _TEXT and value in nulls else value
+        elif kind == "s":
+            if not text:
+                return
+            index = int(text)
+            value = raw_strings[index]
+            mapped = strings[index]
+            kind = _TEXT
+        elif kind == "b":
+            if not text:
+                return
+            value = mapped = bool(int(text))
+            kind = _BOOL
+        elif kind == "d":
+            if not text:
+                return
+            value = mapped = from_ISO8601(text)
+            kind = _DATETIME if type(value) is dt.datetime else _OTHER
+        else:
+            # "inlineStr", "str", "e" and anything unknown: the text itself.
+            # Only an inline string's may be "" - a bare <v></v> is None
+            if not text and kind != "inlineStr":
+                return
+            value = text
+            mapped = None if text in nulls else text
+            kind = _TEXT
+        if col < first_raw:
+            first_raw = col
+        if not position:
+            header[col] = value
+        elif mapped is not None:
+            buffer = buffers.get(col)
+            if buffer is None:
+                buffer = buffers[col] = [[None] * _CHUNK_ROWS, 0]
+            buffer[0][slot] = mapped
+            buffer[1] |= kind
+
+    def end_row():
+        nonlocal header_width, widest, width, last_position
+        if skip:
+            return
+        if out_of_order:
+            # A row is as long as its last cell, so a cell to the right of it
+            # is dropped - as openpyxl's `_get_row` drops it
+            if not position:
+                for col in [c for c in header if c > last_col]:
+                    del header[col]
+            else:
+                for col, buffer in buffers.items():
+                    if col > last_col and buffer[0][slot] is not None:
+                        # Its kind is already in the chunk's bits, so the
+                        # chunk is left for `_column_series` to type
+                        buffer[0][slot] = None
+                        buffer[1] |= _OTHER
+        if last_col > widest:
+            widest = last_col
+        if not position:
+            header_width = last_col
+            width = widest
+        elif first_raw <= last_col:
+            width = widest
+            last_position = position
+
+    def result():
+        flush()
+        if not any_row:
+            return None, []
+        header_row = [header.get(col) for col in range(1, header_width + 1)]
+        n_rows = last_position
+        return header_row, [
+            _column(chunks.get(col, {}), n_rows) for col in range(1, width + 1)
+        ]
+
+    return begin_row, add_cell, end_row, result
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Replay a read trace against the read cache: cost-aware ranking against LRU.
+
+Every access in the trace is one read through the cache - a file, its version,
+the bytes its table holds and the seconds a read of it took. Each is replayed
+twice at the same budget:
+
+- lru     the previous policy: evict the least recently used entry, admit all
+- gdsf    `readers._cache_put` and `_cache_get` themselves, driven with
+          stand-in tables that carry only `nbytes`
+
+A hit costs nothing; a miss costs the access's seconds. Reported per policy:
+the hit rate, and the total seconds spent reading, which is what a user waits.
+
+Record a real trace by starting the server with
+JUPYTERLAB_TABULAR_DATA_VIEWER_CACHE_TRACE=/some/file.jsonl and using it; each
+line is {"file", "version", "bytes", "seconds"}, paths hashed. Without --trace
+a seeded synthetic workload is replayed instead: many small parquet files that
+read in well under a second, some CSVs of a few seconds and a few workbooks
+that take most of a minute, opened with a skewed popularity. No other
+randomness, so two runs compare.
+
+Run with: python scripts/bench_cache_policy.py [--trace FILE] [--budget-mib N]
+"""
+
+import json
+import os
+import random
+import sys
+import types
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jupyterlab_tabular_data_viewer_extension import readers  # noqa: E402
+
+MIB = 1024 * 1024
+
+
+def synthetic_trace(accesses, seed=7):
+    """A deterministic mixed workload, as trace records."""
+    rng = random.Random(seed)
+    files = []
+    for i in range(40):
+        files.append((f"parquet-{i}", rng.randint(5, 60) * MIB, rng.uniform(0.05, 0.4)))
+    for i in range(12):
+        files.append((f"csv-{i}", rng.randint(20, 120) * MIB, rng.uniform(1.0, 6.0)))
+    for i in range(5):
+        files.append(
+            (f"excel-{i}", rng.randint(30, 150) * MIB, rng.uniform(20.0, 60.0))
+        )
+    rng.shuffle(files)
+    # Zipf-like popularity over the shuffled files
+    weights = [1.0 / (rank + 1) ** 0.9 for rank in range(len(files))]
+    for name, size, seconds in rng.choices(files, weights, k=accesses):
+        yield {"file": name, "version": "0", "bytes": size, "seconds": seconds}
+
+
+def load_trace(path):
+    with open(path) as trace:
+        return [json.loads(line) for line in trace if line.strip()]
+
+
+def replay_lru(trace, budget):
+    """The eviction policy `_cache_put` had before cost-aware ranking."""
+    cache = OrderedDict()
+    used = hits = 0
+    seconds = 0.0
+    for access in trace:
+        key = (access["file"], access["version"])
+        if key in cache:
+            cache.move_to_end(key)
+            hits += 1
+            continue
+        seconds += access["seconds"]
+        for stale in [k for k in cache if k[0] == key[0]]:
+            used -= cache.pop(stale)
+        if access["bytes"] > budget:
+            continue
+        cache[key] = access["bytes"]
+        used += access["bytes"]
+        while used > budget:
+            used -= cache.popitem(last=False)[1]
+    return hits, seconds
+
+
+def replay_gdsf(trace, budget):
+    """The read cache's own bookkeeping, with stand-in tables."""
+    readers._cache_clear()
+    saved = readers._CACHE_MAX_BYTES
+    readers._CACHE_MAX_BYTES = budget
+    hits = 0
+    seconds = 0.0
+    try:
+        for access in trace:
+            key = (access["file"], None, access["version"], 0, (0, 0))
+            if readers._cache_get(key) is not None:
+                hits += 1
+                continue
+            seconds += access["seconds"]
+            table = types.SimpleNamespace(nbytes=access["bytes"])
+            readers._cache_put(key, table, access["seconds"])
+    finally:
+        readers._CACHE_MAX_BYTES = saved
+        readers._cache_clear()
+    return hits, seconds
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSONL trace; synthetic when omitted")
+    parser.add_argument("--budget-mib", type=int, default=256)
+    parser.add_argument("--accesses", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+        source = args.trace
+    else:
+        trace = list(synthetic_trace(args.accesses))
+        source = "synthetic workload"
+    budget = args.budget_mib * MIB
+
+    print(f"{len(trace)} accesses from {source}, {args.budget_mib} MiB budget")
+    results = [
+        ("lru", *replay_lru(trace, budget)),
+        ("gdsf", *replay_gdsf(trace, budget)),
+    ]
+    for label, hits, seconds in results:
+        print(
+            f"  {label:<6} hit rate {hits / max(len(trace), 1):6.1%}"
+            f"   read time {seconds:10.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
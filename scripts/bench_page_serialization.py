@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Time the data handler's page serialization: per-cell loop against per-column.
+
+Builds one page of a wide, mixed-type table - 500 rows x 200 columns by default,
+cycling integer, float, text, timestamp, date and boolean columns with a few
+NaN, null and past-2**53 values in each - and serializes it three ways:
+
+- loop      the previous serializer: `column(name)[i].as_py()` and
+            `convert_to_json_serializable` for every cell
+- rows      `serialize.page_rows`, the handler's default row layout
+- columns   `serialize.page_columns`, the columnar layout
+
+Each is timed to the finished JSON string, best of --repeat runs, and the
+first two are checked to produce the identical body. No randomness, so two
+runs on one machine compare. Run with: python scripts/bench_page_serialization.py
+"""
+
+import datetime as dt
+import json
+import os
+import sys
+import time
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jupyterlab_tabular_data_viewer_extension.serialize import (  # noqa: E402
+    convert_to_json_serializable,
+    page_columns,
+    page_rows,
+)
+
+
+def make_page(rows, columns):
+    """A deterministic mixed-type table of the given shape."""
+    base = dt.datetime(2024, 1, 1)
+    makers = [
+        lambda r, c: None if r % 97 == 0 else (2**53 + r if r % 131 == 0 else r * c),
+        lambda r, c: float("nan") if r % 89 == 0 else r / (c + 1),
+        lambda r, c: None if r % 83 == 0 else f"value {r} of column {c}",
+        lambda r, c: base + dt.timedelta(seconds=r * 37 + c, microseconds=r % 3),
+        lambda r, c: (base + dt.timedelta(days=r + c)).date(),
+        lambda r, c: None if r % 79 == 0 else (r + c) % 2 == 0,
+    ]
+    return pa.table(
+        {
+            f"c{c}": [makers[c % len(makers)](r, c) for r in range(rows)]
+            for c in range(columns)
+        }
+    )
+
+
+def loop_body(table):
+    """The serializer this replaced, kept here as the baseline."""
+    data = []
+    for i in range(len(table)):
+        row = {}
+        for name in table.column_names:
+            row[name] = convert_to_json_serializable(table.column(name)[i].as_py())
+        row["__row_index__"] = i + 1
+        data.append(row)
+    return json.dumps({"data": data})
+
+
+def rows_body(table):
+    return json.dumps({"data": page_rows(table, range(1, len(table) + 1))})
+
+
+def columns_body(table):
+    return json.dumps(
+        {"columns": page_columns(table), "rowIndex": list(range(1, len(table) + 1))}
+    )
+
+
+def best_of(fn, table, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(table)
+        times.append(time.perf_counter() - start)
+    return min(times), body
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = make_page(args.rows, args.columns)
+    loop_time, loop_json = best_of(loop_body, table, args.repeat)
+    rows_time, rows_json = best_of(rows_body, table, args.repeat)
+    columns_time, columns_json = best_of(columns_body, table, args.repeat)
+
+    if rows_json != loop_json:
+        sys.exit("row layout differs from the per-cell loop")
+
+    print(f"{args.rows} rows x {args.columns} columns, best of {args.repeat}")
+    for label, seconds, body in (
+        ("loop", loop_time, loop_json),
+        ("rows", rows_time, rows_json),
+        ("columns", columns_time, columns_json),
+    ):
+        print(
+            f"  {label:<8} {seconds * 1000:8.1f} ms  {len(body) / 1024:8.0f} KiB"
+            f"  x{loop_time / seconds:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
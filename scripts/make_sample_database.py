@@ -11,6 +11,11 @@ Four user tables cover every branch of the SQLite datasource:
 
 No randomness and no current timestamps - re-running rebuilds the same
 logical content. Run with: python scripts/make_sample_database.py
+
+The other builders write generated files for tests and benchmarks that need
+more than the fixture: a BLOB-heavy database, a nullable INTEGER column, and
+(`build_benchmark_files`) one table at benchmark scale in every format the
+viewer reads - see benchmarks/.
 """
 
 import os
@@ -69,7 +74,7 @@ ATTACHMENTS = [
 
 MIXED_TYPES = [
     (1, 42, "integer reading"),
-    (2, "n/a", "string sentinel"),
+    (2, "pending", "string sentinel"),
     (3, 17, "integer reading"),
     (4, "pending", "string sentinel"),
     (5, 3, "integer reading"),
@@ -241,6 +246,174 @@ def build_nullable_database(path):
         conn.close()
 
 
+# The worksheet row limit, less the header row
+XLSX_MAX_DATA_ROWS = 1_048_575
+
+BENCHMARK_FORMATS = ("parquet", "csv", "tsv", "xlsx", "sqlite")
+
+BENCHMARK_CITIES = [c[2] for c in CUSTOMERS]
+
+# Columns of the "wide" shape
+WIDE_COLUMNS = 250
+
+
+def benchmark_frame(rows, shape="mixed"):
+    """A deterministic polars frame of `rows` rows, built without Python loops.
+
+    "mixed" is seven columns of the kinds the readers type differently: int,
+    float with nulls, a low-cardinality and a unique string, a timestamp, a
+    boolean, and `code` - integers as text with "pending" every 1000th row from
+    row 150 on. That last one is the infer_schema_length trap: the first string
+    lands past the 100-row inference window, so a reader that stops inferring
+    early fails on it (see `readers`). "wide" is `WIDE_COLUMNS` numeric columns.
+    """
+    import polars as pl
+
+    index = pl.int_range(0, rows, dtype=pl.Int64)
+    if shape == "wide":
+        return pl.select(
+            [
+                ((index * (c + 7919)) % 100_003).alias(f"i{c}")
+                if c % 2 == 0
+                else ((index * (c + 31)) % 10_007 / 7).alias(f"f{c}")
+                for c in range(WIDE_COLUMNS)
+            ]
+        )
+    return pl.select(index.alias("id")).with_columns(
+        amount=pl.when(pl.col("id") % 97 == 0)
+        .then(None)
+        .otherwise((pl.col("id") * 7919 % 100_000) / 100),
+        city=pl.lit(pl.Series(BENCHMARK_CITIES)).gather(
+            pl.col("id") % len(BENCHMARK_CITIES)
+        ),
+        label=pl.format("item-{}", pl.col("id")),
+        created=pl.datetime(2024, 1, 1) + pl.duration(seconds=pl.col("id")),
+        active=pl.col("id") % 3 == 0,
+        code=pl.when(pl.col("id") % 1000 == 150)
+        .then(pl.lit("pending"))
+        .otherwise((pl.col("id") * 13 % 10_000).cast(pl.String)),
+    )
+
+
+def _write_xlsx(frame, path):
+    """Write `frame` as one worksheet, numeric text in `code` as numbers.
+
+    Through xlsxwriter's constant_memory mode rather than polars' write_excel,
+    so a million-row sheet is streamed, and so `code` holds real numeric cells
+    beside its "pending" strings - a mixed column, as a hand-kept workbook has.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        sheet = workbook.add_worksheet("data")
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+        sheet.write_row(0, 0, frame.columns)
+        code = frame.columns.index("code") if "code" in frame.columns else -1
+        for r, row in enumerate(frame.iter_rows(), start=1):
+            for c, value in enumerate(row):
+                if c == code and value.isdigit():
+                    sheet.write_number(r, c, int(value))
+                elif hasattr(value, "year"):
+                    sheet.write_datetime(r, c, value, date_format)
+                elif value is not None:
+                    sheet.write(r, c, value)
+    finally:
+        workbook.close()
+
+
+def _write_benchmark_sqlite(frame, path, shape):
+    """The frame as table `data`; for "mixed", a BLOB table beside it.
+
+    `code` is declared with no type affinity and its numbers inserted as
+    integers, so they stay INTEGER beside the TEXT "pending" - a storage class
+    per value, as SQLite allows.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        declared = {"id": "INTEGER", "amount": "REAL", "active": "INTEGER", "code": ""}
+        default = "REAL" if shape == "wide" else "TEXT"
+        columns = ", ".join(
+            f'"{name}" {declared.get(name, default)}'.rstrip() for name in frame.columns
+        )
+        conn.execute(f"CREATE TABLE data ({columns})")
+        rows = frame.iter_rows()
+        if "code" in frame.columns:
+            import polars as pl
+
+            rows = frame.with_columns(
+                pl.col("created").dt.to_string("%Y-%m-%d %H:%M:%S")
+            ).iter_rows()
+            code = frame.columns.index("code")
+            rows = (
+                row[:code] + (int(row[code]) if row[code].isdigit() else row[code],)
+                for row in rows
+            )
+        marks = ", ".join("?" * len(frame.columns))
+        conn.executemany(f"INSERT INTO data VALUES ({marks})", rows)
+        if shape == "mixed":
+            conn.execute(
+                "CREATE TABLE payloads "
+                "(id INTEGER PRIMARY KEY, name TEXT, content BLOB)"
+            )
+            conn.executemany(
+                "INSERT INTO payloads VALUES (?, ?, ?)",
+                (
+                    (i, "file_%07d.bin" % i, blob(64 << (i % 7)))
+                    for i in range(max(frame.height // 10, 1))
+                ),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def build_benchmark_files(directory, rows, shape="mixed", formats=BENCHMARK_FORMATS):
+    """Write the benchmark table as `<shape>_<rows>.<ext>` in each format.
+
+    Files already present are kept - generation at ten million rows takes
+    minutes - so delete the directory after changing this code. xlsx is not
+    written past the worksheet row limit. Returns {format: path} of the files
+    that exist.
+    """
+    os.makedirs(directory, exist_ok=True)
+    extensions = {
+        "parquet": "parquet",
+        "csv": "csv",
+        "tsv": "tsv",
+        "xlsx": "xlsx",
+        "sqlite": "db",
+    }
+    frame = None
+    paths = {}
+    for fmt in formats:
+        if fmt == "xlsx" and rows > XLSX_MAX_DATA_ROWS:
+            continue
+        path = os.path.join(directory, f"{shape}_{rows}.{extensions[fmt]}")
+        paths[fmt] = path
+        if os.path.exists(path):
+            continue
+        if frame is None:
+            frame = benchmark_frame(rows, shape)
+        # Written under a temporary name, so an interrupted run leaves no
+        # truncated file behind to be mistaken for a finished one
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        if fmt == "parquet":
+            frame.write_parquet(partial)
+        elif fmt in ("csv", "tsv"):
+            frame.write_csv(partial, separator="," if fmt == "csv" else "\t")
+        elif fmt == "xlsx":
+            _write_xlsx(frame, partial)
+        else:
+            _write_benchmark_sqlite(frame, partial, shape)
+        os.replace(partial, path)
+    return paths
+
+
 def main():
     import argparse
 
@@ -267,8 +440,32 @@ def main():
         metavar="PATH",
         help="write a small database with a nullable INTEGER column here",
     )
+    parser.add_argument(
+        "--bench-dir",
+        metavar="DIR",
+        help="write the benchmark table in every format here instead",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=10_000,
+        help="rows of the benchmark table for --bench-dir (default 10000)",
+    )
+    parser.add_argument(
+        "--shape",
+        choices=("mixed", "wide"),
+        default="mixed",
+        help="columns of the benchmark table for --bench-dir (default mixed)",
+    )
     args = parser.parse_args()
 
+    if args.bench_dir:
+        for fmt, path in build_benchmark_files(
+            args.bench_dir, args.rows, args.shape
+        ).items():
+            print("wrote %s (%d bytes)" % (path, os.path.getsize(path)))
+        return
+
     if args.nullable_db:
         build_nullable_database(args.nullable_db)
         print(
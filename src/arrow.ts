@@ -0,0 +1,343 @@
+/**
+ * A reader for the Arrow IPC stream the `data/arrow` endpoint sends.
+ *
+ * Not a general Arrow implementation: the server puts every page in a fixed,
+ * small set of types first (see `serialize.ipc_column`) - null, boolean,
+ * 8/16/32/64-bit integers, float32/float64 and utf8 - and this reads exactly
+ * those, from an uncompressed little-endian stream. That is a few hundred
+ * lines of flatbuffer walking instead of a dependency the size of the rest of
+ * the extension.
+ *
+ * Values come out as the grid displays them: an integer a double holds
+ * exactly as a number and any other as its exact decimal digits, and NaN or
+ * +/-Infinity as null - the same values the JSON layouts carry, read without
+ * a text parse.
+ */
+
+// Union tags of `Message.header` and `Field.type` in the Arrow schema files
+const HEADER_SCHEMA = 1;
+const HEADER_RECORD_BATCH = 3;
+const TYPE_NULL = 1;
+const TYPE_INT = 2;
+const TYPE_FLOAT = 3;
+const TYPE_UTF8 = 5;
+const TYPE_BOOL = 6;
+
+const FLOAT_SINGLE = 1;
+const FLOAT_DOUBLE = 2;
+
+// The bound of `_JS_EXACT_INTEGER` on the server, so both transports agree on
+// which integers arrive as digits
+const MAX_EXACT = BigInt(2 ** 53);
+const MIN_EXACT = -MAX_EXACT;
+
+/**
+ * One column of the stream's schema
+ */
+interface IArrowField {
+  name: string;
+  typeId: number;
+  bitWidth: number;
+  signed: boolean;
+}
+
+/**
+ * A decoded stream: the column values by name, in schema order, plus the
+ * schema's key/value metadata
+ */
+export interface IArrowTable {
+  names: string[];
+  columns: Record<string, unknown[]>;
+  metadata: Record<string, string>;
+  numRows: number;
+}
+
+/**
+ * Position-based access to one flatbuffer table
+ */
+class FlatTable {
+  constructor(view: DataView, position: number) {
+    this.view = view;
+    this.position = position;
+    this.vtable = position - view.getInt32(position, true);
+  }
+
+  /**
+   * Absolute position of field `index`, or 0 when it is absent
+   */
+  field(index: number): number {
+    const entry = 4 + 2 * index;
+    if (entry >= this.view.getUint16(this.vtable, true)) {
+      return 0;
+    }
+    const offset = this.view.getUint16(this.vtable + entry, true);
+    return offset === 0 ? 0 : this.position + offset;
+  }
+
+  uint8(index: number, fallback = 0): number {
+    const at = this.field(index);
+    return at ? this.view.getUint8(at) : fallback;
+  }
+
+  int16(index: number, fallback = 0): number {
+    const at = this.field(index);
+    return at ? this.view.getInt16(at, true) : fallback;
+  }
+
+  int32(index: number, fallback = 0): number {
+    const at = this.field(index);
+    return at ? this.view.getInt32(at, true) : fallback;
+  }
+
+  int64(index: number): number {
+    const at = this.field(index);
+    return at ? Number(this.view.getBigInt64(at, true)) : 0;
+  }
+
+  /**
+   * The table a table-valued (or union-valued) field points at
+   */
+  table(index: number): FlatTable | null {
+    const at = this.field(index);
+    return at ? new FlatTable(this.view, indirect(this.view, at)) : null;
+  }
+
+  string(index: number): string {
+    const at = this.field(index);
+    return at ? readString(this.view, indirect(this.view, at)) : '';
+  }
+
+  /**
+   * Length and first element position of a vector field
+   */
+  vector(index: number): [number, number] {
+    const at = this.field(index);
+    if (!at) {
+      return [0, 0];
+    }
+    const start = indirect(this.view, at);
+    return [this.view.getUint32(start, true), start + 4];
+  }
+
+  /**
+   * The tables of a vector-of-tables field
+   */
+  tables(index: number): FlatTable[] {
+    const [length, start] = this.vector(index);
+    const result: FlatTable[] = [];
+    for (let i = 0; i < length; i++) {
+      const at = start + 4 * i;
+      result.push(new FlatTable(this.view, indirect(this.view, at)));
+    }
+    return result;
+  }
+
+  readonly view: DataView;
+  readonly position: number;
+  readonly vtable: number;
+}
+
+function indirect(view: DataView, at: number): number {
+  return at + view.getUint32(at, true);
+}
+
+const utf8 = new TextDecoder('utf-8');
+
+function readString(view: DataView, at: number): string {
+  const length = view.getUint32(at, true);
+  return utf8.decode(
+    new Uint8Array(view.buffer, view.byteOffset + at + 4, length)
+  );
+}
+
+function readField(field: FlatTable): IArrowField {
+  const typeId = field.uint8(2);
+  const type = field.table(3);
+  let bitWidth = 0;
+  let signed = false;
+  if (typeId === TYPE_INT && type) {
+    bitWidth = type.int32(0);
+    signed = type.uint8(1) !== 0;
+  } else if (typeId === TYPE_FLOAT && type) {
+    const precision = type.int16(0);
+    if (precision !== FLOAT_SINGLE && precision !== FLOAT_DOUBLE) {
+      throw new Error('Unsupported Arrow half-precision float column');
+    }
+    bitWidth = precision === FLOAT_SINGLE ? 32 : 64;
+  }
+  const supported = [TYPE_NULL, TYPE_INT, TYPE_FLOAT, TYPE_UTF8, TYPE_BOOL];
+  if (!supported.includes(typeId)) {
+    throw new Error(
+      `Unsupported Arrow type ${typeId} for column ${field.string(0)}`
+    );
+  }
+  return { name: field.string(0), typeId, bitWidth, signed };
+}
+
+function readMetadata(schema: FlatTable): Record<string, string> {
+  const metadata: Record<string, string> = {};
+  for (const entry of schema.tables(2)) {
+    metadata[entry.string(0)] = entry.string(1);
+  }
+  return metadata;
+}
+
+/**
+ * An integer as a number when a double holds it exactly, else its digits
+ */
+function exactInteger(value: bigint): number | string {
+  return value > MAX_EXACT || value < MIN_EXACT
+    ? value.toString()
+    : Number(value);
+}
+
+/**
+ * Read the `count` values of one column from a record batch body
+ */
+function readColumn(
+  field: IArrowField,
+  count: number,
+  nullCount: number,
+  nextBuffer: () => DataView
+): unknown[] {
+  const values: unknown[] = new Array(count).fill(null);
+  if (field.typeId === TYPE_NULL) {
+    // A null column has no buffers at all
+    return values;
+  }
+  const validity = nextBuffer();
+  const isValid = (i: number): boolean =>
+    nullCount === 0 ||
+    validity.byteLength === 0 ||
+    (validity.getUint8(i >> 3) & (1 << (i & 7))) !== 0;
+
+  if (field.typeId === TYPE_UTF8) {
+    const offsets = nextBuffer();
+    const data = nextBuffer();
+    const bytes = new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+    for (let i = 0; i < count; i++) {
+      if (isValid(i)) {
+        const start = offsets.getInt32(4 * i, true);
+        const end = offsets.getInt32(4 * i + 4, true);
+        values[i] = utf8.decode(bytes.subarray(start, end));
+      }
+    }
+    return values;
+  }
+
+  const data = nextBuffer();
+  for (let i = 0; i < count; i++) {
+    if (!isValid(i)) {
+      continue;
+    }
+    if (field.typeId === TYPE_BOOL) {
+      values[i] = (data.getUint8(i >> 3) & (1 << (i & 7))) !== 0;
+    } else if (field.typeId === TYPE_FLOAT) {
+      const value =
+        field.bitWidth === 32
+          ? data.getFloat32(4 * i, true)
+          : data.getFloat64(8 * i, true);
+      values[i] = Number.isFinite(value) ? value : null;
+    } else if (field.bitWidth === 64) {
+      values[i] = exactInteger(
+        field.signed
+          ? data.getBigInt64(8 * i, true)
+          : data.getBigUint64(8 * i, true)
+      );
+    } else if (field.bitWidth === 32) {
+      values[i] = field.signed
+        ? data.getInt32(4 * i, true)
+        : data.getUint32(4 * i, true);
+    } else if (field.bitWidth === 16) {
+      values[i] = field.signed
+        ? data.getInt16(2 * i, true)
+        : data.getUint16(2 * i, true);
+    } else {
+      values[i] = field.signed ? data.getInt8(i) : data.getUint8(i);
+    }
+  }
+  return values;
+}
+
+/**
+ * Decode an Arrow IPC stream of the types listed above
+ *
+ * @param buffer The whole response body
+ * @returns Every column's values across all record batches, and the schema
+ *   metadata
+ */
+export function decodeArrowStream(buffer: ArrayBuffer): IArrowTable {
+  const view = new DataView(buffer);
+  let fields: IArrowField[] = [];
+  let metadata: Record<string, string> = {};
+  const columns: unknown[][] = [];
+  let numRows = 0;
+  let at = 0;
+
+  while (at + 4 <= view.byteLength) {
+    // Each message is framed as [0xFFFFFFFF] <int32 length> <flatbuffer>
+    // <body>; streams from before the continuation marker omit the first word
+    let length = view.getInt32(at, true);
+    at += 4;
+    if (length === -1) {
+      length = view.getInt32(at, true);
+      at += 4;
+    }
+    if (length === 0) {
+      break; // end of stream
+    }
+    const messageView = new DataView(buffer, at, length);
+    const message = new FlatTable(messageView, messageView.getUint32(0, true));
+    at += length;
+    const headerType = message.uint8(1);
+    const header = message.table(2);
+    const bodyLength = message.int64(3);
+    const body = at;
+    at += bodyLength;
+    if (!header) {
+      continue;
+    }
+
+    if (headerType === HEADER_SCHEMA) {
+      fields = header.tables(1).map(readField);
+      metadata = readMetadata(header);
+      fields.forEach(() => columns.push([]));
+    } else if (headerType === HEADER_RECORD_BATCH) {
+      if (header.field(3)) {
+        throw new Error('Compressed Arrow record batches are not supported');
+      }
+      const count = header.int64(0);
+      const [, nodes] = header.vector(1);
+      const [, buffers] = header.vector(2);
+      let nextIndex = 0;
+      const nextBuffer = (): DataView => {
+        // Buffer structs are {offset: int64, length: int64}, in field order
+        const entry = buffers + 16 * nextIndex++;
+        const offset = Number(header.view.getBigInt64(entry, true));
+        const size = Number(header.view.getBigInt64(entry + 8, true));
+        return new DataView(buffer, body + offset, size);
+      };
+      fields.forEach((field, i) => {
+        // FieldNode structs are {length: int64, null_count: int64}
+        const nullCount = Number(
+          header.view.getBigInt64(nodes + 16 * i + 8, true)
+        );
+        const values = readColumn(field, count, nullCount, nextBuffer);
+        columns[i] = columns[i].concat(values);
+      });
+      numRows += count;
+    }
+    // Dictionary batches never occur: the server decodes dictionaries first
+  }
+
+  const byName: Record<string, unknown[]> = {};
+  fields.forEach((field, i) => {
+    byName[field.name] = columns[i];
+  });
+  return {
+    names: fields.map(field => field.name),
+    columns: byName,
+    metadata,
+    numRows
+  };
+}
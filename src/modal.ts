@@ -17,6 +17,16 @@ export class ColumnStatsModal extends Widget {
     this._setupEventListeners();
   }
 
+  /**
+   * Replace the statistics shown, e.g. a partial answer with the full one
+   */
+  update(stats: IColumnStats, uniqueValues: IUniqueValues | null = null): void {
+    this._stats = stats;
+    this._uniqueValues = uniqueValues;
+    this.node.replaceChildren();
+    this._render();
+  }
+
   /**
    * Render the modal content
    */
@@ -65,7 +75,11 @@ export class ColumnStatsModal extends Widget {
       <li>Total rows: ${this._formatNumber(this._stats.total_rows)}</li>
       <li>Non-null: ${this._formatNumber(this._stats.non_null_count)} (${this._stats.non_null_percentage}%)</li>
       <li>Null: ${this._formatNumber(this._stats.null_count)} (${this._stats.null_percentage}%)</li>
-      <li>Unique values: ${this._formatNumber(this._stats.unique_count)} (${this._stats.unique_percentage}%)</li>
+      <li>Unique values: ${
+        this._stats.unique_count !== undefined
+          ? `${this._formatNumber(this._stats.unique_count)} (${this._stats.unique_percentage}%)`
+          : 'computing…'
+      }</li>
     `;
     summarySection.appendChild(summaryList);
     content.appendChild(summarySection);
@@ -189,7 +203,7 @@ export class ColumnStatsModal extends Widget {
       // Info about showing limited values (only if limited)
       const showing = this._uniqueValues.values.length;
       const totalUnique = this._stats.unique_count;
-      if (showing < totalUnique) {
+      if (totalUnique !== undefined && showing < totalUnique) {
         const info = document.createElement('div');
         info.className = 'jp-ColumnStatsModal-info';
         info.textContent = `Showing ${showing} of ${totalUnique} unique values`;
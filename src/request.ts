@@ -2,6 +2,8 @@ import { URLExt } from '@jupyterlab/coreutils';
 
 import { ServerConnection } from '@jupyterlab/services';
 
+import { decodeArrowStream } from './arrow';
+
 /**
  * Call the server extension
  *
@@ -50,6 +52,104 @@ export async function requestAPI<T>(
   return data;
 }
 
+/**
+ * One page from the `data` endpoint in its columnar layout: each column's
+ * values as one array, and each row's 1-indexed file position in `rowIndex`
+ */
+export interface IColumnarPage {
+  layout: 'columns';
+  columns: Record<string, unknown[]>;
+  rowIndex: number[];
+  offset: number;
+  limit: number;
+  totalRows: number;
+  hasMore: boolean;
+}
+
+/**
+ * Rebuild the row objects the grid renders from a columnar page, with each
+ * row's file position under `__row_index__`
+ *
+ * @param page A page requested with `layout: 'columns'`
+ * @returns One object per row, keyed by column name
+ */
+export function pageRows(page: IColumnarPage): Record<string, unknown>[] {
+  const names = Object.keys(page.columns);
+  return page.rowIndex.map((rowIndex, i) => {
+    const row: Record<string, unknown> = {};
+    for (const name of names) {
+      row[name] = page.columns[name][i];
+    }
+    row.__row_index__ = rowIndex;
+    return row;
+  });
+}
+
+/**
+ * Fetch one grid page from the `data/arrow` endpoint, as an Arrow IPC stream
+ *
+ * The page comes back in the columnar shape `pageRows` takes, with the same
+ * values the JSON layouts carry, but without a JSON encode on the server or a
+ * `JSON.parse` here. Failures still answer with a JSON `{"error": ...}` body.
+ *
+ * @param body The same request body the `data` endpoint takes
+ * @returns The page, decoded
+ */
+export async function fetchArrowPage(
+  body: Record<string, unknown>
+): Promise<IColumnarPage> {
+  const settings = ServerConnection.makeSettings();
+  const requestUrl = URLExt.join(
+    settings.baseUrl,
+    'jupyterlab-tabular-data-viewer-extension',
+    'data',
+    'arrow'
+  );
+
+  let response: Response;
+  try {
+    response = await ServerConnection.makeRequest(
+      requestUrl,
+      { method: 'POST', body: JSON.stringify(body) },
+      settings
+    );
+  } catch (error) {
+    throw new ServerConnection.NetworkError(error as any);
+  }
+
+  if (!response.ok) {
+    let data: any = await response.text();
+    try {
+      data = JSON.parse(data);
+    } catch (error) {
+      console.log('Not a JSON response body.', response);
+    }
+    throw new ServerConnection.ResponseError(
+      response,
+      data?.error || data?.message || data
+    );
+  }
+
+  const table = decodeArrowStream(await response.arrayBuffer());
+  const columns: Record<string, unknown[]> = {};
+  for (const name of table.names) {
+    if (name !== '__row_index__') {
+      columns[name] = table.columns[name];
+    }
+  }
+  // The page fields ride in the schema metadata, each JSON-encoded
+  const field = (key: string): any => JSON.parse(table.metadata[key]);
+  return {
+    layout: 'columns',
+    columns,
+    rowIndex: table.columns.__row_index__ as number[],
+    offset: field('offset'),
+    limit: field('limit'),
+    totalRows: field('totalRows'),
+    hasMore: field('hasMore')
+  };
+}
+
 /**
  * Column statistics interface
  */
@@ -61,8 +161,12 @@ export interface IColumnStats {
   non_null_percentage: number;
   null_count: number;
   null_percentage: number;
-  unique_count: number;
-  unique_percentage: number;
+  // Absent from a partial (footer-only) answer
+  unique_count?: number;
+  unique_percentage?: number;
+  // Set when the answer came from a parquet footer without a scan: null
+  // counts and ranges only, with the full statistics still to fetch
+  partial?: boolean;
   // Numeric stats
   min_value?: number;
   max_value?: number;
@@ -91,12 +195,15 @@ export interface IColumnStats {
  * @param filePath Path to the data file
  * @param columnName Name of column to analyze
  * @param sheet Active sheet name (optional, multi-sheet Excel only)
+ * @param quick Accept a partial answer read from a parquet footer, which
+ *   returns at once; other sources answer with the full statistics anyway
  * @returns Column statistics
  */
 export async function fetchColumnStats(
   filePath: string,
   columnName: string,
-  sheet?: string | null
+  sheet?: string | null,
+  quick: boolean = false
 ): Promise<IColumnStats> {
   const body: Record<string, unknown> = {
     path: filePath,
@@ -105,6 +212,9 @@ export async function fetchColumnStats(
   if (sheet) {
     body.sheet = sheet;
   }
+  if (quick) {
+    body.quick = true;
+  }
   return requestAPI<IColumnStats>('column-stats', {
     method: 'POST',
     body: JSON.stringify(body)
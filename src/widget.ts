@@ -1,5 +1,11 @@
 import { Widget } from '@lumino/widgets';
-import { requestAPI, fetchColumnStats, fetchUniqueValues } from './request';
+import {
+  requestAPI,
+  fetchColumnStats,
+  fetchUniqueValues,
+  fetchArrowPage,
+  pageRows
+} from './request';
 import { ColumnStatsModal, FilterModal, DownloadModal } from './modal';
 import { URLExt } from '@jupyterlab/coreutils';
 import { ServerConnection } from '@jupyterlab/services';
@@ -513,20 +519,20 @@ export class TabularDataViewer extends Widget {
       if (this._activeSheet) {
         dataBody.sheet = this._activeSheet;
       }
-      const response = await requestAPI<any>('data', {
-        method: 'POST',
-        body: JSON.stringify(dataBody)
-      });
+      // An Arrow IPC page: the server's column buffers as they are, with no
+      // JSON encode there or parse here
+      const response = await fetchArrowPage(dataBody);
+      const rows = pageRows(response);
 
-      this._data = this._data.concat(response.data);
+      this._data = this._data.concat(rows);
       this._hasMore = response.hasMore;
-      this._currentOffset += response.data.length;
+      this._currentOffset += rows.length;
 
       if (reset) {
         this._totalRows = response.totalRows;
       }
 
-      this._renderData(response.data);
+      this._renderData(rows);
       this._updateStatusBar();
     } catch (error) {
       // Repaint the bar first: otherwise the right group stays on "Loading..."
@@ -1196,21 +1202,32 @@ export class TabularDataViewer extends Widget {
    */
   private async _showColumnStats(columnName: string): Promise<void> {
     try {
-      // Show loading indicator (we could add a spinner here)
+      // A parquet answers from its footer at once: open the modal on that and
+      // fill it in when the scan-backed statistics and unique values arrive.
+      // Other sources return the full statistics to the first call.
       const stats = await fetchColumnStats(
         this._filePath,
         columnName,
-        this._activeSheet
+        this._activeSheet,
+        true
       );
-      // Fetch unique values with the limit from settings
-      const uniqueValues = await fetchUniqueValues(
-        this._filePath,
-        columnName,
-        this._maxUniqueValues,
-        this._activeSheet
-      );
-      const modal = new ColumnStatsModal(stats, uniqueValues);
+      const modal = new ColumnStatsModal(stats);
       modal.show();
+      const [fullStats, uniqueValues] = await Promise.all([
+        stats.partial
+          ? fetchColumnStats(this._filePath, columnName, this._activeSheet)
+          : Promise.resolve(stats),
+        // Fetch unique values with the limit from settings
+        fetchUniqueValues(
+          this._filePath,
+          columnName,
+          this._maxUniqueValues,
+          this._activeSheet
+        )
+      ]);
+      if (!modal.isDisposed) {
+        modal.update(fullStats, uniqueValues);
+      }
     } catch (error) {
       console.error('Failed to load column statistics:', error);
       // Could show an error message to user